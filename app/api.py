@@ -1,71 +1,237 @@
 # filepath: app/api.py
-from fastapi import APIRouter, HTTPException, Request, Query
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional, Dict, Any, Literal
+from datetime import date, datetime
+import asyncio
+import json
 
-from app.models import Tender, WebsiteConfig, EmailSettings, AppConfigUpdate, CurrentAppConfig, RefreshResponse, StatusResponse
+from app.models import TenderPage, WebsiteConfig, SiteFreshness, EmailSettings, AppConfigUpdate, CurrentAppConfig, RefreshResponse, RefreshJobStatus, ScheduleStatus, SearchResults, SiteBreaker, SiteHealth, StatusResponse
+from app.jobs import RefreshJobManager
+from app.responses import ApiResponseCache
+from app.scheduler import ScrapeScheduler
 from app.scraper import TenderScraper, logger # Import logger from scraper
 
 router = APIRouter()
-scraper_instance = TenderScraper()
 
-@router.get("/api/tenders", response_model=List[Tender])
-async def get_tenders_api(website: Optional[str] = Query(None)):
-    all_tenders_map = scraper_instance.load_previous_tenders() # Load latest from file
-    
-    if website:
-        if website in all_tenders_map:
-            return all_tenders_map[website]
-        else:
-            return [] # Or raise HTTPException(status_code=404, detail="Website not found")
-    
-    flat_tenders = [tender for tenders_list in all_tenders_map.values() for tender in tenders_list]
-    return flat_tenders
-
-@router.post("/api/refresh", response_model=RefreshResponse)
-async def refresh_data_api():
-    try:
-        _, new_tenders_map = scraper_instance.run() # scraper.run() now returns (all_tenders_map, new_tenders_map)
-        new_count = sum(len(tenders) for tenders in new_tenders_map.values())
-        
-        return RefreshResponse(
-            status='success',
-            message=f'Refresh completed. Found {new_count} new tenders.',
-            new_tenders_count=new_count
+# The scraper engine, refresh jobs and scheduler are created once by the app lifespan (see main.py)
+def get_scraper(request: Request) -> TenderScraper:
+    return request.app.state.scraper
+
+def get_refresh_jobs(request: Request) -> RefreshJobManager:
+    return request.app.state.refresh_jobs
+
+def get_scheduler(request: Request) -> ScrapeScheduler:
+    return request.app.state.scheduler
+
+def get_api_cache(request: Request) -> ApiResponseCache:
+    return request.app.state.api_cache
+
+_website_list = TypeAdapter(List[WebsiteConfig])
+
+@router.get("/api/tenders", response_model=TenderPage)
+def get_tenders_api(
+    request: Request,
+    website: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    min_score: Optional[float] = Query(None),
+    score_below: Optional[float] = Query(None, description="Only tenders scoring strictly below this value"),
+    tier: Optional[Literal['high', 'low']] = Query(None, description="Split around half of the best match_score"),
+    undated: bool = Query(False, description="Only tenders whose date could not be parsed"),
+    q: Optional[str] = Query(None, description="Words (as prefixes) in the title or tags, or text in the date"),
+    since: Optional[datetime] = Query(None, description="Only tenders first seen at or after this time"),
+    sort: Literal['date', 'score', 'title', 'website', 'scraped_at'] = Query('date'),
+    order: Literal['asc', 'desc'] = Query('desc'),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    scraper_instance: TenderScraper = Depends(get_scraper),
+    api_cache: ApiResponseCache = Depends(get_api_cache)
+):
+    if since is not None and since.tzinfo is not None:
+        # first_seen is stored as naive local time
+        since = since.astimezone().replace(tzinfo=None)
+
+    def build():
+        # Filtering, sorting and paging all happen in the tender store so the payload stays one page long
+        items, total, max_score = scraper_instance.store.query_tenders(
+            website_name=website, date_from=date_from, date_to=date_to, min_score=min_score,
+            score_below=score_below, tier=tier, undated=undated, q=q, since=since, sort=sort, order=order,
+            limit=limit, offset=offset
         )
-    except Exception as e:
-        logger.error(f"Error during API refresh: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        page = TenderPage(items=items, total=total, limit=limit, offset=offset, max_score=max_score)
+        return page.model_dump_json().encode()
+
+    # Each page is serialized once per store version; polls in between get the cached bytes or a 304
+    key = ('tenders', website, date_from, date_to, min_score, score_below, tier, undated, q, since, sort, order,
+           limit, offset)
+    return api_cache.respond(request, key, scraper_instance.store.data_version(), build)
+
+@router.get("/api/search", response_model=SearchResults)
+def search_tenders_api(
+    q: str = Query(..., min_length=1, description="Words to find in tender titles and tags; each matches as a prefix"),
+    website: Optional[str] = Query(None),
+    include_history: bool = Query(False, description="Also search tenders no longer listed by their site"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    scraper_instance: TenderScraper = Depends(get_scraper)
+):
+    # Ranked by BM25 over the store's full-text index; facets count matches per website
+    items, total, facets = scraper_instance.store.search(
+        q, website_name=website, include_history=include_history, limit=limit, offset=offset
+    )
+    return SearchResults(
+        query=q, items=items, total=total, limit=limit, offset=offset,
+        facets=[{'website': name, 'count': count} for name, count in facets]
+    )
+
+@router.post("/api/refresh", response_model=RefreshResponse, status_code=202)
+async def refresh_data_api(
+    website: Optional[List[str]] = Query(None, description="Only refresh these sites"),
+    refresh_jobs: RefreshJobManager = Depends(get_refresh_jobs)
+):
+    if website:
+        known = {w.name for w in refresh_jobs.scraper.websites}
+        unknown = [name for name in website if name not in known]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown website(s): {', '.join(unknown)}")
+    # The scrape runs in a background job; a refresh requested mid-run joins the running job
+    job, created = refresh_jobs.start(websites=website or None)
+    return RefreshResponse(
+        status='started' if created else 'running',
+        message='Refresh started.' if created else 'A refresh is already running.',
+        job_id=job.id,
+        new_tenders_count=job.new_tenders_count
+    )
+
+def _get_job_or_404(refresh_jobs, job_id):
+    job = refresh_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job
+
+@router.get("/api/refresh/{job_id}", response_model=RefreshJobStatus)
+async def refresh_status_api(job_id: str, refresh_jobs: RefreshJobManager = Depends(get_refresh_jobs)):
+    return _get_job_or_404(refresh_jobs, job_id).to_dict()
+
+@router.get("/api/refresh/{job_id}/events")
+async def refresh_events_api(job_id: str, request: Request,
+                             refresh_jobs: RefreshJobManager = Depends(get_refresh_jobs)):
+    job = _get_job_or_404(refresh_jobs, job_id)
+
+    async def event_stream():
+        # Server-Sent Events: replays progress so far, then follows the job until its 'done' event
+        sent = 0
+        idle_ticks = 0
+        while True:
+            events = job.events_since(sent)
+            for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+            sent += len(events)
+            if job.done and not job.events_since(sent):
+                return
+            if await request.is_disconnected():
+                return
+            idle_ticks = 0 if events else idle_ticks + 1
+            if idle_ticks >= 30:
+                yield ": keep-alive\n\n"
+                idle_ticks = 0
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(scraper_instance: TenderScraper = Depends(get_scraper)):
+    # Prometheus text exposition format
+    return PlainTextResponse(scraper_instance.metrics.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/api/sites/health", response_model=List[SiteHealth])
+def get_sites_health_api(scraper_instance: TenderScraper = Depends(get_scraper)):
+    return scraper_instance.metrics.site_health([w.name for w in scraper_instance.websites])
+
+@router.get("/api/sites/breakers", response_model=List[SiteBreaker])
+def get_sites_breakers_api(scraper_instance: TenderScraper = Depends(get_scraper)):
+    # closed = fetched normally, open = skipped until open_until, half_open = probed on the next run
+    return scraper_instance.breakers.snapshot([w.name for w in scraper_instance.websites])
+
+@router.post("/api/sites/{name}/breaker/reset", response_model=StatusResponse)
+def reset_site_breaker_api(name: str, scraper_instance: TenderScraper = Depends(get_scraper)):
+    if name not in {w.name for w in scraper_instance.websites}:
+        raise HTTPException(status_code=404, detail=f"Unknown website: {name}")
+    if not scraper_instance.breakers.reset(name):
+        return StatusResponse(status='success', message=f"No failures on record for {name}")
+    return StatusResponse(status='success', message=f"Circuit breaker for {name} closed")
+
+@router.get("/api/schedule", response_model=ScheduleStatus)
+async def get_schedule_api(scheduler: ScrapeScheduler = Depends(get_scheduler)):
+    return scheduler.status()
 
 @router.get("/api/websites", response_model=List[WebsiteConfig])
-async def get_websites_api():
-    return scraper_instance.websites
+def get_websites_api(request: Request, scraper_instance: TenderScraper = Depends(get_scraper),
+                     api_cache: ApiResponseCache = Depends(get_api_cache)):
+    websites = scraper_instance.websites
+    return api_cache.respond(
+        request, ('websites',), scraper_instance.sites.version,
+        # Validated into models first, so the body has the response_model's fields and defaults
+        lambda: _website_list.dump_json(_website_list.validate_python([site.to_dict() for site in websites]))
+    )
+
+@router.put("/api/websites/{name}", response_model=WebsiteConfig)
+def put_website_api(name: str, website: WebsiteConfig, scraper_instance: TenderScraper = Depends(get_scraper)):
+    # Adds or replaces one site; a site inside a group stays in it, keeping the group's shared_config
+    if website.name != name:
+        raise HTTPException(status_code=400, detail="Website name in the body must match the URL")
+    try:
+        scraper_instance.sites.upsert(website.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return scraper_instance.sites.get(name).to_dict()
+
+@router.delete("/api/websites/{name}", response_model=StatusResponse)
+def delete_website_api(name: str, scraper_instance: TenderScraper = Depends(get_scraper)):
+    if not scraper_instance.sites.remove(name):
+        raise HTTPException(status_code=404, detail=f"Unknown website: {name}")
+    return StatusResponse(status='success', message=f"Website {name} removed")
+
+@router.get("/api/websites/freshness", response_model=List[SiteFreshness])
+def get_websites_freshness_api(scraper_instance: TenderScraper = Depends(get_scraper)):
+    # Sites are written as they finish, so during a run some are fresher than others
+    return scraper_instance.store.site_freshness()
 
 @router.get("/api/config", response_model=CurrentAppConfig)
-async def get_config_api():
+async def get_config_api(request: Request, scraper_instance: TenderScraper = Depends(get_scraper),
+                         api_cache: ApiResponseCache = Depends(get_api_cache)):
     # Ensure scraper_instance.config is up-to-date if modified elsewhere (e.g. direct file edit)
     # For simplicity, we assume scraper_instance holds the current view.
     # For a more robust solution, scraper.config.read(scraper.config_path) could be called here.
-    return CurrentAppConfig(
-        websites=scraper_instance.websites,
-        email_enabled=scraper_instance.email_config['enabled'],
-        smtp_server=scraper_instance.email_config.get('smtp_server'),
-        smtp_port=scraper_instance.email_config.get('smtp_port'),
-        sender_email=scraper_instance.email_config.get('sender_email'),
-        recipient_email=scraper_instance.email_config.get('recipient_email'),
-        output_directory=scraper_instance.output_dir
+    websites = scraper_instance.websites
+    return api_cache.respond(
+        request, ('config',), (scraper_instance.sites.version, scraper_instance.config_version),
+        lambda: CurrentAppConfig(
+            websites=[site.to_dict() for site in websites],
+            email_enabled=scraper_instance.email_config['enabled'],
+            smtp_server=scraper_instance.email_config.get('smtp_server'),
+            smtp_port=scraper_instance.email_config.get('smtp_port'),
+            sender_email=scraper_instance.email_config.get('sender_email'),
+            recipient_email=scraper_instance.email_config.get('recipient_email'),
+            output_directory=scraper_instance.output_dir
+        ).model_dump_json().encode()
     )
 
 @router.post("/api/config", response_model=StatusResponse)
-async def manage_config_api(config_data: AppConfigUpdate):
+async def manage_config_api(config_data: AppConfigUpdate, scraper_instance: TenderScraper = Depends(get_scraper)):
     try:
         if config_data.websites is not None:
-            # Convert Pydantic models back to dicts for saving if necessary,
-            # or ensure TenderScraper methods can handle Pydantic models.
-            # For now, assuming TenderScraper.save_websites_config expects list of dicts.
-            websites_to_save = [site.model_dump() for site in config_data.websites]
-            scraper_instance.save_websites_config(websites_to_save)
-            scraper_instance.websites = websites_to_save # Update in-memory list
+            # Only the sites that differ are rewritten; groups and their shared_config are kept
+            try:
+                scraper_instance.sites.replace_all([site.model_dump() for site in config_data.websites])
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
 
         if config_data.email is not None:
             email_dict = config_data.email.model_dump(exclude_unset=True) # Get only provided fields
@@ -77,6 +243,8 @@ async def manage_config_api(config_data: AppConfigUpdate):
         scraper_instance.save_ini_config() # Save all changes to config.ini
         
         return StatusResponse(status='success', message='Configuration updated successfully')
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating configuration via API: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
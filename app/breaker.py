@@ -0,0 +1,117 @@
+# filepath: app/breaker.py
+import logging
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger("TenderScraper")
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SiteBreakers:
+    """
+    Per-site circuit breakers, so a site that is down stops costing every run a
+    worker and the full timeout-and-retry budget.
+
+    After failure_threshold failed runs in a row a site's breaker opens and the
+    site is skipped until its cooldown ends. It is then half-open: the next run
+    fetches it once as a probe, with probe_timeout and no retries. A successful
+    probe closes the breaker; a failed one opens it again for twice as long, up
+    to max_cooldown. State lives in the store's site_breaker table, so it
+    survives restarts. A failure_threshold of 0 disables the breakers.
+    """
+
+    def __init__(self, store, failure_threshold=3, cooldown=timedelta(minutes=30),
+                 max_cooldown=timedelta(hours=24), probe_timeout=10.0):
+        self.store = store
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._states = store.get_site_breakers()
+
+    @classmethod
+    def from_config(cls, store, config):
+        return cls(
+            store,
+            failure_threshold=config.getint('CircuitBreaker', 'failure_threshold', fallback=3),
+            cooldown=timedelta(minutes=config.getfloat('CircuitBreaker', 'cooldown_minutes', fallback=30)),
+            max_cooldown=timedelta(hours=config.getfloat('CircuitBreaker', 'max_cooldown_hours', fallback=24)),
+            probe_timeout=config.getfloat('CircuitBreaker', 'probe_timeout', fallback=10.0)
+        )
+
+    def state(self, name, now=None):
+        """CLOSED, OPEN (skip the site) or HALF_OPEN (fetch it once as a probe)."""
+        with self._lock:
+            state = self._states.get(name)
+        if not self.failure_threshold or state is None or state['open_until'] is None:
+            return CLOSED
+        if (now or datetime.now()) < datetime.fromisoformat(state['open_until']):
+            return OPEN
+        return HALF_OPEN
+
+    def open_until(self, name):
+        with self._lock:
+            state = self._states.get(name)
+        return state['open_until'] if state else None
+
+    def record_success(self, name):
+        with self._lock:
+            if self._states.pop(name, None) is None:
+                return
+        logger.info(f"Circuit breaker for {name} closed")
+        self.store.save_site_breaker(name, 0, 0)
+
+    def record_failure(self, name, error, now=None):
+        now = now or datetime.now()
+        with self._lock:
+            state = self._states.setdefault(
+                name, {'name': name, 'failures': 0, 'trips': 0, 'open_until': None,
+                       'last_failure_at': None, 'last_error': None}
+            )
+            probing = state['open_until'] is not None
+            state['failures'] += 1
+            state['last_failure_at'] = now.isoformat()
+            state['last_error'] = error
+            if self.failure_threshold and (probing or state['failures'] >= self.failure_threshold):
+                cooldown = min(self.max_cooldown, self.cooldown * 2 ** state['trips'])
+                state['trips'] += 1
+                state['open_until'] = (now + cooldown).isoformat()
+                logger.warning(
+                    f"Circuit breaker for {name} opened after {state['failures']} failures, "
+                    f"skipping it until {state['open_until']}"
+                )
+            state = dict(state)
+        self.store.save_site_breaker(
+            name, state['failures'], state['trips'], state['open_until'], state['last_failure_at'], state['last_error']
+        )
+
+    def reset(self, name):
+        """Close a site's breaker by hand; returns False if it had no failures on record."""
+        with self._lock:
+            if self._states.pop(name, None) is None:
+                return False
+        self.store.save_site_breaker(name, 0, 0)
+        return True
+
+    def snapshot(self, site_names, now=None):
+        """Per-site breaker state for the API."""
+        now = now or datetime.now()
+        with self._lock:
+            states = {name: dict(state) for name, state in self._states.items()}
+        snapshot = []
+        for name in site_names:
+            state = states.get(name, {})
+            snapshot.append({
+                'name': name,
+                'state': self.state(name, now),
+                'failures': state.get('failures', 0),
+                'trips': state.get('trips', 0),
+                'open_until': state.get('open_until'),
+                'last_failure_at': state.get('last_failure_at'),
+                'last_error': state.get('last_error')
+            })
+        return snapshot
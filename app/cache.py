@@ -0,0 +1,94 @@
+# filepath: app/cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger("TenderScraper")
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent per-site, per-URL cache of HTTP validators and body hashes.
+
+    Entries are keyed by site name and URL, so sites that share a listing URL
+    but parse it differently keep their own validators. Each entry stores the
+    ETag, Last-Modified, content hash and size of the last page we parsed, plus
+    a fingerprint of the site config and keywords used to parse it. A page is
+    only treated as unchanged when that fingerprint still matches, so editing
+    selectors or keywords forces a fresh parse.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.reset_stats()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f)
+                # Entries used to be keyed by URL alone; those pages are simply fetched again once
+                return {name: urls for name, urls in entries.items() if 'fingerprint' not in urls}
+            except (json.JSONDecodeError, OSError) as e:
+                logger.error(f"Error loading response cache {self.path}: {e}")
+        return {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+
+    def reset_stats(self):
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'unchanged': 0, 'bytes_saved': 0}
+
+    def lookup(self, site_name, url, fingerprint):
+        """Return the site's cached entry for url if it was produced with the same fingerprint."""
+        entry = self.entries.get(site_name, {}).get(url)
+        if entry and entry.get('fingerprint') == fingerprint:
+            return entry
+        return None
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, site_name, url, fingerprint, headers, body_hash, size):
+        with self._lock:
+            self.entries.setdefault(site_name, {})[url] = {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'content_hash': body_hash,
+                'size': size,
+                'fingerprint': fingerprint
+            }
+
+    def record_not_modified(self, entry):
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += entry.get('size', 0)
+
+    def record_unchanged(self):
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['unchanged'] += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.stats['misses'] += 1
@@ -0,0 +1,65 @@
+# filepath: app/cli.py
+"""
+One-shot scrape from the command line, without the web app.
+
+Runs the same scrape as a refresh from the dashboard (tender store, exports,
+email notifications) once and exits; fastapi, uvicorn and pydantic are never
+imported. Exits with status 1 if any site failed.
+
+Usage:
+    python -m app.cli [--site NAME ...] [--no-email] [--list]
+"""
+import argparse
+import logging
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m app.cli', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--config', default='config/config.ini')
+    parser.add_argument('--websites-config', default='config/websites_config.json')
+    parser.add_argument('--site', action='append', metavar='NAME', help="Only scrape this site (repeatable)")
+    parser.add_argument('--no-email', action='store_true', help="Don't send notifications for new tenders")
+    parser.add_argument('--list', action='store_true', help="List the configured sites and exit")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    args = parser.parse_args(argv)
+
+    from app.scraper import TenderScraper
+
+    if args.quiet:
+        # Also silences httpx's per-request lines, which go through the root logger
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("TenderScraper").setLevel(logging.WARNING)
+    scraper = TenderScraper(args.config, args.websites_config)
+    try:
+        names = [site.name for site in scraper.websites]
+        if args.list:
+            print('\n'.join(names))
+            return 0
+        unknown = sorted(set(args.site or ()) - set(names))
+        if unknown:
+            parser.error(f"unknown site(s): {', '.join(unknown)}")
+        if args.no_email:
+            scraper.email_config['enabled'] = False
+
+        results = []
+        scraper.run(on_site_done=results.append, websites=args.site)
+        for result in sorted(results, key=lambda r: r['website']):
+            status = f"error: {result['error']}" if result['error'] else (
+                f"{len(result['tenders'])} tenders, {len(result['new_tenders'])} new"
+            )
+            print(f"{result['website']}: {status}")
+        failed = sum(1 for result in results if result['error'])
+        print(f"{len(results)} site(s) scraped, {failed} failed, "
+              f"{sum(len(result['new_tenders']) for result in results)} new tender(s)")
+        return 1 if failed else 0
+    finally:
+        # Stops the parse pool and waits for queued notifications to go out
+        scraper.close()
+        scraper.store.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# filepath: app/dates.py
+import calendar
+import re
+from datetime import datetime
+from functools import lru_cache
+
+UNKNOWN_DATE = "Unknown Date"
+
+# Same alternatives, in the same order, as the original search; the groups say which one matched
+DATE_PATTERN = re.compile(
+    r'(?P<dmy>(\d{1,2})[/-](\d{1,2})[/-](\d{2,4}))'
+    r'|(?P<ymd>(\d{4})[/-](\d{1,2})[/-](\d{1,2}))'
+    r'|(?P<text>(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{2,4}))'
+)
+
+MONTHS = {}
+for _number in range(1, 13):
+    MONTHS[calendar.month_name[_number].lower()] = _number
+    MONTHS[calendar.month_abbr[_number].lower()] = _number
+
+
+def _year(digits):
+    """4 digits as-is, 2 digits the way strptime's %y reads them, anything else is invalid."""
+    if len(digits) == 4:
+        return int(digits)
+    if len(digits) == 2:
+        value = int(digits)
+        return value + (2000 if value < 69 else 1900)
+    return None
+
+
+def _build(year, month, day):
+    if year is None or month is None:
+        return None
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def _guess(match):
+    if not match.group(0).isascii():
+        # \d also matches non-ASCII digits, which strptime never accepted
+        return None
+    groups = match.groups()
+    if match.group('dmy'):
+        # dd/mm/yyyy or dd/mm/yy
+        return _build(_year(groups[3]), int(groups[2]), int(groups[1]))
+    if match.group('ymd'):
+        # yyyy/mm/dd, then yyyy/dd/mm
+        year, first, second = int(groups[5]), int(groups[6]), int(groups[7])
+        return _build(year, first, second) or _build(year, second, first)
+    # 26 May 2025 / 26 May 25
+    return _build(_year(groups[11]), MONTHS.get(groups[10].lower()), int(groups[9]))
+
+
+def format_date(moment):
+    return f"{moment.day:02d}/{moment.month:02d}/{moment.year % 100:02d}"
+
+
+@lru_cache(maxsize=8192)
+def parse_date(text, date_format=None):
+    """
+    Find a date in scraped text.
+
+    Returns (display, moment): display is 'dd/mm/yy', the raw match when it is
+    not a valid date, or 'Unknown Date'; moment is the parsed datetime or None.
+    With a per-site date_format hint (a strptime format) the stripped text is
+    tried against it first and guessing only happens if that fails. Results are
+    cached, since the same date strings repeat across rows and runs.
+    """
+    if not text:
+        return UNKNOWN_DATE, None
+    if date_format:
+        try:
+            moment = datetime.strptime(text.strip(), date_format)
+            return format_date(moment), moment
+        except ValueError:
+            pass
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return UNKNOWN_DATE, None
+    moment = _guess(match)
+    if moment is None:
+        return match.group(0).replace('-', '/'), None
+    return format_date(moment), moment
+
+
+def extract_date_from_text(text):
+    """
+    Extracts a date from the given text and returns it in the format 'dd/mm/yy'.
+    Supports multiple date formats like DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD, and '26 May 2025'.
+
+    Args:
+        text (str): The input text containing a potential date.
+
+    Returns:
+        str: The extracted and formatted date, or 'Unknown Date' if no valid date is found.
+    """
+    return parse_date(text)[0]
+
+
+@lru_cache(maxsize=8192)
+def parse_short_date(date_str):
+    """Parse a stored 'dd/mm/yy' (or dd/mm/yyyy) date, or return None."""
+    parts = date_str.split('/') if date_str else ()
+    if len(parts) != 3 or not date_str.isascii() or not all(part.isdigit() for part in parts) \
+            or len(parts[0]) > 2 or len(parts[1]) > 2:
+        return None
+    return _build(_year(parts[2]), int(parts[1]), int(parts[0]))
+
+
+def months_ago(moment, months):
+    """Shift moment back by whole calendar months, clamping the day to the target month's length."""
+    year, month_index = divmod(moment.year * 12 + moment.month - 1 - months, 12)
+    day = min(moment.day, calendar.monthrange(year, month_index + 1)[1])
+    return moment.replace(year=year, month=month_index + 1, day=day)
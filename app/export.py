@@ -0,0 +1,181 @@
+# filepath: app/export.py
+import csv
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+
+from app.store import TENDER_FIELDS
+
+logger = logging.getLogger("TenderScraper")
+
+DEFAULT_FORMATS = ('csv',)
+# Daily files are named tenders_YYYY-MM-DD.<ext>; Parquet partitions live in tenders_parquet/day=YYYY-MM-DD
+DAILY_FILE_PATTERN = re.compile(r'^tenders_(\d{4}-\d{2}-\d{2})\.(csv|jsonl)$')
+PARQUET_DIR = 'tenders_parquet'
+
+
+def _append(path, data, header=b''):
+    """
+    Append data to path and fsync it, starting a new file with header.
+
+    Only the new rows are written, however big the day's file has grown. A line
+    left incomplete by a crash during an earlier append is cut off first, so the
+    file always ends on a whole row.
+    """
+    with open(path, 'ab+') as out:
+        end = out.seek(0, os.SEEK_END)
+        if end:
+            out.seek(end - 1)
+            if out.read(1) != b'\n':
+                end = _truncate_to_last_line(out, end)
+        if end == 0:
+            out.write(header)
+        out.write(data)
+        out.flush()
+        os.fsync(out.fileno())
+
+
+def _truncate_to_last_line(f, end, chunk=65536):
+    position = end
+    while position > 0:
+        start = max(0, position - chunk)
+        f.seek(start)
+        newline = f.read(position - start).rfind(b'\n')
+        if newline != -1:
+            position = start + newline + 1
+            break
+        position = start
+    logger.warning(f"Dropping {end - position} bytes of an incomplete last line in {f.name}")
+    f.truncate(position)
+    return position
+
+
+class CsvSink:
+    name = 'csv'
+
+    def write(self, directory, day, rows):
+        path = os.path.join(directory, f"tenders_{day}.csv")
+        header = io.StringIO()
+        csv.DictWriter(header, fieldnames=TENDER_FIELDS, lineterminator='\n').writeheader()
+        body = io.StringIO()
+        csv.DictWriter(body, fieldnames=TENDER_FIELDS, lineterminator='\n').writerows(rows)
+        _append(path, body.getvalue().encode('utf-8'), header.getvalue().encode('utf-8'))
+        return path
+
+
+class JsonlSink:
+    name = 'jsonl'
+
+    def write(self, directory, day, rows):
+        path = os.path.join(directory, f"tenders_{day}.jsonl")
+        data = ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        _append(path, data.encode('utf-8'))
+        return path
+
+
+class ParquetSink:
+    """One Parquet file per export batch inside a day=YYYY-MM-DD partition directory."""
+
+    name = 'parquet'
+
+    def __init__(self):
+        import pyarrow
+        import pyarrow.parquet
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+
+    def write(self, directory, day, rows):
+        partition = os.path.join(directory, PARQUET_DIR, f"day={day}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"part-{datetime.now().strftime('%H%M%S%f')}.parquet")
+        table = self._pyarrow.Table.from_pylist(rows)
+        tmp_path = os.path.join(partition, f".{os.path.basename(path)}.tmp")
+        self._parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+
+_SINK_FACTORIES = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'parquet': ParquetSink
+}
+
+
+def _build_sinks(formats):
+    sinks = []
+    for name in formats:
+        factory = _SINK_FACTORIES.get(name)
+        if factory is None:
+            logger.warning(f"Unknown export format '{name}', skipping it")
+            continue
+        try:
+            sinks.append(factory())
+        except ImportError as e:
+            logger.warning(f"Export format '{name}' is unavailable ({e}), skipping it")
+    return sinks
+
+
+class TenderExporter:
+    """
+    Append-only export of newly found tenders.
+
+    Each run appends only its new tenders to one rolling file per day and format
+    (tenders_YYYY-MM-DD.csv / .jsonl) or adds a Parquet file to that day's
+    partition. Files older than keep_days are pruned by the date in their name.
+    """
+
+    def __init__(self, directory, formats=DEFAULT_FORMATS, keep_days=30):
+        self.directory = directory
+        self.formats = tuple(formats)
+        self.keep_days = keep_days
+        self.sinks = _build_sinks(self.formats)
+
+    @classmethod
+    def from_config(cls, config, output_dir):
+        raw_formats = config.get('Export', 'formats', fallback=','.join(DEFAULT_FORMATS))
+        formats = [f.strip().lower() for f in raw_formats.split(',') if f.strip()]
+        return cls(
+            config.get('Export', 'directory', fallback='').strip() or output_dir,
+            formats=formats,
+            keep_days=config.getint('Export', 'keep_days', fallback=30)
+        )
+
+    def export(self, tenders, now=None):
+        """Append tenders (TenderRecords) to today's export files; returns the paths written."""
+        if not tenders:
+            return []
+        now = now or datetime.now()
+        day = now.strftime('%Y-%m-%d')
+        rows = [t.to_dict() for t in tenders]
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        for sink in self.sinks:
+            try:
+                paths.append(sink.write(self.directory, day, rows))
+            except Exception as e:
+                logger.error(f"Error exporting tenders as {sink.name}: {e}")
+        if paths:
+            logger.info(f"Exported {len(rows)} new tenders to {', '.join(paths)}")
+        self.prune(now)
+        return paths
+
+    def prune(self, now=None):
+        if self.keep_days <= 0 or not os.path.isdir(self.directory):
+            return
+        cutoff = ((now or datetime.now()) - timedelta(days=self.keep_days)).strftime('%Y-%m-%d')
+        for name in os.listdir(self.directory):
+            match = DAILY_FILE_PATTERN.match(name)
+            if match and match.group(1) < cutoff:
+                os.remove(os.path.join(self.directory, name))
+                logger.info(f"Deleted old export file: {name}")
+        parquet_root = os.path.join(self.directory, PARQUET_DIR)
+        if os.path.isdir(parquet_root):
+            for name in os.listdir(parquet_root):
+                if name.startswith('day=') and name[4:] < cutoff:
+                    shutil.rmtree(os.path.join(parquet_root, name))
+                    logger.info(f"Deleted old export partition: {name}")
@@ -0,0 +1,214 @@
+# filepath: app/extract.py
+import hashlib
+import logging
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from app.dates import months_ago, parse_date
+from app.parsers import get_parser
+from app.records import TenderRecord, site_ref
+
+logger = logging.getLogger("TenderScraper")
+
+# Tenders dated further back than this are skipped
+MAX_TENDER_AGE_MONTHS = 3
+
+# Row cache entry for a row dated before the cutoff; the cutoff only moves forward, so it stays stale
+STALE_ROW = 'stale'
+
+SiteSelectors = namedtuple('SiteSelectors', 'rows title date link tags next_page')
+
+
+@lru_cache(maxsize=1024)
+def compile_site(parser, site):
+    """A site's selectors compiled for one parser backend, once per process and SiteSpec."""
+    return SiteSelectors(
+        rows=parser.compile(site.selector),
+        title=parser.compile(site.title_selector),
+        date=parser.compile(site.date_selector),
+        link=parser.compile(site.link_selector),
+        tags=parser.compile(site.tags_selector) if site.tags_selector else None,
+        next_page=parser.compile(site.next_page_selector) if site.next_page_selector else None
+    )
+
+
+def row_fingerprint(parser, node):
+    """Short hash of a row's markup with whitespace runs collapsed, so reindenting a page changes nothing."""
+    markup = ' '.join(parser.markup(node).split())
+    return hashlib.blake2b(markup.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def extract_tenders(site, html, matcher, parser_name=None, cutoff=None, stats=None, page_url=None,
+                    row_cache=None, row_results=None):
+    """
+    Extract the keyword-matching tenders from one page of a configured site.
+
+    Args:
+        site (SiteSpec): The configured site, see app.sites.
+        html (str): Page markup.
+        matcher (KeywordMatcher): Compiled keywords used to score titles.
+        parser_name (str): Parser backend, see app.parsers.get_parser.
+        cutoff (datetime): Skip tenders dated before this; defaults to MAX_TENDER_AGE_MONTHS ago.
+        stats (dict): If given, filled with row/match/error counts, the number of rows
+            dated before the cutoff, the seconds spent parsing the document, extracting
+            fields and scoring titles, and the absolute URL of the next page when the
+            site has a next_page_selector.
+        page_url (str): URL the page was fetched from, for resolving the next page link;
+            defaults to the site's url.
+        row_cache (dict): Results of earlier runs keyed by row_fingerprint. A row whose
+            fingerprint is in it skips field extraction, date parsing and scoring; only
+            the date is checked against the cutoff again.
+        row_results (dict): If given, every row on the page is fingerprinted and its result
+            stored here under the fingerprint, for the next run's row_cache: STALE_ROW,
+            [date_iso] for a row without a keyword match, or
+            [date_iso, match_score, title, date, link, tag] for a tender. Rows that fail
+            to extract are left out.
+
+    The row cache must be discarded when anything else that shapes the result changes:
+    the site's selectors, link base or date format, the keywords or the parser backend.
+    Fields are selected from within the row, so its markup decides them.
+
+    Returns:
+        list: TenderRecords, in page order.
+    """
+    parser = get_parser(parser_name)
+    selectors = compile_site(parser, site)
+    tenders = []
+    ref = site_ref(site.name, site.url)
+    scraped_at = datetime.now().isoformat()
+    if cutoff is None:
+        cutoff = months_ago(datetime.now(), MAX_TENDER_AGE_MONTHS)
+    if stats is None:
+        stats = {}
+    stats.update(rows=0, matches=0, stale=0, cached_rows=0, row_errors=0, page_error=None, next_page=None,
+                 parse_seconds=0.0, extract_seconds=0.0, score_seconds=0.0)
+    started = time.perf_counter()
+    try:
+        document = parser.parse(html)
+        stats['parse_seconds'] = time.perf_counter() - started
+        if selectors.next_page is not None:
+            next_element = parser.select_one(document, selectors.next_page)
+            next_href = parser.attr(next_element, 'href') if next_element is not None else None
+            if next_href and not next_href.startswith(('#', 'javascript:')):
+                stats['next_page'] = urljoin(page_url or site.url, next_href)
+        tender_elements = parser.select(document, selectors.rows)
+        stats['rows'] = len(tender_elements)
+        if not tender_elements:
+            logger.warning(f"No tender elements found for {site.name} using selector {site.selector}")
+            return tenders
+        for tender_element in tender_elements:
+            try:
+                fingerprint = None
+                if row_results is not None:
+                    fingerprint = row_fingerprint(parser, tender_element)
+                    entry = row_cache.get(fingerprint) if row_cache else None
+                    if entry is not None:
+                        stats['cached_rows'] += 1
+                        if entry != STALE_ROW and entry[0] and datetime.fromisoformat(entry[0]) < cutoff:
+                            entry = STALE_ROW
+                        row_results[fingerprint] = entry
+                        if entry == STALE_ROW:
+                            stats['stale'] += 1
+                        elif len(entry) > 1:
+                            date_iso, match_score, title, date, link, tag = entry
+                            tenders.append(TenderRecord.create(ref, title, date, link, tag, match_score, scraped_at))
+                        continue
+
+                title_element = parser.select_one(tender_element, selectors.title)
+                date_element = parser.select_one(tender_element, selectors.date)
+                link_element = parser.select_one(tender_element, selectors.link)
+                
+                tags = []
+                if selectors.tags is not None:
+                    tag_elements = parser.select(tender_element, selectors.tags)
+                    for tag_elem in tag_elements:
+                        tag_text = parser.text(tag_elem)
+                        if tag_text:
+                            raw_tag = tag_text.strip()
+                            # Insert a comma before an uppercase letter only if it follows a lowercase letter
+                            cleaned_tag = re.sub(r'(?<=[a-z])(?=[A-Z])', ', ', raw_tag)
+                            tags.append(cleaned_tag)
+                # Always add website name as a tag
+                tags.append(site.name)
+                
+                # Extract title from attribute if present, else fallback to text
+                if title_element is not None:
+                    title_attr = parser.attr(title_element, 'title')
+                    if title_attr and title_attr.strip():
+                        title = parser.text(title_element).strip() + ": " + title_attr.strip()
+                    else:
+                        title = parser.text(title_element).strip()
+                else:
+                    title = "Unknown Title"
+                if date_element is not None:
+                    date_text = parser.text(date_element).strip()
+                else:
+                    # Combine all text from the tender_element if date_element is missing
+                    date_text = " ".join(parser.stripped_strings(tender_element))
+                date, tender_date = parse_date(date_text, site.date_format)
+                # Skip if tender is older than the cutoff; undated tenders are kept
+                if tender_date is not None and tender_date < cutoff:
+                    stats['stale'] += 1
+                    if fingerprint is not None:
+                        row_results[fingerprint] = STALE_ROW
+                    continue
+                date_iso = tender_date.isoformat() if tender_date is not None else None
+
+                # Filter tenders based on keywords
+                # Calculate match score based on keywords
+                score_started = time.perf_counter()
+                match_score = matcher.score(title)
+                stats['score_seconds'] += time.perf_counter() - score_started
+
+                # Skip if no keyword match
+                if match_score < 1:
+                    if fingerprint is not None:
+                        row_results[fingerprint] = [date_iso]
+                    continue
+
+                link = ""
+                link_href = parser.attr(link_element, 'href') if link_element is not None else None
+                if link_href is not None:
+                    if not link_href.startswith(('http://', 'https://')):
+                        link = urljoin(site.link_base, link_href)
+                    else:
+                        link = link_href
+                
+                tag = ', '.join([str(tag) for tag in tags]) if isinstance(tags, list) else str(tags)
+                tenders.append(TenderRecord.create(ref, title, date, link, tag, match_score, scraped_at))
+                if fingerprint is not None:
+                    row_results[fingerprint] = [date_iso, match_score, title, date, link, tag]
+            except Exception as e:
+                stats['row_errors'] += 1
+                logger.error(f"Error extracting tender information from element: {e}")
+        logger.info(f"Successfully scraped {len(tenders)} tenders from {site.name}")
+        return tenders
+    except Exception as e:
+        stats['page_error'] = repr(e)
+        logger.error(f"An unexpected error occurred while parsing {site.name}: {e}")
+        return tenders
+    finally:
+        stats['matches'] = len(tenders)
+        stats['extract_seconds'] = time.perf_counter() - started - stats['parse_seconds'] - stats['score_seconds']
+
+
+def extract_page(site, body, encoding, matcher, parser_name=None, cutoff=None, page_url=None, row_cache=None):
+    """
+    Parse-stage entry point: decode the raw page bytes, then extract tenders.
+
+    Takes only picklable arguments so it can run in a worker process. Returns
+    (tenders, stats, row_results), see extract_tenders; row_results is None
+    unless a row_cache (possibly empty) is given.
+    """
+    try:
+        html = body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        html = body.decode('utf-8', errors='replace')
+    stats = {}
+    row_results = {} if row_cache is not None else None
+    tenders = extract_tenders(site, html, matcher, parser_name, cutoff, stats, page_url, row_cache, row_results)
+    return tenders, stats, row_results
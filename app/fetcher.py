@@ -0,0 +1,187 @@
+# filepath: app/fetcher.py
+import asyncio
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+logger = logging.getLogger("TenderScraper")
+
+# Status codes worth another attempt; anything else is returned (or raised) as-is
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; TenderScraper/1.0)"
+# Name matched against robots.txt User-agent lines; RobotFileParser only compares the part before the
+# first '/', which for a full UA string would be "Mozilla"
+ROBOTS_USER_AGENT = "TenderScraper"
+
+
+class DisallowedByRobots(Exception):
+    """The host's robots.txt does not allow fetching this URL."""
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: `rate` requests per second on average, bursts of up to
+    `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Shared HTTP engine for a scrape run.
+
+    Keeps one pooled keep-alive client for every site, caps the total number of
+    in-flight requests as well as the number per host, and retries transient
+    failures with exponential backoff. Politeness: each host gets a token bucket
+    of rate_limit requests per second (0 disables it), and with respect_robots
+    its robots.txt is read once per run; disallowed URLs raise DisallowedByRobots
+    and a Crawl-delay slows that host's bucket down further.
+
+    Usage:
+        async with AsyncFetcher(max_concurrency=20) as fetcher:
+            response = await fetcher.fetch(url)
+    """
+
+    def __init__(self, max_concurrency=20, per_host_concurrency=2, connect_timeout=10.0,
+                 read_timeout=30.0, retries=2, backoff_factor=1.0, user_agent=DEFAULT_USER_AGENT,
+                 rate_limit=0.0, rate_burst=1, respect_robots=False, robots_user_agent=ROBOTS_USER_AGENT):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.retries = max(0, int(retries))
+        self.backoff_factor = backoff_factor
+        self.user_agent = user_agent
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.respect_robots = respect_robots
+        self.robots_user_agent = robots_user_agent
+        self._client = None
+        self._global_limit = None
+        self._host_limits = {}
+        self._host_buckets = {}
+        self._robots = {}
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            ),
+            headers={'User-Agent': self.user_agent},
+            follow_redirects=True
+        )
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = {}
+        self._host_buckets = {}
+        self._robots = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+
+    def _host_limit(self, host):
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    def _host_bucket(self, host, crawl_delay=None):
+        if host not in self._host_buckets:
+            rate = self.rate_limit
+            if crawl_delay:
+                rate = min(rate, 1 / crawl_delay) if rate else 1 / crawl_delay
+            self._host_buckets[host] = TokenBucket(rate, self.rate_burst) if rate else None
+        return self._host_buckets[host]
+
+    async def _robots_for(self, url, timeout):
+        """The host's parsed robots.txt, fetched on first use; None when it can't be read."""
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        if host not in self._robots:
+            # Stored as a future so concurrent first requests to a host share one robots.txt fetch
+            future = self._robots[host] = asyncio.get_running_loop().create_future()
+            robots = None
+            try:
+                response = await self._client.get(f"{parts.scheme}://{parts.netloc}/robots.txt", timeout=timeout)
+                # As in urllib.robotparser: 401/403 mean keep out entirely, other errors mean no rules
+                robots = RobotFileParser()
+                if response.status_code in (401, 403):
+                    robots.disallow_all = True
+                elif response.is_success:
+                    robots.parse(response.text.splitlines())
+                else:
+                    robots.allow_all = True
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not read robots.txt for {host}: {e!r}")
+            finally:
+                future.set_result(robots)
+        return await self._robots[host]
+
+    def _backoff_delay(self, attempt):
+        # Exponential backoff with a little jitter so retries against one host don't line up
+        return self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_factor)
+
+    async def fetch(self, url, headers=None, timeout=None, retries=None):
+        """
+        GET a URL under the per-host rate limit and the global and per-host concurrency limits.
+
+        timeout (seconds) and retries override the fetcher's defaults for this call.
+        Returns the final httpx.Response. Raises httpx.HTTPError once all retries
+        are exhausted or for non-retryable HTTP error statuses, and DisallowedByRobots
+        when respect_robots is on and robots.txt forbids the URL.
+        """
+        host = urlsplit(url).netloc.lower()
+        request_timeout = self.timeout if timeout is None else httpx.Timeout(timeout)
+        crawl_delay = None
+        if self.respect_robots:
+            robots = await self._robots_for(url, request_timeout)
+            if robots is not None:
+                if not robots.can_fetch(self.robots_user_agent, url):
+                    raise DisallowedByRobots(f"robots.txt disallows {url}")
+                crawl_delay = robots.crawl_delay(self.robots_user_agent)
+        bucket = self._host_bucket(host, crawl_delay)
+        retries = self.retries if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                # Host slot first, so requests queued behind a slow or rate-limited host don't hold global slots
+                async with self._host_limit(host):
+                    if bucket is not None:
+                        await bucket.acquire()
+                    async with self._global_limit:
+                        response = await self._client.get(url, headers=headers, timeout=request_timeout)
+                if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                    logger.warning(f"Got HTTP {response.status_code} from {url}, retrying ({attempt + 1}/{retries})")
+                else:
+                    # Only 4xx/5xx are failures; a 304 from a conditional request is a valid answer
+                    if response.is_error:
+                        response.raise_for_status()
+                    return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) or attempt >= retries:
+                    raise
+                logger.warning(f"Error fetching {url}: {e!r}, retrying ({attempt + 1}/{retries})")
+            await asyncio.sleep(self._backoff_delay(attempt))
+            attempt += 1
@@ -0,0 +1,144 @@
+# filepath: app/jobs.py
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger("TenderScraper")
+
+MAX_FINISHED_JOBS = 20
+
+
+class RefreshJob:
+    """State and progress events of one scrape run started through the API."""
+
+    def __init__(self, total_sites):
+        self.id = uuid.uuid4().hex
+        self.status = 'running'
+        self.message = 'Refresh started'
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.total_sites = total_sites
+        self.completed_sites = 0
+        self.new_tenders_count = 0
+        self.events = []
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self.status != 'running'
+
+    def _add_event(self, event, data):
+        self.events.append({'event': event, 'data': data})
+
+    def site_finished(self, site_result):
+        with self._lock:
+            self.completed_sites += 1
+            self.new_tenders_count += len(site_result['new_tenders'])
+            self._add_event('site', {
+                'website': site_result['website'],
+                'tenders': len(site_result['tenders']),
+                'new_tenders': len(site_result['new_tenders']),
+                'error': site_result['error'],
+                'completed_sites': self.completed_sites,
+                'total_sites': self.total_sites
+            })
+
+    def finish(self, status, message):
+        with self._lock:
+            self.status = status
+            self.message = message
+            self.finished_at = datetime.now().isoformat()
+            self._add_event('done', self.to_dict())
+        self._finished.set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def events_since(self, index):
+        with self._lock:
+            return self.events[index:]
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'message': self.message,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'total_sites': self.total_sites,
+            'completed_sites': self.completed_sites,
+            'new_tenders_count': self.new_tenders_count
+        }
+
+
+class RefreshJobManager:
+    """
+    Runs scraper refreshes in a background thread, one at a time.
+
+    Asking for a refresh while one is running returns the running job instead of
+    starting a second, concurrent scrape. Listeners added with add_listener see
+    every site result of every job, on the scrape's event loop; those added with
+    add_done_listener get each job once it has run, on the job's thread.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._current = None
+        self._listeners = []
+        self._done_listeners = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def add_done_listener(self, listener):
+        self._done_listeners.append(listener)
+
+    def start(self, websites=None):
+        """
+        Return (job, created): the running job if there is one, else a newly started job.
+
+        websites optionally limits the run to those site names.
+        """
+        with self._lock:
+            if self._current is not None and not self._current.done:
+                return self._current, False
+            job = RefreshJob(total_sites=len(websites) if websites is not None else len(self.scraper.websites))
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_FINISHED_JOBS:
+                self._jobs.popitem(last=False)
+            self._current = job
+        threading.Thread(target=self._run, args=(job, websites), name=f"refresh-{job.id[:8]}", daemon=True).start()
+        return job, True
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    @property
+    def current(self):
+        return self._current
+
+    def _site_finished(self, job, site_result):
+        job.site_finished(site_result)
+        for listener in self._listeners:
+            listener(site_result)
+
+    def _run(self, job, websites=None):
+        try:
+            self.scraper.run(on_site_done=lambda site_result: self._site_finished(job, site_result), websites=websites)
+            status, message = 'success', f'Refresh completed. Found {job.new_tenders_count} new tenders.'
+        except Exception as e:
+            logger.error(f"Error during refresh job {job.id}: {e}", exc_info=True)
+            status, message = 'error', str(e)
+        # Before finishing the job, so whoever waits on it sees the listeners' writes
+        for listener in self._done_listeners:
+            try:
+                listener(job)
+            except Exception as e:
+                logger.error(f"Error in refresh job listener for {job.id}: {e}", exc_info=True)
+        job.finish(status, message)
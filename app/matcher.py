@@ -0,0 +1,99 @@
+# filepath: app/matcher.py
+import re
+
+
+def parse_keywords(raw):
+    """Split the comma separated `keywords` setting into clean, de-duplicated keywords."""
+    keywords = []
+    seen = set()
+    for keyword in raw.split(','):
+        keyword = keyword.strip()
+        if keyword and keyword.lower() not in seen:
+            seen.add(keyword.lower())
+            keywords.append(keyword)
+    return keywords
+
+
+def parse_weights(raw):
+    """Parse a `keyword:weight, keyword:weight` setting into {keyword_lower: weight}."""
+    weights = {}
+    for item in raw.split(','):
+        if ':' not in item:
+            continue
+        keyword, _, weight = item.rpartition(':')
+        keyword = keyword.strip().lower()
+        try:
+            weights[keyword] = float(weight)
+        except ValueError:
+            continue
+    return weights
+
+
+def trie_pattern(words):
+    """
+    Build a regex that matches any of `words`, factored into a prefix trie.
+
+    Python's re tries alternatives one by one; sharing prefixes ("print",
+    "printing", "print job") turns that into a single walk down the trie, the
+    regex equivalent of an Aho-Corasick goto function. Optional tails are greedy,
+    so the longest keyword at a position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Scores text against the configured keywords in a single regex pass.
+
+    All keywords are compiled once into one trie-shaped pattern. The text is
+    lower-cased once and scanned left to right without overlaps, so at any
+    position the longest keyword wins and the shorter keywords inside it
+    ("print" inside "printing") are not counted again. Each distinct keyword
+    found adds its weight (1 by default) to the score.
+    """
+
+    def __init__(self, keywords, weights=None, word_boundary=False):
+        self.keywords = parse_keywords(keywords) if isinstance(keywords, str) else list(keywords)
+        self.word_boundary = word_boundary
+        weights = weights or {}
+        self.weights = {}
+        for keyword in self.keywords:
+            weight = weights.get(keyword.lower(), 1)
+            self.weights[keyword.lower()] = int(weight) if float(weight).is_integer() else weight
+        self._pattern = self._compile()
+
+    def _compile(self):
+        if not self.keywords:
+            return None
+        pattern = trie_pattern({k.lower() for k in self.keywords})
+        if self.word_boundary:
+            pattern = rf"(?<!\w){pattern}(?!\w)"
+        return re.compile(pattern)
+
+    @property
+    def signature(self):
+        """Stable description of the matcher, for cache fingerprints."""
+        return [self.keywords, self.weights, self.word_boundary]
+
+    def matches(self, text):
+        """Return the distinct keywords (lower-cased) found in text."""
+        if not self._pattern or not text:
+            return set()
+        return set(self._pattern.findall(text.lower()))
+
+    def score(self, text):
+        return sum(self.weights.get(keyword, 1) for keyword in self.matches(text))
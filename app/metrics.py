@@ -0,0 +1,231 @@
+# filepath: app/metrics.py
+import bisect
+import threading
+import time
+
+# Seconds; covers fast local pages up to the fetcher's read timeout
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def summary(self, *labels):
+        """(count, sum) of the observations for these labels."""
+        state = self._values.get(labels)
+        return (state[2], state[1]) if state else (0, 0.0)
+
+    def render(self):
+        with self._lock:
+            items = sorted((labels, ([*state[0]], state[1], state[2])) for labels, state in self._values.items())
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.label_names, labels, [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class ScrapeMetrics:
+    """
+    In-process counters and histograms for the scrape pipeline.
+
+    The fetch and parse stages report into it as each site is processed;
+    render() gives the Prometheus text exposition format for /metrics, and
+    site_health() a per-site JSON summary. No external client library needed.
+    """
+
+    def __init__(self):
+        self.fetch_seconds = Histogram(
+            'tender_fetch_duration_seconds', 'HTTP round trip per site page.', ['site'])
+        self.fetch_bytes = Histogram(
+            'tender_fetch_response_bytes', 'Size of fetched page bodies.', ['site'], buckets=SIZE_BUCKETS)
+        self.responses = Counter(
+            'tender_fetch_responses_total', 'Fetch outcomes by HTTP status (or "error").', ['site', 'status'])
+        self.cache_hits = Counter(
+            'tender_cache_hits_total', 'Pages reused from the response cache.', ['site', 'kind'])
+        self.parse_seconds = Histogram(
+            'tender_parse_duration_seconds', 'Building the document tree per page.', ['site'])
+        self.extract_seconds = Histogram(
+            'tender_extract_duration_seconds', 'Selecting rows and reading fields, excluding scoring.', ['site'])
+        self.score_seconds = Histogram(
+            'tender_score_duration_seconds', 'Keyword scoring of titles per page.', ['site'])
+        self.rows = Counter(
+            'tender_rows_total', 'Rows matched by the site selector.', ['site'])
+        self.cached_rows = Counter(
+            'tender_cached_rows_total', 'Rows whose result was reused from the row cache.', ['site'])
+        self.matches = Counter(
+            'tender_matches_total', 'Rows kept after keyword and date filtering.', ['site'])
+        self.last_rows = Gauge(
+            'tender_last_rows', 'Rows matched by the site selector on the last parse.', ['site'])
+        self.errors = Counter(
+            'tender_errors_total', 'Scrape errors by stage (fetch, parse, row).', ['site', 'stage'])
+        self.skips = Counter(
+            'tender_breaker_skips_total', 'Runs that skipped the site because its circuit breaker was open.', ['site'])
+        self.last_success = Gauge(
+            'tender_last_success_timestamp_seconds', 'Unix time of the last successful scrape.', ['site'])
+        self.run_seconds = Histogram(
+            'tender_run_duration_seconds', 'Wall time of whole scrape runs.',
+            buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800))
+        self.metrics = [
+            self.fetch_seconds, self.fetch_bytes, self.responses, self.cache_hits, self.parse_seconds,
+            self.extract_seconds, self.score_seconds, self.rows, self.cached_rows, self.matches, self.last_rows,
+            self.errors, self.skips, self.last_success, self.run_seconds
+        ]
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def _site(self, site):
+        with self._lock:
+            return self._sites.setdefault(site, {
+                'last_status': None, 'last_fetch_seconds': None, 'last_bytes': None, 'last_parse_seconds': None,
+                'last_rows': None, 'last_matches': None, 'last_error': None, 'last_success_at': None
+            })
+
+    def observe_fetch(self, site, status, seconds=None, size=None):
+        self.responses.inc(site, str(status))
+        state = self._site(site)
+        state['last_status'] = status
+        if seconds is not None:
+            self.fetch_seconds.observe(site, value=seconds)
+            state['last_fetch_seconds'] = seconds
+        if size is not None:
+            self.fetch_bytes.observe(site, value=size)
+            state['last_bytes'] = size
+
+    def observe_cache_hit(self, site, kind):
+        self.cache_hits.inc(site, kind)
+
+    def observe_parse(self, site, stats):
+        """Record the stats dict filled in by extract_tenders."""
+        self.parse_seconds.observe(site, value=stats['parse_seconds'])
+        self.extract_seconds.observe(site, value=stats['extract_seconds'])
+        self.score_seconds.observe(site, value=stats['score_seconds'])
+        self.rows.inc(site, amount=stats['rows'])
+        self.cached_rows.inc(site, amount=stats['cached_rows'])
+        self.matches.inc(site, amount=stats['matches'])
+        self.last_rows.set(site, value=stats['rows'])
+        if stats['row_errors']:
+            self.errors.inc(site, 'row', amount=stats['row_errors'])
+        state = self._site(site)
+        state['last_parse_seconds'] = stats['parse_seconds'] + stats['extract_seconds'] + stats['score_seconds']
+        state['last_rows'] = stats['rows']
+        state['last_matches'] = stats['matches']
+
+    def observe_error(self, site, stage, error):
+        self.errors.inc(site, stage)
+        self._site(site)['last_error'] = error
+
+    def observe_skip(self, site):
+        self.skips.inc(site)
+
+    def observe_success(self, site):
+        now = time.time()
+        self.last_success.set(site, value=now)
+        state = self._site(site)
+        state['last_success_at'] = now
+        state['last_error'] = None
+
+    def observe_run(self, seconds):
+        self.run_seconds.observe(value=seconds)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def site_health(self, site_names):
+        """Per-site summary of the latest fetch and parse plus lifetime averages and error counts."""
+        health = []
+        for name in site_names:
+            state = dict(self._site(name))
+            fetches, fetch_total = self.fetch_seconds.summary(name)
+            errors = {stage: self.errors.get(name, stage) for stage in ('fetch', 'parse', 'row')}
+            state.update({
+                'name': name,
+                'fetches': fetches,
+                'avg_fetch_seconds': fetch_total / fetches if fetches else None,
+                'errors': errors,
+                # Healthy: the last attempt worked and the selector still finds rows
+                'healthy': state['last_error'] is None and state['last_success_at'] is not None
+                           and state['last_rows'] != 0
+            })
+            health.append(state)
+        return health
@@ -1,7 +1,7 @@
 
 # Pydantic Models for request and response
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, Field
 
 
@@ -14,6 +14,29 @@ class Tender(BaseModel):
     scraped_at: str
     tag: Optional[str] = None
     match_score: Optional[float] = None
+    first_seen: Optional[str] = None
+
+class TenderPage(BaseModel):
+    items: List[Tender]
+    total: int
+    limit: int
+    offset: int
+    max_score: float = 0
+
+class SearchHit(Tender):
+    relevance: float = 0
+
+class SearchFacet(BaseModel):
+    website: str
+    count: int
+
+class SearchResults(BaseModel):
+    query: str
+    items: List[SearchHit]
+    total: int
+    limit: int
+    offset: int
+    facets: List[SearchFacet] = []
 
 class WebsiteConfig(BaseModel):
     name: str
@@ -23,6 +46,20 @@ class WebsiteConfig(BaseModel):
     date_selector: str
     link_selector: str
     base_url: Optional[str] = None
+    tags_selector: Optional[str] = None
+    parser: Optional[str] = None
+    date_format: Optional[str] = None
+    next_page_selector: Optional[str] = None
+    page_url_template: Optional[str] = None
+    page_start: Optional[int] = None
+    max_pages: Optional[int] = None
+
+class SiteFreshness(BaseModel):
+    name: str
+    last_scraped_at: Optional[str] = None
+    last_attempt_at: Optional[str] = None
+    last_error: Optional[str] = None
+    tender_count: int = 0
 
 class EmailSettings(BaseModel):
     enabled: bool
@@ -49,8 +86,65 @@ class CurrentAppConfig(BaseModel):
 class RefreshResponse(BaseModel):
     status: str
     message: str
+    new_tenders_count: int = 0
+    job_id: Optional[str] = None
+
+class RefreshJobStatus(BaseModel):
+    job_id: str
+    status: str
+    message: str
+    started_at: str
+    finished_at: Optional[str] = None
+    total_sites: int
+    completed_sites: int
     new_tenders_count: int
 
+class SiteErrorCounts(BaseModel):
+    fetch: int = 0
+    parse: int = 0
+    row: int = 0
+
+class SiteHealth(BaseModel):
+    name: str
+    healthy: bool
+    last_status: Optional[Union[int, str]] = None
+    last_fetch_seconds: Optional[float] = None
+    avg_fetch_seconds: Optional[float] = None
+    fetches: int = 0
+    last_bytes: Optional[int] = None
+    last_parse_seconds: Optional[float] = None
+    last_rows: Optional[int] = None
+    last_matches: Optional[int] = None
+    last_error: Optional[str] = None
+    last_success_at: Optional[float] = None
+    errors: SiteErrorCounts
+
+class SiteBreaker(BaseModel):
+    name: str
+    state: str
+    failures: int = 0
+    trips: int = 0
+    open_until: Optional[str] = None
+    last_failure_at: Optional[str] = None
+    last_error: Optional[str] = None
+
+class SiteSchedule(BaseModel):
+    name: str
+    interval_hours: float
+    next_due_at: Optional[str] = None
+    last_checked_at: Optional[str] = None
+    last_changed_at: Optional[str] = None
+    checks: int = 0
+    changes: int = 0
+
+class ScheduleStatus(BaseModel):
+    mode: str
+    schedule: str
+    last_run_at: Optional[str] = None
+    next_run_at: Optional[str] = None
+    running: bool
+    sites: List[SiteSchedule] = []
+
 class StatusResponse(BaseModel):
     status: str
     message: str
\ No newline at end of file
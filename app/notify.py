@@ -0,0 +1,221 @@
+# filepath: app/notify.py
+import html
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger("TenderScraper")
+
+
+def parse_recipients(raw):
+    """Split the comma separated recipient_email setting into addresses."""
+    return [address.strip() for address in (raw or '').split(',') if address.strip()]
+
+
+def build_digest_html(tenders_map):
+    """Render {website: [TenderRecord, ...]} as the notification body."""
+    parts = ["<html><body><h2>New Tenders Notification</h2>"]
+    for website, tenders_list in tenders_map.items():
+        if not tenders_list:
+            continue
+        parts.append(f"<h3>{html.escape(website)}</h3><ul>")
+        for tender in tenders_list:
+            item = f"<li><strong>{html.escape(tender.title)}</strong> - {html.escape(tender.date)}"
+            if tender.link:
+                item += f" - <a href='{html.escape(tender.link, quote=True)}'>Download/View</a>"
+            parts.append(item + "</li>")
+        parts.append("</ul>")
+    parts.append("</body></html>")
+    return '\n'.join(parts)
+
+
+class EmailNotifier:
+    """
+    Sends new-tender emails from a background thread, off the scrape path.
+
+    notify() only queues a run's new tenders. The worker merges everything that
+    arrives within digest_minutes of the first queued batch into one digest
+    (de-duplicated by tender id), then sends a separate copy to each recipient.
+    One SMTP connection is reused across messages and digests and closed after
+    idle_seconds without mail. Recipients that fail are retried with
+    exponential backoff, up to max_retries times.
+    """
+
+    def __init__(self, email_config, digest_minutes=0, max_retries=3, retry_backoff=30, idle_seconds=60):
+        self.email_config = email_config
+        self.digest_seconds = digest_minutes * 60
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_seconds = idle_seconds
+        self._queue = queue.Queue()
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._stopping = threading.Event()
+        self._thread = None
+        self._smtp = None
+        self._smtp_key = None
+
+    @classmethod
+    def from_config(cls, email_config, config):
+        return cls(
+            email_config,
+            digest_minutes=config.getfloat('Email', 'digest_minutes', fallback=0),
+            max_retries=config.getint('Email', 'max_retries', fallback=3),
+            retry_backoff=config.getfloat('Email', 'retry_backoff_seconds', fallback=30)
+        )
+
+    def notify(self, new_tenders_map):
+        """Queue one run's {website: [TenderRecord, ...]} for sending; returns immediately."""
+        batch = {website: list(tenders) for website, tenders in new_tenders_map.items() if tenders}
+        if not batch:
+            return
+        with self._cond:
+            self._pending += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._worker, name="email-notifier", daemon=True)
+                self._thread.start()
+        self._queue.put(batch)
+
+    def flush(self, timeout=None):
+        """Wait until every queued batch has been sent (or given up on); returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=10):
+        """Send whatever is queued right away, without waiting out the digest window, and stop the worker."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _done(self, count):
+        with self._cond:
+            self._pending -= count
+            self._cond.notify_all()
+
+    @staticmethod
+    def _merge(digest, batch):
+        for website, tenders in batch.items():
+            merged = digest.setdefault(website, {})
+            for tender in tenders:
+                merged.setdefault(tender.id, tender)
+
+    def _worker(self):
+        while True:
+            try:
+                batch = self._queue.get(timeout=self.idle_seconds if self._smtp else None)
+            except queue.Empty:
+                self._close()
+                continue
+            if batch is None:
+                break
+            digest, batches = {}, 1
+            self._merge(digest, batch)
+            stop = False
+            deadline = time.monotonic() + self.digest_seconds
+            while not self._stopping.is_set() and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if batch is None:
+                    stop = True
+                    break
+                self._merge(digest, batch)
+                batches += 1
+            try:
+                self._send_digest({website: list(tenders.values()) for website, tenders in digest.items()})
+            except Exception as e:
+                logger.error(f"Error sending email notification: {e}", exc_info=True)
+            finally:
+                self._done(batches)
+            if stop:
+                break
+        self._close()
+
+    def _send_digest(self, tenders_map):
+        # smtplib and email are only imported once there is mail to send
+        import smtplib
+
+        recipients = parse_recipients(self.email_config['recipient_email'])
+        if not recipients:
+            logger.warning("New tenders found but no recipient_email is configured.")
+            return
+        count = sum(len(tenders) for tenders in tenders_map.values())
+        subject = f"New Tenders Notification - {datetime.now().strftime('%Y-%m-%d')}"
+        body = build_digest_html(tenders_map)
+        for attempt in range(self.max_retries + 1):
+            failed = []
+            for recipient in recipients:
+                try:
+                    self._send(recipient, subject, body)
+                    logger.info(f"Email notification with {count} new tenders sent to {recipient}")
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.warning(f"Error sending email notification to {recipient} (attempt {attempt + 1}): {e}")
+                    # Drop a possibly broken connection; the next attempt reconnects
+                    self._close()
+                    failed.append(recipient)
+            if not failed:
+                return
+            recipients = failed
+            if attempt < self.max_retries and not self._stopping.is_set():
+                self._stopping.wait(self.retry_backoff * 2 ** attempt)
+        logger.error(f"Giving up on email notification to {', '.join(recipients)}")
+
+    def _send(self, recipient, subject, body):
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        msg = MIMEMultipart()
+        msg['From'] = self.email_config['sender_email']
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        # utf-8 is base64 encoded: keeps lines short for SMTP and carries non-ASCII titles
+        msg.attach(MIMEText(body, 'html', 'utf-8'))
+        self._connection().send_message(msg)
+
+    def _connection(self):
+        import smtplib
+
+        config = self.email_config
+        key = (config['smtp_server'], config['smtp_port'], config['sender_email'], config.get('starttls', True))
+        if self._smtp is not None and self._smtp_key == key:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._close()
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=30)
+        try:
+            if config.get('starttls', True):
+                server.starttls()
+            if config['password']:
+                server.login(config['sender_email'], config['password'])
+        except Exception:
+            server.close()
+            raise
+        self._smtp, self._smtp_key = server, key
+        return server
+
+    def _close(self):
+        if self._smtp is None:
+            return
+        import smtplib
+
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
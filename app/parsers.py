@@ -0,0 +1,145 @@
+# filepath: app/parsers.py
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger("TenderScraper")
+
+DEFAULT_PARSER = 'html.parser'
+
+# Backends share one interface: parse(html) returns a document, compile(css) a selector that
+# select(node, selector) / select_one(node, selector) run, plus text/attr/stripped_strings/markup on nodes.
+
+
+class SoupBackend:
+    """
+    BeautifulSoup tree with soupsieve selectors.
+
+    `html.parser` is the pure-Python builder the scraper always used; `lxml`
+    builds the same soup through libxml2, which is several times faster on big
+    tables while keeping soupsieve's selector semantics.
+    """
+
+    def __init__(self, features):
+        from bs4 import BeautifulSoup
+        import soupsieve
+        self.name = features
+        self._soup_class = BeautifulSoup
+        self._soupsieve = soupsieve
+
+    def parse(self, html):
+        return self._soup_class(html, self.name)
+
+    @lru_cache(maxsize=512)
+    def compile(self, css):
+        return self._soupsieve.compile(css)
+
+    @staticmethod
+    def select(node, selector):
+        return selector.select(node)
+
+    @staticmethod
+    def select_one(node, selector):
+        return selector.select_one(node)
+
+    @staticmethod
+    def text(node):
+        return node.text
+
+    @staticmethod
+    def attr(node, name):
+        value = node.get(name)
+        # Multi-valued attributes such as class come back as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+    @staticmethod
+    def stripped_strings(node):
+        return list(node.stripped_strings)
+
+    @staticmethod
+    def markup(node):
+        # formatter=None skips entity substitution, which is most of decode()'s cost
+        return node.decode(formatter=None)
+
+
+class SelectolaxBackend:
+    """
+    selectolax on the lexbor engine: C parser and C selector matching.
+
+    Selectors are parsed by lexbor on each call (it has no public compiled
+    selector object), which is still far cheaper than soupsieve's Python matcher.
+    Malformed markup is rebuilt the HTML5 way (a link nested in another link is
+    split off, for one), so child selectors can match differently than in the soup
+    backends; keep sites with such pages on html.parser.
+    """
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser_class(html)
+
+    def compile(self, css):
+        return css
+
+    @staticmethod
+    def select(node, selector):
+        return node.css(selector)
+
+    @staticmethod
+    def select_one(node, selector):
+        return node.css_first(selector)
+
+    @staticmethod
+    def text(node):
+        return node.text(deep=True)
+
+    @staticmethod
+    def attr(node, name):
+        return node.attributes.get(name)
+
+    @staticmethod
+    def stripped_strings(node):
+        return [s for s in node.text(deep=True, separator='\x00', strip=True).split('\x00') if s]
+
+    @staticmethod
+    def markup(node):
+        return node.html
+
+
+_BACKEND_FACTORIES = {
+    'html.parser': lambda: SoupBackend('html.parser'),
+    'lxml': lambda: SoupBackend('lxml'),
+    'selectolax': SelectolaxBackend
+}
+_backends = {}
+
+
+def get_parser(name=None):
+    """
+    Return the parser backend called `name`, built once per process.
+
+    Unknown names, or backends whose optional dependency is not installed, fall
+    back to the default html.parser backend with a warning. The fallback is
+    remembered under the requested name, so the warning is logged once per process.
+    """
+    name = (name or DEFAULT_PARSER).strip().lower()
+    if name not in _backends:
+        factory = _BACKEND_FACTORIES.get(name)
+        if factory is None:
+            logger.warning(f"Unknown parser '{name}', falling back to {DEFAULT_PARSER}")
+            _backends[name] = get_parser(DEFAULT_PARSER)
+            return _backends[name]
+        try:
+            backend = factory()
+            if name == 'lxml':
+                backend.parse('<p></p>')  # bs4 only reports a missing lxml when it is first used
+        except Exception as e:
+            if name == DEFAULT_PARSER:
+                raise
+            logger.warning(f"Parser '{name}' is unavailable ({e}), falling back to {DEFAULT_PARSER}")
+            backend = get_parser(DEFAULT_PARSER)
+        _backends[name] = backend
+    return _backends[name]
@@ -0,0 +1,90 @@
+# filepath: app/records.py
+import hashlib
+import re
+import sys
+from dataclasses import dataclass
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Collapse whitespace and case so cosmetic edits don't change a tender's identity."""
+    return _WHITESPACE.sub(' ', text or '').strip().casefold()
+
+
+def tender_id(site_name, title, date, link):
+    """
+    Short, stable id for a tender: 16 hex chars of a BLAKE2b hash.
+
+    The hash covers the site name and the normalized title, date and link, so
+    the same tender gets the same id however its whitespace or case is rendered.
+    """
+    payload = '\x1f'.join((site_name, normalize_text(title), normalize_text(date), (link or '').strip()))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class SiteRef:
+    """The site a tender came from; one shared instance per site, see site_ref."""
+    name: str
+    url: str
+
+
+_site_refs = {}
+
+
+def site_ref(name, url):
+    """Return the interned SiteRef for (name, url), creating it on first use."""
+    key = (name, url)
+    ref = _site_refs.get(key)
+    if ref is None:
+        ref = _site_refs.setdefault(key, SiteRef(sys.intern(name), sys.intern(url or '')))
+    return ref
+
+
+@dataclass(slots=True)
+class TenderRecord:
+    """
+    One scraped tender.
+
+    Records share their SiteRef and, within a scrape, their tag and scraped_at
+    strings, so a large history costs little more than its titles and links.
+    to_dict() gives the flat dict shape used by the API, exports and emails.
+    """
+    id: str
+    site: SiteRef
+    title: str
+    date: str
+    link: str
+    tag: str
+    match_score: float
+    scraped_at: str
+
+    @classmethod
+    def create(cls, site, title, date, link, tag, match_score, scraped_at):
+        return cls(tender_id(site.name, title, date, link), site, title, date, link, sys.intern(tag),
+                   match_score, scraped_at)
+
+    @classmethod
+    def from_dict(cls, data, site_name):
+        """Build a record from a legacy tender dict, re-deriving its id."""
+        return cls.create(
+            site_ref(site_name, data.get('website')), data.get('title') or '', data.get('date') or '',
+            data.get('link') or '', data.get('tag') or site_name, data.get('match_score'), data.get('scraped_at')
+        )
+
+    @property
+    def website(self):
+        return self.site.url
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'match_score': self.match_score,
+            'tag': self.tag,
+            'website': self.site.url,
+            'title': self.title,
+            'date': self.date,
+            'link': self.link,
+            'scraped_at': self.scraped_at
+        }
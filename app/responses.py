@@ -0,0 +1,132 @@
+# filepath: app/responses.py
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as is: compressing them saves less than the header costs
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _accepted_encodings(header):
+    """Content codings the client accepts, from an Accept-Encoding header (q=0 excludes one)."""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding and weight > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def _etag_matches(header, etags):
+    """If-None-Match uses the weak comparison, so W/ prefixes are ignored."""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return not candidates.isdisjoint(etags)
+
+
+class CachedBody:
+    """One serialized response and its compressed variants, each with its own strong ETag."""
+
+    __slots__ = ('version', 'variants')
+
+    def __init__(self, version, body):
+        self.version = version
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.variants = {'identity': (body, f'"{digest}"')}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.variants['br'] = (brotli.compress(body, quality=BROTLI_QUALITY), f'"{digest}-br"')
+            # mtime=0 keeps the bytes, and so the ETag, identical across rebuilds
+            self.variants['gzip'] = (gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), f'"{digest}-gzip"')
+
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+    def pick(self, accept_encoding):
+        accepted = _accepted_encodings(accept_encoding)
+        for coding in ('br', 'gzip'):
+            if coding in self.variants and (coding in accepted or '*' in accepted):
+                return coding
+        return 'identity'
+
+
+class ApiResponseCache:
+    """
+    Serialized JSON responses, built once per data version and kept as bytes.
+
+    Each entry is keyed on the endpoint and its query parameters and tagged with
+    the version of the data it was built from (see TenderStore.data_version and
+    SiteRegistry.version); a request with the same key and version is answered
+    from the cached bytes without running the query or Pydantic serialization.
+    Bodies are stored gzip (and brotli, if installed) compressed alongside the
+    plain one, with a strong ETag per variant, so an If-None-Match from a client
+    that already has the current data gets a bodiless 304.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def _get(self, key, version, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        # Built outside the lock; two concurrent misses both build, the last one is kept
+        entry = CachedBody(version, build())
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, request, key, version, build):
+        """
+        Response for request from the entry (key, version), calling build() for
+        the JSON body bytes when that version is not cached yet.
+        """
+        entry = self._get(key, version, build)
+        coding = entry.pick(request.headers.get('accept-encoding'))
+        body, etag = entry.variants[coding]
+        # no-cache: clients may keep the body but must revalidate it, which costs them a 304
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if _etag_matches(request.headers.get('if-none-match'), entry.etags()):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if coding != 'identity':
+            headers['Content-Encoding'] = coding
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
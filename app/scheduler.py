@@ -0,0 +1,366 @@
+# filepath: app/scheduler.py
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger("TenderScraper")
+
+LAST_RUN_KEY = 'scheduler.last_run_at'
+
+# (name, lowest value, highest value) for the five cron fields
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_str = part.split('/', 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_str}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_str, end_str = part.split('-', 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron value out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Minimal five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept *, numbers, ranges (a-b), lists (a,b) and steps (*/n, a-b/n).
+    Day of week runs 0-6 from Sunday (7 is also Sunday). As in cron, when both day
+    fields are restricted a time matches if either one does.
+    """
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(parts)}: {expression!r}")
+        self.expression = expression
+        fields = [_parse_cron_field(part, low, high) for part, (_, low, high) in zip(parts, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {day % 7 for day in weekdays}
+        self._day_restricted = parts[2] != '*'
+        self._weekday_restricted = parts[4] != '*'
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """First matching minute strictly after `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=candidate.year + (month == 1), month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+class AdaptiveIntervals:
+    """
+    Per-site poll intervals that follow how often each site actually changes.
+
+    Every check moves the site's interval multiplicatively: a check that found a
+    change halves it, a check that found nothing grows it by half, always within
+    [min_interval, max_interval]. Sites that post daily settle near a few hours,
+    sites that post monthly drift out to the maximum. A failed fetch keeps the
+    interval as it was. State lives in the store's site_schedule table.
+    """
+
+    SPEED_UP = 0.5
+    SLOW_DOWN = 1.5
+
+    def __init__(self, store, initial_interval, min_interval, max_interval, jitter=timedelta(0)):
+        self.store = store
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.initial_interval = self._clamp(initial_interval)
+        self.jitter = jitter
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _with_jitter(self, moment):
+        if self.jitter:
+            moment += timedelta(seconds=random.uniform(0, self.jitter.total_seconds()))
+        return moment
+
+    def site_checked(self, site_result):
+        """
+        Refresh-job listener: queue a checked site for save_checked.
+
+        Called on the scrape's event loop once per site, so it only records the result;
+        the store is read and written once per run, off the loop.
+        """
+        with self._pending_lock:
+            self._pending.append(site_result)
+
+    def save_checked(self, job=None):
+        """Refresh-job done listener: update the interval and next due time of every site checked."""
+        with self._pending_lock:
+            site_results, self._pending = self._pending, []
+        if not site_results:
+            return
+        states = self.store.get_site_schedules()
+        schedules = []
+        for site_result in site_results:
+            name = site_result['website']
+            checked_at = datetime.fromisoformat(site_result['finished_at'])
+            state = states.get(name)
+            interval = timedelta(hours=state['interval_hours']) if state else self.initial_interval
+            changed = False
+            if site_result['error'] is None:
+                changed = site_result.get('changed', False)
+                interval = self._clamp(interval * (self.SPEED_UP if changed else self.SLOW_DOWN))
+            schedules.append((
+                name, interval.total_seconds() / 3600, self._with_jitter(checked_at + interval).isoformat(),
+                checked_at.isoformat(), changed
+            ))
+        self.store.save_site_schedules(schedules)
+
+    def due_sites(self, site_names, now):
+        """Return (names due at `now`, earliest next due time among the rest)."""
+        states = self.store.get_site_schedules()
+        due, next_due = [], None
+        for name in site_names:
+            state = states.get(name)
+            due_at = datetime.fromisoformat(state['next_due_at']) if state else now
+            if due_at <= now:
+                due.append(name)
+            elif next_due is None or due_at < next_due:
+                next_due = due_at
+        return due, next_due
+
+    def postpone_overdue(self, site_names, now):
+        """Move sites that fell due while the app was down to one interval from now."""
+        states = self.store.get_site_schedules()
+        for name in site_names:
+            state = states.get(name)
+            if state and datetime.fromisoformat(state['next_due_at']) <= now:
+                self.store.save_site_schedule(
+                    name, state['interval_hours'],
+                    self._with_jitter(now + timedelta(hours=state['interval_hours'])).isoformat()
+                )
+
+    def sites(self, site_names):
+        states = self.store.get_site_schedules()
+        result = []
+        for name in site_names:
+            state = states.get(name) or {}
+            result.append({
+                'name': name,
+                'interval_hours': state.get('interval_hours', self.initial_interval.total_seconds() / 3600),
+                'next_due_at': state.get('next_due_at'),
+                'last_checked_at': state.get('last_checked_at'),
+                'last_changed_at': state.get('last_changed_at'),
+                'checks': state.get('checks', 0),
+                'changes': state.get('changes', 0)
+            })
+        return result
+
+
+class ScrapeScheduler:
+    """
+    Background scheduler for periodic scrapes.
+
+    Runs on an interval or a cron expression, with optional random jitter. Runs go
+    through the shared RefreshJobManager, so a scheduled run never overlaps a manual
+    refresh. The last run time is persisted in the tender store; when catch_up is on
+    and a run was missed while the app was down, one run starts right after startup.
+
+    With adaptive scheduling (and no cron expression) each site gets its own
+    interval from AdaptiveIntervals, and a run only scrapes the sites that are due.
+    """
+
+    def __init__(self, refresh_jobs, store, interval_hours=24, cron=None, jitter_minutes=0, catch_up=True,
+                 adaptive=False, min_interval_hours=1, max_interval_hours=168):
+        self.refresh_jobs = refresh_jobs
+        self.store = store
+        self.interval = timedelta(hours=interval_hours)
+        self.cron = CronSchedule(cron) if cron else None
+        self.jitter = timedelta(minutes=jitter_minutes)
+        self.catch_up = catch_up
+        self.next_run_at = None
+        self.adaptive = None
+        if adaptive and not self.cron:
+            self.adaptive = AdaptiveIntervals(
+                store, self.interval,
+                timedelta(hours=min_interval_hours), timedelta(hours=max_interval_hours),
+                jitter=self.jitter
+            )
+            # Manual refreshes count as checks too
+            refresh_jobs.add_listener(self.adaptive.site_checked)
+            refresh_jobs.add_done_listener(self.adaptive.save_checked)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, refresh_jobs, store, config):
+        try:
+            interval_hours = float(config.get('General', 'check_interval_hours', fallback='24'))
+            if interval_hours <= 0:
+                logger.warning(f"Invalid check_interval_hours: {interval_hours}. Defaulting to 24.")
+                interval_hours = 24
+        except ValueError:
+            logger.error("Invalid format for check_interval_hours. Defaulting to 24.")
+            interval_hours = 24
+        cron = config.get('Schedule', 'cron', fallback='').strip() or None
+        if cron:
+            try:
+                CronSchedule(cron)
+            except ValueError as e:
+                logger.error(f"Invalid [Schedule] cron ({e}). Falling back to the {interval_hours}h interval.")
+                cron = None
+        return cls(
+            refresh_jobs, store,
+            interval_hours=interval_hours,
+            cron=cron,
+            jitter_minutes=config.getfloat('Schedule', 'jitter_minutes', fallback=0),
+            catch_up=config.getboolean('Schedule', 'catch_up', fallback=True),
+            adaptive=config.getboolean('Schedule', 'adaptive', fallback=False),
+            min_interval_hours=config.getfloat('Schedule', 'min_interval_hours', fallback=1),
+            max_interval_hours=config.getfloat('Schedule', 'max_interval_hours', fallback=168)
+        )
+
+    @property
+    def last_run_at(self):
+        value = self.store.get_meta(LAST_RUN_KEY)
+        return datetime.fromisoformat(value) if value else None
+
+    def _next_run(self, after):
+        base = self.cron.next_after(after) if self.cron else after + self.interval
+        if self.jitter:
+            base += timedelta(seconds=random.uniform(0, self.jitter.total_seconds()))
+        return base
+
+    def _first_run(self, now):
+        last_run = self.last_run_at
+        if last_run is None:
+            return now
+        due = self._next_run(last_run)
+        if due <= now:
+            # Missed while the app was down: catch up with a single run, or wait for the next slot
+            return now if self.catch_up else self._next_run(now)
+        return due
+
+    def _site_names(self):
+        return [site.name for site in self.refresh_jobs.scraper.websites]
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        loop = self._adaptive_loop if self.adaptive else self._loop
+        self._thread = threading.Thread(target=loop, name="scrape-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Background scraper scheduler started ({self.describe()}).")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def describe(self):
+        if self.adaptive:
+            mode = (f"adaptive per site, {self.adaptive.min_interval.total_seconds() / 3600:g}"
+                    f"-{self.adaptive.max_interval.total_seconds() / 3600:g} hours")
+        elif self.cron:
+            mode = f"cron '{self.cron.expression}'"
+        else:
+            mode = f"every {self.interval.total_seconds() / 3600:g} hours"
+        if self.jitter:
+            mode += f", jitter up to {self.jitter.total_seconds() / 60:g} min"
+        return mode
+
+    def status(self):
+        last_run = self.last_run_at
+        return {
+            'mode': 'adaptive' if self.adaptive else 'cron' if self.cron else 'interval',
+            'schedule': self.describe(),
+            'last_run_at': last_run.isoformat() if last_run else None,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'running': self.refresh_jobs.current is not None and not self.refresh_jobs.current.done,
+            'sites': self.adaptive.sites(self._site_names()) if self.adaptive else []
+        }
+
+    def _run_job(self, websites=None):
+        """Start (or join) a refresh job and wait for it; returns False if stopped meanwhile."""
+        job, created = self.refresh_jobs.start(websites=websites)
+        if not created:
+            logger.info(f"Background scraper task: joining refresh job {job.id} already in progress.")
+        while not job.wait(timeout=5):
+            if self._stop.is_set():
+                return False
+        if job.status == 'error':
+            raise RuntimeError(job.message)
+        return True
+
+    def _loop(self):
+        self.next_run_at = self._first_run(datetime.now())
+        while not self._stop.is_set():
+            delay = (self.next_run_at - datetime.now()).total_seconds()
+            if delay > 0:
+                # Wake up at least hourly so clock changes don't push runs far off schedule
+                self._stop.wait(min(delay, 3600))
+                continue
+            started_at = datetime.now()
+            try:
+                logger.info("Background scraper task: Starting run.")
+                if not self._run_job():
+                    return
+                self.store.set_meta(LAST_RUN_KEY, started_at.isoformat())
+                self.next_run_at = self._next_run(started_at)
+                logger.info(f"Background scraper task: Run finished. Next run at {self.next_run_at}.")
+            except Exception as e:
+                logger.error(f"Background scraper task: Error during scheduled run: {e}", exc_info=True)
+                # Retry sooner on error, but not in a busy loop
+                self.next_run_at = datetime.now() + min(self.interval, timedelta(minutes=5))
+
+    def _adaptive_loop(self):
+        if not self.catch_up:
+            self.adaptive.postpone_overdue(self._site_names(), datetime.now())
+        while not self._stop.is_set():
+            now = datetime.now()
+            due, next_due = self.adaptive.due_sites(self._site_names(), now)
+            if not due:
+                self.next_run_at = next_due
+                delay = (next_due - now).total_seconds() if next_due else 3600
+                self._stop.wait(min(max(delay, 1), 3600))
+                continue
+            self.next_run_at = now
+            try:
+                logger.info(f"Background scraper task: Checking {len(due)} due site(s): {', '.join(due)}")
+                if not self._run_job(websites=due):
+                    return
+                self.store.set_meta(LAST_RUN_KEY, now.isoformat())
+            except Exception as e:
+                logger.error(f"Background scraper task: Error during scheduled run: {e}", exc_info=True)
+                self._stop.wait(min(self.adaptive.min_interval, timedelta(minutes=5)).total_seconds())
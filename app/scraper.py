@@ -1,19 +1,28 @@
 # filepath: app/scraper.py
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import asyncio
+import hashlib
 import json
 import os
 import logging
+import queue
+import threading
 from datetime import datetime
-# import time # Not used directly in TenderScraper after removing schedule_scraper
+import time
 import configparser
-from urllib.parse import urljoin
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import BrokenExecutor
+
+from app.breaker import HALF_OPEN, OPEN, SiteBreakers
+from app.cache import ResponseCache, content_hash
+from app.export import TenderExporter
+from app.dates import months_ago, parse_short_date
+from app.extract import MAX_TENDER_AGE_MONTHS, extract_page
+from app.matcher import KeywordMatcher, parse_keywords, parse_weights
+from app.metrics import ScrapeMetrics
+from app.notify import EmailNotifier
+from app.sites import SiteRegistry
+from app.store import TenderStore
+# httpx (via app.fetcher), the process pool and the HTML parsers are imported where a scrape first needs
+# them, so importing this module (the web app, `python -m app.cli --help`) stays cheap
 
 # Set up logging
 logging.basicConfig(
@@ -26,6 +35,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("TenderScraper")
 
+# Default [Parse] workers when unset: one per core, up to this many
+MAX_DEFAULT_PARSE_WORKERS = 4
+
+
+def _add_page_stats(total, stats):
+    # Sum the per-page counters and timings; keep the first page error and the latest next link
+    for key, value in stats.items():
+        if key == 'page_error':
+            total[key] = total[key] or value
+        elif key == 'next_page':
+            total[key] = value
+        else:
+            total[key] += value
+
+
 class TenderScraper:
     def __init__(self, config_path="config/config.ini", websites_config_path="config/websites_config.json"): # Adjusted paths
         self.config = configparser.ConfigParser()
@@ -37,29 +61,66 @@ class TenderScraper:
 
         self.config.read(self.config_path)
         self.output_dir = self.config.get('General', 'output_directory', fallback='output')
-        self.email_config = {
-            'enabled': self.config.getboolean('Email', 'enabled', fallback=False),
-            'smtp_server': self.config.get('Email', 'smtp_server', fallback='smtp.gmail.com'),
-            'smtp_port': self.config.getint('Email', 'smtp_port', fallback=587),
-            'sender_email': self.config.get('Email', 'sender_email', fallback=''),
-            'password': self.config.get('Email', 'password', fallback=''),
-            'recipient_email': self.config.get('Email', 'recipient_email', fallback='')
+        self.email_config = self._read_email_config()
+        self.notifier = EmailNotifier.from_config(self.email_config, self.config)
+        self.keywords = parse_keywords(self.config.get('General', 'keywords', fallback=''))
+        # Compiled once per config load; scores each title in a single pass
+        self.matcher = KeywordMatcher(
+            self.keywords,
+            weights=parse_weights(self.config.get('General', 'keyword_weights', fallback='')),
+            word_boundary=self.config.get('General', 'keyword_match', fallback='substring').strip().lower() == 'word'
+        )
+        self.parser = self.config.get('General', 'parser', fallback='html.parser')
+        self.fetch_config = {
+            'max_concurrency': self.config.getint('Fetch', 'max_concurrency', fallback=20),
+            'per_host_concurrency': self.config.getint('Fetch', 'per_host_concurrency', fallback=2),
+            'connect_timeout': self.config.getfloat('Fetch', 'connect_timeout', fallback=10.0),
+            'read_timeout': self.config.getfloat('Fetch', 'read_timeout', fallback=30.0),
+            'retries': self.config.getint('Fetch', 'retries', fallback=2),
+            'backoff_factor': self.config.getfloat('Fetch', 'backoff_factor', fallback=1.0),
+            'rate_limit': self.config.getfloat('Fetch', 'rate_limit_per_host', fallback=0.0),
+            'rate_burst': self.config.getint('Fetch', 'rate_limit_burst', fallback=1),
+            'respect_robots': self.config.getboolean('Fetch', 'respect_robots', fallback=False)
+        }
+        parse_workers = self.config.getint('Parse', 'workers', fallback=0) or min(
+            os.cpu_count() or 1, MAX_DEFAULT_PARSE_WORKERS
+        )
+        self.parse_config = {
+            'workers': parse_workers,
+            'queue_size': self.config.getint('Parse', 'queue_size', fallback=0) or 2 * parse_workers,
+            'row_cache': self.config.getboolean('Parse', 'row_cache', fallback=True)
         }
-        self.keywords = self.config.get('General', 'keywords', fallback='').split(',')
 
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-        self.websites = self.load_websites_config()
-        self.prev_data_file = os.path.join(self.output_dir, 'previous_tenders.json')
-        self.previous_tenders = self.load_previous_tenders()
+        # Validated, immutable site specs; hot-reloaded when websites_config.json changes
+        self.sites = SiteRegistry(self.websites_config_path)
+        self.prev_data_file = os.path.join(self.output_dir, 'previous_tenders.json')  # Legacy, imported once into the store
+        self.store = TenderStore(os.path.join(self.output_dir, 'tenders.db'))
+        self._previous_tenders = None
+        self.breakers = SiteBreakers.from_config(self.store, self.config)
+        self._response_cache = None
+        # Per-site row caches, site name -> (site fingerprint, {row fingerprint: result}); loaded on first use
+        self._row_caches = {}
+        # Started by the first scrape that needs it and kept until close(); False if it could not start
+        self._parse_executor = None
+        self._parse_executor_lock = threading.Lock()
+        self.exporter = TenderExporter.from_config(self.config, self.output_dir)
+        self._site_callbacks = []
+        self.metrics = ScrapeMetrics()
+        # Serialises runs on this shared instance (API refreshes, scheduler, CLI)
+        self._run_lock = threading.Lock()
+        # Bumped when the email or general settings change, for caches of /api/config
+        self.config_version = 0
 
     def create_default_config(self, config_path_to_create):
         logger.info(f"Creating default configuration file at {config_path_to_create}...")
         default_config = configparser.ConfigParser()
         default_config['General'] = {
             'output_directory': 'output',
-            'check_interval_hours': '24'
+            'check_interval_hours': '24',
+            'parser': 'html.parser'
         }
         
         default_config['Email'] = {
@@ -70,6 +131,37 @@ class TenderScraper:
             'password': 'your_app_password',
             'recipient_email': 'recipient@example.com'
         }
+
+        default_config['Fetch'] = {
+            'max_concurrency': '20',
+            'per_host_concurrency': '2',
+            'connect_timeout': '10',
+            'read_timeout': '30',
+            'retries': '2',
+            'backoff_factor': '1.0',
+            'rate_limit_per_host': '2',
+            'rate_limit_burst': '4',
+            'respect_robots': 'False'
+        }
+
+        default_config['CircuitBreaker'] = {
+            'failure_threshold': '3',
+            'cooldown_minutes': '30',
+            'max_cooldown_hours': '24',
+            'probe_timeout': '10'
+        }
+
+        default_config['Parse'] = {
+            'workers': '0',
+            'queue_size': '0',
+            'row_cache': 'true'
+        }
+
+        default_config['Export'] = {
+            'formats': 'csv',
+            'directory': '',
+            'keep_days': '30'
+        }
         
         os.makedirs(os.path.dirname(config_path_to_create), exist_ok=True)
         with open(config_path_to_create, 'w') as configfile:
@@ -77,230 +169,506 @@ class TenderScraper:
             
         logger.info(f"Default configuration created at {config_path_to_create}")
 
-    def load_websites_config(self):
-        if os.path.exists(self.websites_config_path):
-            try:
-                with open(self.websites_config_path, 'r') as f:
-                    config_data = json.load(f)
-                    websites = []
-
-                    for entry in config_data:
-                        if entry.get("is_group", False):
-                            # Handle grouped websites
-                            shared_config = entry.get("shared_config", {})
-                            for website in entry.get("websites", []):
-                                # Merge shared config with individual website config
-                                website_config = {**shared_config, **website}
-                                websites.append(website_config)
-                        else:
-                            # Handle individual website
-                            websites.append(entry)
-
-                    return websites
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding websites config file: {self.websites_config_path}")
-                return []  # Return empty list on error
-        else:
-            logger.warning(f"Websites config file not found: {self.websites_config_path}. Creating default.")
-            default_websites = [
-                {
-                    "is_group": False,
-                    "name": "DAV CSP",
-                    "url": "https://davcsp.org/NoticeBoardDetail.aspx",
-                    "selector": ".panel-body > div > ul > li",
-                    "title_selector": ".panel-body > div > ul > li > div > p",
-                    "date_selector": ".Mi-Notice-Board-Date",
-                    "link_selector": ".Mi-Notice-Board-Date > span > a",
-                    "base_url": "https://davcsp.org/"
-                }
-            ]
-            os.makedirs(os.path.dirname(self.websites_config_path), exist_ok=True)
-            self.save_websites_config(default_websites)
-            return default_websites
+    @property
+    def websites(self):
+        """The configured sites as SiteSpecs; picks up edits to the websites config file."""
+        return self.sites.specs()
 
-    def save_websites_config(self, websites):
-        try:
-            os.makedirs(os.path.dirname(self.websites_config_path), exist_ok=True)
-            with open(self.websites_config_path, 'w') as f:
-                json.dump(websites, f, indent=4)
-            logger.info(f"Website configurations saved to {self.websites_config_path}")
-        except Exception as e:
-            logger.error(f"Error saving websites config: {e}")
+    @property
+    def previous_tenders(self):
+        """Every site's current tenders, loaded from the store on first use rather than at startup."""
+        if self._previous_tenders is None:
+            self._previous_tenders = self.load_previous_tenders()
+        return self._previous_tenders
+
+    @property
+    def response_cache(self):
+        if self._response_cache is None:
+            self._response_cache = ResponseCache(os.path.join(self.output_dir, 'response_cache.json'))
+        return self._response_cache
 
     def load_previous_tenders(self):
-        if os.path.exists(self.prev_data_file):
-            try:
-                with open(self.prev_data_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding previous tenders file: {self.prev_data_file}")
-                return {}
-        else:
-            return {}
+        if self.store.is_empty() and os.path.exists(self.prev_data_file):
+            logger.info(f"Migrating {self.prev_data_file} into {self.store.db_path}")
+            self.store.import_json(self.prev_data_file)
+        return self.store.load_current()
 
     def save_current_tenders(self, all_tenders):
-        with open(self.prev_data_file, 'w') as f:
-            json.dump(all_tenders, f, indent=4)
+        self.store.save_all(all_tenders)
+
+    def _site_fingerprint(self, site):
+        # Anything that changes how a page is parsed must invalidate its cache entry
+        payload = json.dumps([site.to_dict(), self.matcher.signature, self.parser], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _unexpired(tenders, cutoff):
+        """Tenders dated on or after cutoff; undated ones are kept, as in extract_tenders."""
+        kept = []
+        for t in tenders:
+            # Stored dates are already normalised to dd/mm/yy, whatever the site's own format
+            tender_date = parse_short_date(t.date)
+            if tender_date is None or tender_date >= cutoff:
+                kept.append(t)
+        return kept
+
+    async def fetch_website(self, fetcher, site, cutoff):
+        """
+        I/O stage for one site.
+
+        Returns (tenders, None) when the previous result can be reused (minus tenders
+        that expired since, older than cutoff), otherwise
+        (None, page) where page holds the raw bytes for the parse stage. Fetch
+        errors propagate to the caller.
+        """
+        logger.info(f"Scraping website: {site.name}")
+        url = site.url
+        fingerprint = self._site_fingerprint(site)
+        # A cached page is only reusable if we still hold the tenders parsed from it
+        cached = None
+        if site.name in self.previous_tenders:
+            cached = self.response_cache.lookup(site.name, url, fingerprint)
+
+        headers = self.response_cache.conditional_headers(cached)
+        if self.breakers.state(site.name) == HALF_OPEN:
+            # Probe of a site that kept failing: one short attempt instead of the full timeout and retries
+            logger.info(f"Probing {site.name} after its circuit breaker cooldown")
+            response = await fetcher.fetch(url, headers=headers, timeout=self.breakers.probe_timeout, retries=0)
+        else:
+            response = await fetcher.fetch(url, headers=headers)
+        # elapsed is the HTTP round trip only, not time spent waiting for a connection slot
+        self.metrics.observe_fetch(
+            site.name, response.status_code, response.elapsed.total_seconds(), len(response.content)
+        )
+        if cached and response.status_code == 304:
+            self.response_cache.record_not_modified(cached)
+            self.metrics.observe_cache_hit(site.name, 'not_modified')
+            logger.info(f"{site.name} not modified since last run, reusing previous tenders")
+            return self._unexpired(self.previous_tenders[site.name], cutoff), None
+
+        body = response.content
+        body_hash = content_hash(body)
+        if cached and cached.get('content_hash') == body_hash:
+            self.response_cache.record_unchanged()
+            self.metrics.observe_cache_hit(site.name, 'unchanged')
+            self.response_cache.store(site.name, url, fingerprint, response.headers, body_hash, len(body))
+            logger.info(f"{site.name} content unchanged since last run, reusing previous tenders")
+            return self._unexpired(self.previous_tenders[site.name], cutoff), None
+
+        self.response_cache.record_miss()
+        return None, {
+            'site': site,
+            'url': url,
+            'body': body,
+            'encoding': response.encoding,
+            'headers': response.headers,
+            'fingerprint': fingerprint,
+            'body_hash': body_hash
+        }
 
-    def scrape_website(self, website_config):
-        logger.info(f"Scraping website: {website_config['name']}")
-        tenders = []
+    async def _fetch_page(self, fetcher, site, url):
+        """Unconditionally fetch one of a site's later pages; returns the page for the parse stage."""
+        response = await fetcher.fetch(url)
+        self.metrics.observe_fetch(
+            site.name, response.status_code, response.elapsed.total_seconds(), len(response.content)
+        )
+        return {'site': site, 'url': url, 'body': response.content, 'encoding': response.encoding}
+
+    async def _parse_page(self, executor, page, cutoff, rows=None):
+        """Parse one page; with rows (see _load_rows), reuse and record per-row results."""
+        site = page['site']
+        # Per-site `parser` in websites_config.json overrides the global [General] parser
+        parser_name = site.parser or self.parser
+        tenders, stats, row_results = await asyncio.get_running_loop().run_in_executor(
+            executor, extract_page, site, page['body'], page['encoding'], self.matcher, parser_name,
+            cutoff, page['url'], rows['previous'] if rows is not None else None
+        )
+        if row_results:
+            rows['seen'].update(row_results)
+        return tenders, stats
+
+    async def _load_rows(self, site, fingerprint):
+        """
+        The site's row cache from its last parse, for reuse while parsing this run's pages.
+
+        Returns None when row caching is off, else {'previous': cached results, 'seen': {}}
+        where 'seen' collects this run's results. A cache built under another site
+        fingerprint (selectors, keywords, parser) is discarded.
+        """
+        if not self.parse_config['row_cache']:
+            return None
+        cached = self._row_caches.get(site.name)
+        if cached is None:
+            cached = await asyncio.to_thread(self.store.get_site_rows, site.name)
+            self._row_caches[site.name] = cached
+        cached_fingerprint, previous = cached
+        return {'previous': previous if cached_fingerprint == fingerprint else {}, 'seen': {}}
+
+    async def _save_rows(self, site, fingerprint, rows):
+        # Only rows on the pages parsed this run are kept, so the cache never outgrows the site
+        if rows is None or self._row_caches.get(site.name) == (fingerprint, rows['seen']):
+            return
+        self._row_caches[site.name] = (fingerprint, rows['seen'])
+        await asyncio.to_thread(self.store.save_site_rows, site.name, fingerprint, rows['seen'])
+
+    async def _crawl_stop_reason(self, website_name, tenders, stats):
+        if stats['page_error']:
+            return 'error'
+        if not stats['rows']:
+            return 'empty'
+        if stats['stale'] == stats['rows']:
+            return 'expired'
+        if tenders and await asyncio.to_thread(self.store.has_seen_all, website_name, [t.id for t in tenders]):
+            return 'seen'
+        return None
+
+    async def crawl_website(self, fetcher, executor, page, cutoff, rows=None):
+        """
+        Parse a paginated site's first page, then fetch and parse its later pages.
+
+        Pages built from page_url_template are fetched in batches as wide as the per-host
+        limit; next_page_selector links are followed one at a time. Crawling stops after
+        max_pages, or early at a page with no rows, only expired rows, or only tenders seen
+        before. In the last case (and when a later page fails) the pages not crawled are
+        assumed unchanged, so the site's previous tenders from them are kept.
+        Returns (tenders, stats) with stats summed over the pages parsed.
+        """
+        import httpx
+
+        site = page['site']
+        website_name = site.name
+        max_pages = site.page_limit
+        template = site.page_url_template
+        page_start = site.first_page
+
+        tenders, stats = await self._parse_page(executor, page, cutoff, rows)
+        collected = {t.id: t for t in tenders}
+        reason = await self._crawl_stop_reason(website_name, tenders, stats)
+        crawled = 1
+        visited = {page['url']}
+        while reason is None and crawled < max_pages:
+            if template:
+                batch = [
+                    template.format(page=page_start + n)
+                    for n in range(crawled, min(max_pages, crawled + fetcher.per_host_concurrency))
+                ]
+            elif stats['next_page'] and stats['next_page'] not in visited:
+                batch = [stats['next_page']]
+            else:
+                break
+            pages = await asyncio.gather(
+                *(self._fetch_page(fetcher, site, url) for url in batch), return_exceptions=True
+            )
+            for url, next_page in zip(batch, pages):
+                visited.add(url)
+                if isinstance(next_page, httpx.HTTPStatusError) and next_page.response.status_code == 404:
+                    # Templated URLs run past the last page
+                    reason = 'empty'
+                    break
+                if isinstance(next_page, Exception):
+                    logger.warning(f"Error fetching {url} for {website_name}: {next_page!r}")
+                    reason = 'error'
+                    break
+                page_tenders, page_stats = await self._parse_page(executor, next_page, cutoff, rows)
+                crawled += 1
+                _add_page_stats(stats, page_stats)
+                for t in page_tenders:
+                    collected.setdefault(t.id, t)
+                reason = await self._crawl_stop_reason(website_name, page_tenders, page_stats)
+                if reason is not None:
+                    break
+
+        tenders = list(collected.values())
+        if reason in ('seen', 'error'):
+            previous = [t for t in self.previous_tenders.get(website_name, []) if t.id not in collected]
+            tenders.extend(self._unexpired(previous, cutoff))
+        logger.info(
+            f"Crawled {crawled} page(s) of {website_name}" + (f", stopped early ({reason})" if reason else "")
+        )
+        return tenders, stats
+
+    async def _fetch_worker(self, fetcher, executor, site_queue, page_queue, results, cutoff):
+        import httpx
+        from app.fetcher import DisallowedByRobots
+
+        while True:
+            try:
+                site = site_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                tenders, page = await self.fetch_website(fetcher, site, cutoff)
+            except httpx.HTTPError as e:
+                logger.error(f"Error scraping website {site.name}: {e!r}")
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else 'error'
+                self.metrics.observe_fetch(site.name, status)
+                self.metrics.observe_error(site.name, 'fetch', repr(e))
+                await asyncio.to_thread(self.breakers.record_failure, site.name, repr(e))
+                await self._complete_site(site, None, results, error=repr(e))
+                continue
+            except DisallowedByRobots as e:
+                logger.warning(f"Skipping {site.name}: {e}")
+                self.metrics.observe_error(site.name, 'fetch', str(e))
+                await self._complete_site(site, None, results, error=str(e))
+                continue
+            except Exception as e:
+                logger.error(f"An unexpected error occurred while scraping {site.name}: {e}")
+                self.metrics.observe_error(site.name, 'fetch', repr(e))
+                await asyncio.to_thread(self.breakers.record_failure, site.name, repr(e))
+                await self._complete_site(site, None, results, error=repr(e))
+                continue
+            await asyncio.to_thread(self.breakers.record_success, site.name)
+            if page is None:
+                await self._complete_site(site, tenders, results)
+            elif site.page_limit > 1:
+                # Which later pages to fetch depends on what the earlier ones contain, so crawl right here
+                await self._parse_and_complete(executor, page, results, cutoff, fetcher)
+            else:
+                # Blocks while the parse stage is saturated, so raw pages in memory stay bounded
+                await page_queue.put(page)
+
+    async def _parse_worker(self, executor, page_queue, results, cutoff):
+        while True:
+            page = await page_queue.get()
+            if page is None:
+                return
+            await self._parse_and_complete(executor, page, results, cutoff)
+
+    async def _parse_and_complete(self, executor, page, results, cutoff, fetcher=None):
+        """Parse a fetched first page (crawling on from it when a fetcher is given) and complete the site."""
+        site = page['site']
         try:
-            response = requests.get(website_config['url'], timeout=120)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            tender_elements = soup.select(website_config['selector'])
-            if not tender_elements:
-                logger.warning(f"No tender elements found for {website_config['name']} using selector {website_config['selector']}")
-                return tenders
-            for tender_element in tender_elements:
-                try:
-                    title_element = tender_element.select_one(website_config['title_selector'])
-                    date_element = tender_element.select_one(website_config['date_selector'])
-                    link_element = tender_element.select_one(website_config['link_selector'])
-                    
-                    tags = []
-                    if 'tags_selector' in website_config and website_config['tags_selector']:
-                        tag_elements = tender_element.select(website_config['tags_selector'])
-                        for tag_elem in tag_elements:
-                            if tag_elem and tag_elem.text:
-                                raw_tag = tag_elem.text.strip()
-                                # Insert a comma before an uppercase letter only if it follows a lowercase letter
-                                cleaned_tag = re.sub(r'(?<=[a-z])(?=[A-Z])', ', ', raw_tag)
-                                tags.append(cleaned_tag)
-                    # Always add website name as a tag
-                    tags.append(website_config['name'])
-                    
-                    # Extract title from attribute if present, else fallback to text
-                    if title_element:
-                        if title_element.has_attr('title') and title_element['title'].strip():
-                            title = title_element.text.strip() + ": " + title_element['title'].strip()
-                        else:
-                            title = title_element.text.strip()
-                    else:
-                        title = "Unknown Title"
-                    if date_element:
-                        date_text = date_element.text.strip()
-                    else:
-                        # Combine all text from the tender_element if date_element is missing
-                        date_text = " ".join([t.strip() for t in tender_element.stripped_strings])
-                    date = extract_date_from_text(date_text)
-                    # Filter tenders based on keywords
-                    # Calculate match score based on keywords
-                    match_score = 0
-                    for keyword in self.keywords:
-                        keyword = keyword.strip()
-                        if keyword and keyword.lower() in title.lower():
-                            match_score += 1
-
-                    # Skip if no keyword match
-                    if match_score < 1:
-                        continue
-
-                    # Skip if tender is older than 6 months
-                    try:
-                        tender_date = None
-                        # Try to parse the date in dd/mm/yy or dd/mm/yyyy
-                        for fmt in ("%d/%m/%y", "%d/%m/%Y"):
-                            try:
-                                tender_date = datetime.strptime(date, fmt)
-                                break
-                            except Exception:
-                                continue
-                        if tender_date:
-                            three_months_ago = datetime.now() - pd.DateOffset(months=3)
-                            if tender_date < three_months_ago:
-                                continue
-                    except Exception:
-                        pass  # If date can't be parsed, don't skip
-
-                    link = ""
-                    if link_element and link_element.has_attr('href'):
-                        link_href = link_element['href']
-                        if not link_href.startswith(('http://', 'https://')):
-                            base_url = website_config.get('base_url', website_config['url'])
-                            link = urljoin(base_url, link_href)
-                        else:
-                            link = link_href
-                    
-                    tender_id = f"{website_config['name']}_{title}_{date}"
-                    tender_info = {
-                        'id': tender_id,
-                        'match_score': match_score,
-                        'tag': ', '.join([str(tag) for tag in tags]) if isinstance(tags, list) else str(tags),
-                        'website': website_config['url'],
-                        'title': title,
-                        'date': date,
-                        'link': link,
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    tenders.append(tender_info)
-                except Exception as e:
-                    logger.error(f"Error extracting tender information from element: {e}")
-            logger.info(f"Successfully scraped {len(tenders)} tenders from {website_config['name']}")
-            return tenders
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error scraping website {website_config['name']}: {e}")
-            return tenders
+            rows = await self._load_rows(site, page['fingerprint'])
+            if fetcher is None:
+                tenders, stats = await self._parse_page(executor, page, cutoff, rows)
+            else:
+                tenders, stats = await self.crawl_website(fetcher, executor, page, cutoff, rows)
+            self.metrics.observe_parse(site.name, stats)
+            if stats['page_error']:
+                # Keep the last good tenders, and leave the page uncached so the next run parses it again
+                self.metrics.observe_error(site.name, 'parse', stats['page_error'])
+                await self._complete_site(site, None, results, error=stats['page_error'])
+                return
+            await self._save_rows(site, page['fingerprint'], rows)
+            self.response_cache.store(
+                site.name, site.url, page['fingerprint'], page['headers'], page['body_hash'], len(page['body'])
+            )
         except Exception as e:
-            logger.error(f"An unexpected error occurred while scraping {website_config['name']}: {e}")
-            return tenders
+            logger.error(f"An unexpected error occurred while parsing {site.name}: {e!r}")
+            self.metrics.observe_error(site.name, 'parse', repr(e))
+            if isinstance(e, BrokenExecutor):
+                self._discard_parse_executor(executor)
+            await self._complete_site(site, None, results, error=repr(e))
+            return
+        await self._complete_site(site, tenders, results)
+
+    async def _complete_site(self, site, tenders, results, error=None, attempted=True):
+        """
+        Diff, persist and publish one site's result as soon as it is known.
+
+        tenders is None for a failed site: its last good tenders stay in the store and
+        only the failure is recorded (unless attempted is False, for a site that was
+        skipped without a request). Every registered on_site_done callback then gets
+        the site result; callbacks run on the event loop and must return quickly.
+        """
+        website_name = site.name
+        finished_at = datetime.now().isoformat()
+        changed = False
+        if tenders is None:
+            new_tenders = []
+            if attempted:
+                await asyncio.to_thread(self.store.record_failure, website_name, error, finished_at)
+        else:
+            # The store diffs against every id it has ever seen for the site, not just the last run
+            new_tenders = await asyncio.to_thread(self.store.save_site, website_name, tenders, finished_at)
+            previous = self.previous_tenders.get(website_name, [])
+            changed = bool(new_tenders) or {t.id for t in previous} != {t.id for t in tenders}
+            self.previous_tenders[website_name] = tenders
+            self.metrics.observe_success(website_name)
+
+        site_result = {
+            'website': website_name,
+            'tenders': tenders if tenders is not None else [],
+            'new_tenders': new_tenders,
+            'finished_at': finished_at,
+            'error': error,
+            'changed': changed
+        }
+        results[website_name] = site_result
+        for callback in self._site_callbacks:
+            try:
+                callback(site_result)
+            except Exception as e:
+                logger.error(f"Error in site result callback for {website_name}: {e}", exc_info=True)
+
+    def _get_parse_executor(self):
+        """
+        The parse process pool, shared by every run of this scraper; None means parsing in a thread.
+
+        One worker means a thread; more fan out over a process pool to escape the GIL. Workers
+        come from a forkserver (spawn where there is none) rather than a fork of this process,
+        whose other threads (uvicorn, the notifier, the registry watcher) may hold locks a
+        forked child would inherit locked.
+        """
+        if self.parse_config['workers'] <= 1:
+            return None
+        with self._parse_executor_lock:
+            if self._parse_executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                try:
+                    self._parse_executor = ProcessPoolExecutor(
+                        max_workers=self.parse_config['workers'], mp_context=multiprocessing.get_context(method)
+                    )
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Process pool unavailable ({e}), parsing in threads instead")
+                    self._parse_executor = False
+            return self._parse_executor or None
+
+    def _discard_parse_executor(self, executor):
+        # A worker died (killed for memory, say) and broke the pool; the next scrape starts a new one
+        with self._parse_executor_lock:
+            if executor is not None and self._parse_executor is executor:
+                self._parse_executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Stop the parse pool and send any queued notifications; for the scraper's owner on exit."""
+        with self._parse_executor_lock:
+            if self._parse_executor:
+                self._parse_executor.shutdown()
+            self._parse_executor = None
+        self.notifier.stop()
+
+    def _select_websites(self, names=None):
+        if names is None:
+            return list(self.websites)
+        names = set(names)
+        return [site for site in self.websites if site.name in names]
+
+    def scrape_all_websites(self, on_site_done=None, websites=None):
+        """
+        Scrape the configured sites and return (all_tenders, new_tenders) maps.
+
+        websites optionally limits the run to those site names.
+        Each site is diffed and written to the tender store the moment it finishes,
+        and on_site_done(site_result), if given, is called with it right away.
+        Must be called from a thread without a running event loop.
+        """
+        self.response_cache.reset_stats()
+        self._site_callbacks = [on_site_done] if on_site_done else []
+        started = time.perf_counter()
+        try:
+            all_tenders_data, new_tenders_data = asyncio.run(
+                self._scrape_all_websites_async(self._select_websites(websites))
+            )
+        finally:
+            self._site_callbacks = []
+            self.metrics.observe_run(time.perf_counter() - started)
+        self.response_cache.save()
+        stats = self.response_cache.stats
+        logger.info(
+            f"Response cache: {stats['hits']} hits ({stats['not_modified']} not modified, "
+            f"{stats['unchanged']} unchanged), {stats['misses']} misses, {stats['bytes_saved']} bytes saved"
+        )
+
+        # Only this run's new tenders are appended to the export files
+        self.exporter.export([t for tenders in new_tenders_data.values() for t in tenders])
 
-    def scrape_all_websites(self):
+        return all_tenders_data, new_tenders_data
+
+    def iter_scrape_websites(self):
+        """
+        Generator flavour of scrape_all_websites: yields each site result as it finishes.
+
+        The scrape itself runs in a worker thread; exceptions from it are re-raised here.
+        """
+        site_results = queue.Queue()
+        finished = object()
+        failure = []
+
+        def worker():
+            try:
+                self.scrape_all_websites(on_site_done=site_results.put)
+            except Exception as e:
+                failure.append(e)
+            finally:
+                site_results.put(finished)
+
+        threading.Thread(target=worker, name="tender-scrape", daemon=True).start()
+        while True:
+            site_result = site_results.get()
+            if site_result is finished:
+                break
+            yield site_result
+        if failure:
+            raise failure[0]
+
+    async def _scrape_all_websites_async(self, websites):
         all_tenders_data = {}
         new_tenders_data = {}
 
-        # Use ThreadPoolExecutor for multithreading
-        with ThreadPoolExecutor(max_workers=5) as executor:  # Adjust max_workers based on your system's capabilities
-            future_to_website = {executor.submit(self.scrape_website, website_config): website_config for website_config in self.websites}
+        # Two-stage pipeline: fetch workers share one pooled client (bounded globally and per host by
+        # the fetcher) and hand raw pages over a bounded queue to parse workers backed by the process pool
+        results = {}
+        # Tenders dated before this are dropped; computed once so every site in the run uses the same cutoff
+        cutoff = months_ago(datetime.now(), MAX_TENDER_AGE_MONTHS)
+        site_queue = asyncio.Queue()
+        skipped = []
+        now = datetime.now()
+        for site in websites:
+            if self.breakers.state(site.name, now) == OPEN:
+                skipped.append(site)
+            else:
+                site_queue.put_nowait(site)
+        for site in skipped:
+            until = self.breakers.open_until(site.name)
+            logger.info(f"Skipping {site.name}: circuit breaker open until {until}")
+            self.metrics.observe_skip(site.name)
+            await self._complete_site(
+                site, None, results, error=f"Circuit breaker open until {until}", attempted=False
+            )
+        from app.fetcher import AsyncFetcher
+
+        page_queue = asyncio.Queue(maxsize=self.parse_config['queue_size'])
+        executor = self._get_parse_executor()
+        async with AsyncFetcher(**self.fetch_config) as fetcher:
+            parse_workers = [
+                asyncio.create_task(self._parse_worker(executor, page_queue, results, cutoff))
+                for _ in range(self.parse_config['workers'])
+            ]
+            fetch_workers = [
+                asyncio.create_task(self._fetch_worker(fetcher, executor, site_queue, page_queue, results, cutoff))
+                for _ in range(min(fetcher.max_concurrency, site_queue.qsize()))
+            ]
+            await asyncio.gather(*fetch_workers)
+            for _ in parse_workers:
+                await page_queue.put(None)
+            await asyncio.gather(*parse_workers)
 
-            for future in as_completed(future_to_website):
-                website_config = future_to_website[future]
-                website_name = website_config['name']
-                try:
-                    tenders = future.result()
-                    all_tenders_data[website_name] = tenders
-
-                    # Check for new tenders
-                    if website_name in self.previous_tenders:
-                        prev_ids = {t['id'] for t in self.previous_tenders.get(website_name, [])}
-                        new_tenders_data[website_name] = [t for t in tenders if t['id'] not in prev_ids]
-                    else:
-                        new_tenders_data[website_name] = tenders
-                except Exception as e:
-                    logger.error(f"Error scraping website {website_name}: {e}")
-
-        self.save_to_csv(all_tenders_data)
-        self.save_current_tenders(all_tenders_data)  # Save all current tenders as new "previous"
-        self.previous_tenders = all_tenders_data  # Update in-memory previous_tenders
+        for site in websites:
+            site_result = results.get(site.name)
+            if site_result is not None:
+                all_tenders_data[site_result['website']] = site_result['tenders']
+                new_tenders_data[site_result['website']] = site_result['new_tenders']
 
         return all_tenders_data, new_tenders_data
 
-    def save_to_csv(self, all_tenders_map):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        all_data_list = []
-        for website_name, tenders_list in all_tenders_map.items():
-            for tender in tenders_list:
-                all_data_list.append(tender)
-        
-        if all_data_list:
-            df = pd.DataFrame(all_data_list)
-            csv_file = os.path.join(self.output_dir, f"tenders_{timestamp}.csv")
-            df.to_csv(csv_file, index=False)
-            logger.info(f"Tender data saved to {csv_file}")
-
-            # Limit the number of Excel files to 2
-            existing_files = sorted(
-                [f for f in os.listdir(self.output_dir) if f.startswith("tenders_") and f.endswith(".csv")],
-                key=lambda x: os.path.getctime(os.path.join(self.output_dir, x))
-            )
-            while len(existing_files) > 2:
-                oldest_file = existing_files.pop(0)
-                oldest_file_path = os.path.join(self.output_dir, oldest_file)
-                os.remove(oldest_file_path)
-                logger.info(f"Deleted old tender file: {oldest_file_path}")
+    def _read_email_config(self):
+        return {
+            'enabled': self.config.getboolean('Email', 'enabled', fallback=False),
+            'smtp_server': self.config.get('Email', 'smtp_server', fallback='smtp.gmail.com'),
+            'smtp_port': self.config.getint('Email', 'smtp_port', fallback=587),
+            'starttls': self.config.getboolean('Email', 'starttls', fallback=True),
+            'sender_email': self.config.get('Email', 'sender_email', fallback=''),
+            'password': self.config.get('Email', 'password', fallback=''),
+            'recipient_email': self.config.get('Email', 'recipient_email', fallback='')
+        }
 
     def send_email_notification(self, new_tenders_map):
+        """Queue new tenders for the background notifier; sending never holds up the run."""
         if not self.email_config['enabled']:
             logger.info("Email notifications are disabled.")
             return
@@ -309,41 +677,16 @@ class TenderScraper:
         if not has_new_tenders:
             logger.info("No new tenders to send notification for.")
             return
-        
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['sender_email']
-            msg['To'] = self.email_config['recipient_email']
-            msg['Subject'] = f"New Tenders Notification - {datetime.now().strftime('%Y-%m-%d')}"
-            
-            email_body = "<html><body><h2>New Tenders Notification</h2>"
-            for website, tenders_list in new_tenders_map.items():
-                if tenders_list:
-                    email_body += f"<h3>{website}</h3><ul>"
-                    for tender in tenders_list:
-                        email_body += f"<li><strong>{tender['title']}</strong> - {tender['date']}"
-                        if tender['link']:
-                            email_body += f" - <a href='{tender['link']}'>Download/View</a>"
-                        email_body += "</li>"
-                    email_body += "</ul>"
-            email_body += "</body></html>"
-            msg.attach(MIMEText(email_body, 'html'))
-            
-            with smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.email_config['sender_email'], self.email_config['password'])
-                server.send_message(msg)
-            logger.info(f"Email notification sent to {self.email_config['recipient_email']}")
-        except Exception as e:
-            logger.error(f"Error sending email notification: {e}")
+        self.notifier.notify(new_tenders_map)
 
-    def run(self):
-        logger.info("Starting tender scraper run...")
-        all_tenders, new_tenders = self.scrape_all_websites()
-        if self.email_config['enabled'] and any(new_tenders.values()):
-            self.send_email_notification(new_tenders)
-        logger.info("Tender scraper run finished.")
-        return all_tenders, new_tenders
+    def run(self, on_site_done=None, websites=None):
+        with self._run_lock:
+            logger.info("Starting tender scraper run...")
+            all_tenders, new_tenders = self.scrape_all_websites(on_site_done=on_site_done, websites=websites)
+            if self.email_config['enabled'] and any(new_tenders.values()):
+                self.send_email_notification(new_tenders)
+            logger.info("Tender scraper run finished.")
+            return all_tenders, new_tenders
 
     def update_general_config(self, output_dir=None):
         if output_dir:
@@ -351,6 +694,8 @@ class TenderScraper:
             self.output_dir = output_dir
             if not os.path.exists(self.output_dir):
                 os.makedirs(self.output_dir)
+            self.exporter = TenderExporter.from_config(self.config, self.output_dir)
+            self.config_version += 1
         # Add other general settings if needed
 
     def update_email_config(self, email_data):
@@ -367,50 +712,11 @@ class TenderScraper:
             self.config['Email']['recipient_email'] = email_data['recipient_email']
         
         # Update in-memory email_config
-        self.email_config = {
-            'enabled': self.config.getboolean('Email', 'enabled'),
-            'smtp_server': self.config.get('Email', 'smtp_server'),
-            'smtp_port': self.config.getint('Email', 'smtp_port'),
-            'sender_email': self.config.get('Email', 'sender_email'),
-            'password': self.config.get('Email', 'password'),
-            'recipient_email': self.config.get('Email', 'recipient_email')
-        }
+        self.email_config = self._read_email_config()
+        self.notifier.email_config = self.email_config
+        self.config_version += 1
 
     def save_ini_config(self):
         with open(self.config_path, 'w') as configfile: # Use self.config_path
             self.config.write(configfile)
         logger.info(f"INI configuration saved to {self.config_path}")
-
-def extract_date_from_text(text):
-    """
-    Extracts a date from the given text and returns it in the format 'dd/mm/yy'.
-    Supports multiple date formats like DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD, and '26 May 2025'.
-    
-    Args:
-        text (str): The input text containing a potential date.
-    
-    Returns:
-        str: The extracted and formatted date, or 'Unknown Date' if no valid date is found.
-    """
-    if not text:
-        return "Unknown Date"
-
-    # Try to extract date using regex
-    match = re.search(
-        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}|\d{1,2}\s+[A-Za-z]{3,9}\s+\d{2,4})',
-        text
-    )
-    if match:
-        raw_date = match.group(1)
-        # Replace '-' with '/' for uniformity
-        raw_date = raw_date.replace('-', '/')
-        # Try parsing various formats
-        for fmt in ("%d/%m/%Y", "%d/%m/%y", "%Y/%m/%d", "%Y/%d/%m", "%d %B %Y", "%d %b %Y", "%d %B %y", "%d %b %y"):
-            try:
-                dt = datetime.strptime(raw_date, fmt)
-                return dt.strftime("%d/%m/%y")
-            except ValueError:
-                continue
-        # Fallback to raw date if no format matched
-        return raw_date
-    return "Unknown Date"
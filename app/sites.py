@@ -0,0 +1,315 @@
+# filepath: app/sites.py
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Optional
+
+logger = logging.getLogger("TenderScraper")
+
+REQUIRED_FIELDS = ('name', 'url', 'selector', 'title_selector', 'date_selector', 'link_selector')
+SELECTOR_FIELDS = ('selector', 'title_selector', 'date_selector', 'link_selector', 'tags_selector', 'next_page_selector')
+# Page limit for paginated sites that don't set max_pages
+DEFAULT_MAX_PAGES = 5
+
+DEFAULT_WEBSITES = [
+    {
+        "is_group": False,
+        "name": "DAV CSP",
+        "url": "https://davcsp.org/NoticeBoardDetail.aspx",
+        "selector": ".panel-body > div > ul > li",
+        "title_selector": ".panel-body > div > ul > li > div > p",
+        "date_selector": ".Mi-Notice-Board-Date",
+        "link_selector": ".Mi-Notice-Board-Date > span > a",
+        "base_url": "https://davcsp.org/"
+    }
+]
+
+
+@dataclass(frozen=True, slots=True)
+class SiteSpec:
+    """
+    One validated website entry, with its group's shared_config merged in.
+
+    Immutable and hashable, so it is shipped to parse worker processes as is
+    and parsers can cache their compiled selectors per spec.
+    """
+    name: str
+    url: str
+    selector: str
+    title_selector: str
+    date_selector: str
+    link_selector: str
+    base_url: Optional[str] = None
+    tags_selector: Optional[str] = None
+    parser: Optional[str] = None
+    date_format: Optional[str] = None
+    next_page_selector: Optional[str] = None
+    page_url_template: Optional[str] = None
+    page_start: Optional[int] = None
+    max_pages: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, entry):
+        """Build a spec from a (merged) config entry; raises ValueError naming the site and the problem."""
+        import soupsieve
+
+        name = entry.get('name') or '<unnamed>'
+        missing = [key for key in REQUIRED_FIELDS if not entry.get(key)]
+        if missing:
+            raise ValueError(f"Website {name!r} is missing {', '.join(missing)}")
+        known = {field.name for field in fields(cls)}
+        values = {key: value for key, value in entry.items() if key in known and value is not None}
+        try:
+            for key in ('page_start', 'max_pages'):
+                if key in values:
+                    values[key] = int(values[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"Website {name!r} has a non-integer {key}: {values[key]!r}")
+        if '{page}' not in values.get('page_url_template', '{page}'):
+            raise ValueError(f"Website {name!r} has a page_url_template without a {{page}} placeholder")
+        for key in SELECTOR_FIELDS:
+            if values.get(key):
+                try:
+                    soupsieve.compile(values[key])
+                except Exception as e:
+                    message = str(e).splitlines()[0] if str(e) else repr(e)
+                    raise ValueError(f"Website {name!r} has an invalid {key} {values[key]!r}: {message}")
+        return cls(**values)
+
+    @property
+    def link_base(self):
+        """Base for resolving relative tender links."""
+        return self.base_url or self.url
+
+    @property
+    def first_page(self):
+        """Page number of `url` in page_url_template numbering."""
+        return 1 if self.page_start is None else self.page_start
+
+    @property
+    def page_limit(self):
+        # Only sites with a next page selector or URL template are crawled past their first page
+        if not (self.next_page_selector or self.page_url_template):
+            return 1
+        return max(1, self.max_pages or DEFAULT_MAX_PAGES)
+
+    def to_dict(self):
+        """The entry as written in websites_config.json, without the keys that are not set."""
+        return {field.name: getattr(self, field.name) for field in fields(self)
+                if getattr(self, field.name) is not None}
+
+
+def _flatten(entries):
+    """Yield (merged entry, (entry index, index within the group or None)) for every site in the file."""
+    for i, entry in enumerate(entries):
+        if entry.get("is_group", False):
+            shared_config = entry.get("shared_config", {})
+            for j, website in enumerate(entry.get("websites", [])):
+                # Merge shared config with individual website config
+                yield {**shared_config, **website}, (i, j)
+        else:
+            yield entry, (i, None)
+
+
+class SiteRegistry:
+    """
+    The websites config as SiteSpecs, kept in sync with websites_config.json.
+
+    The file is first read (and its selectors validated) on first use, not at
+    construction. After that specs() stats it at most every check_interval
+    seconds; when it changed on disk only the entries that differ are swapped in,
+    and unchanged sites keep their SiteSpec objects. An invalid entry is logged
+    and skipped, keeping the last good version of that site. upsert(), remove()
+    and replace_all() edit just the affected entries, so group entries and their
+    shared_config survive edits made through the API, and the file is only
+    written when something changed.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._entries = []
+        self._specs = {}
+        self._stamp = None
+        self._checked_at = 0.0
+        # Bumped whenever the set of specs changes, for caches of anything derived from them
+        self.version = 0
+        self._loaded = False
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """Re-read the file now; returns the {'added', 'changed', 'removed'} site names."""
+        with self._lock:
+            self._loaded = True
+            self._checked_at = time.monotonic()
+            stamp = self._stat()
+            if stamp is None:
+                logger.warning(f"Websites config file not found: {self.path}. Creating default.")
+                changes = self._apply(copy.deepcopy(DEFAULT_WEBSITES))
+                self._write()
+                return changes
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                # Keep serving the last good config; the next edit of the file is picked up again
+                logger.error(f"Error decoding websites config file: {self.path}: {e}")
+                self._stamp = stamp
+                return {'added': [], 'changed': [], 'removed': []}
+            self._stamp = stamp
+            return self._apply(entries)
+
+    def refresh(self):
+        """Reload if the file changed on disk, checking at most every check_interval seconds."""
+        if self._loaded and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not self._loaded:
+                self.reload()
+                return
+            self._checked_at = time.monotonic()
+            if self._stat() != self._stamp:
+                self.reload()
+
+    def _apply(self, entries):
+        specs = {}
+        for entry, _ in _flatten(entries):
+            previous = self._specs.get(entry.get('name'))
+            try:
+                spec = SiteSpec.from_dict(entry)
+            except ValueError as e:
+                logger.error(f"Skipping website config entry: {e}")
+                if previous is not None:
+                    specs[previous.name] = previous
+                continue
+            if spec.name in specs:
+                logger.error(f"Skipping duplicate website config entry {spec.name!r}")
+                continue
+            specs[spec.name] = previous if previous == spec else spec
+        changes = {
+            'added': [name for name in specs if name not in self._specs],
+            'changed': [name for name, spec in specs.items()
+                        if name in self._specs and self._specs[name] is not spec],
+            'removed': [name for name in self._specs if name not in specs]
+        }
+        if self._specs and any(changes.values()):
+            logger.info(
+                f"Websites config reloaded: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+                f"{len(changes['removed'])} removed"
+            )
+        self._entries = entries
+        self._specs = specs
+        if any(changes.values()):
+            self.version += 1
+        return changes
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f, indent=4)
+        os.replace(tmp_path, self.path)
+        # Our own write is not a change to reload
+        self._stamp = self._stat()
+        logger.info(f"Website configurations saved to {self.path}")
+
+    def specs(self):
+        self.refresh()
+        with self._lock:
+            return list(self._specs.values())
+
+    def get(self, name):
+        self.refresh()
+        with self._lock:
+            return self._specs.get(name)
+
+    @staticmethod
+    def _locate(entries, name):
+        for entry, location in _flatten(entries):
+            if entry.get('name') == name:
+                return location
+        return None
+
+    def _set_entry(self, entries, site):
+        """Put one site dict (no None values) into entries, in place of its current entry if it has one."""
+        location = self._locate(entries, site['name'])
+        if location is None:
+            entries.append({"is_group": False, **site})
+            return
+        i, j = location
+        if j is None:
+            entries[i] = {"is_group": False, **site} if "is_group" in entries[i] else dict(site)
+            return
+        # Inside a group only what differs from shared_config is stored; None masks a shared key
+        shared_config = entries[i].get("shared_config", {})
+        website = {key: value for key, value in site.items() if shared_config.get(key) != value}
+        website.update({key: None for key in shared_config if key not in site})
+        entries[i]["websites"][j] = {'name': site['name'], **website}
+
+    def _delete_entry(self, entries, name):
+        i, j = self._locate(entries, name)
+        if j is None:
+            del entries[i]
+        else:
+            del entries[i]["websites"][j]
+
+    def _commit(self, entries):
+        changes = self._apply(entries)
+        if any(changes.values()):
+            self._write()
+        return changes
+
+    def upsert(self, site):
+        """Add or replace one site from a config dict; raises ValueError if it does not validate."""
+        site = {key: value for key, value in site.items() if value is not None}
+        SiteSpec.from_dict(site)
+        with self._lock:
+            self.refresh()
+            entries = copy.deepcopy(self._entries)
+            self._set_entry(entries, site)
+            return self._commit(entries)
+
+    def remove(self, name):
+        """Drop one site; returns False if there is no such site."""
+        with self._lock:
+            self.refresh()
+            if self._locate(self._entries, name) is None:
+                return False
+            entries = copy.deepcopy(self._entries)
+            self._delete_entry(entries, name)
+            self._commit(entries)
+            return True
+
+    def replace_all(self, sites):
+        """
+        Make the config hold exactly these sites, touching only entries that differ.
+
+        Sites keep their place (and group) in the file, new ones are appended.
+        Raises ValueError, without changing anything, if any site does not validate.
+        """
+        sites = [{key: value for key, value in site.items() if value is not None} for site in sites]
+        specs = [SiteSpec.from_dict(site) for site in sites]
+        names = {spec.name for spec in specs}
+        if len(names) != len(specs):
+            raise ValueError("Website names must be unique")
+        with self._lock:
+            self.refresh()
+            entries = copy.deepcopy(self._entries)
+            for name in self._specs:
+                if name not in names:
+                    self._delete_entry(entries, name)
+            for site, spec in zip(sites, specs):
+                if self._specs.get(spec.name) != spec:
+                    self._set_entry(entries, site)
+            return self._commit(entries)
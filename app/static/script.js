@@ -1,6 +1,11 @@
 // This file contains JavaScript code for the front-end functionality of the application. 
 // It handles user interactions, AJAX requests, and dynamic updates to the web page.
 
+// Filtering, sorting and paging of tenders happen server-side; this is the current page request
+const tenderQuery = { tier: 'high', sort: 'date', order: 'desc', limit: 50, offset: 0 };
+let maxScore = 0;
+let searchDebounce = null;
+
 document.addEventListener('DOMContentLoaded', function () {
     setupTabs();
     fetchTenders();
@@ -10,7 +15,10 @@ document.addEventListener('DOMContentLoaded', function () {
     // Setup event listeners
     document.getElementById('refresh-btn').addEventListener('click', refreshData);
     document.getElementById('website-filter').addEventListener('change', filterTenders);
-    document.getElementById('search-box').addEventListener('input', filterTenders);
+    document.getElementById('search-box').addEventListener('input', function () {
+        clearTimeout(searchDebounce);
+        searchDebounce = setTimeout(filterTenders, 300);
+    });
     document.getElementById('dashboard-link').addEventListener('click', function (e) {
         e.preventDefault();
         showSection('dashboard');
@@ -55,12 +63,13 @@ function switchTab(tab) {
     if (tab === 'high') {
         highTab.classList.add('active');
         lowTab.classList.remove('active');
-        displayTenders(tenderData, 'high');
     } else {
         lowTab.classList.add('active');
         highTab.classList.remove('active');
-        displayTenders(tenderData, 'low');
     }
+    tenderQuery.tier = tab;
+    tenderQuery.offset = 0;
+    fetchTenders();
 }
 
 function showSection(section) {
@@ -75,11 +84,20 @@ function showSection(section) {
 }
 
 function fetchTenders() {
-    fetch('/api/tenders')
+    const params = new URLSearchParams();
+    Object.entries(tenderQuery).forEach(([key, value]) => params.set(key, value));
+
+    const website = document.getElementById('website-filter').value;
+    const searchText = document.getElementById('search-box').value.trim();
+    if (website) params.set('website', website);
+    if (searchText) params.set('q', searchText);
+
+    fetch(`/api/tenders?${params}`)
         .then(response => response.json())
-        .then(data => {
-            tenderData = data;
-            displayTenders(data, 'high'); // Default to high match scores
+        .then(page => {
+            maxScore = page.max_score || 0;
+            displayTenders(page.items, page.offset);
+            displayPagination(page);
         })
         .catch(err => console.error('Error fetching tenders:', err));
 }
@@ -115,26 +133,75 @@ function refreshData() {
     refreshBtn.disabled = true;
     refreshIcon.classList.remove('d-none');
     
+    // The server runs the scrape as a background job; follow its progress over Server-Sent Events
     fetch('/api/refresh', {
         method: 'POST'
     })
     .then(response => response.json())
     .then(data => {
-        if (data.status === 'success') {
-            alert(data.message);
-            fetchTenders();
-        } else {
-            alert('Error: ' + data.message);
+        if (!data.job_id) {
+            throw new Error(data.message || 'Refresh could not be started');
         }
+        followRefreshJob(data.job_id);
     })
     .catch(err => {
         console.error('Error refreshing data:', err);
         alert('Error refreshing data. Check console for details.');
-    })
-    .finally(() => {
-        refreshBtn.disabled = false;
-        refreshIcon.classList.add('d-none');
+        finishRefresh();
+    });
+}
+
+function followRefreshJob(jobId) {
+    const refreshBtn = document.getElementById('refresh-btn');
+    const source = new EventSource(`/api/refresh/${jobId}/events`);
+
+    source.addEventListener('site', (e) => {
+        const progress = JSON.parse(e.data);
+        refreshBtn.lastChild.textContent = ` Refreshing (${progress.completed_sites}/${progress.total_sites})`;
+        // Sites are saved as they finish, so the table can show fresh data straight away
+        if (progress.new_tenders > 0) fetchTenders();
     });
+    source.addEventListener('done', (e) => {
+        const job = JSON.parse(e.data);
+        source.close();
+        finishRefresh();
+        if (job.status === 'success') {
+            alert(job.message);
+            fetchTenders();
+        } else {
+            alert('Error: ' + job.message);
+        }
+    });
+    source.onerror = () => {
+        // Fall back to polling if the event stream drops
+        source.close();
+        pollRefreshJob(jobId);
+    };
+}
+
+function pollRefreshJob(jobId) {
+    fetch(`/api/refresh/${jobId}`)
+        .then(response => response.json())
+        .then(job => {
+            if (job.status === 'running') {
+                setTimeout(() => pollRefreshJob(jobId), 2000);
+                return;
+            }
+            finishRefresh();
+            alert(job.status === 'success' ? job.message : 'Error: ' + job.message);
+            fetchTenders();
+        })
+        .catch(err => {
+            console.error('Error checking refresh status:', err);
+            finishRefresh();
+        });
+}
+
+function finishRefresh() {
+    const refreshBtn = document.getElementById('refresh-btn');
+    refreshBtn.disabled = false;
+    refreshBtn.lastChild.textContent = ' Refresh Data';
+    document.getElementById('refresh-icon').classList.add('d-none');
 }
 
 function populateWebsiteFilter(websites) {
@@ -152,7 +219,7 @@ function populateWebsiteFilter(websites) {
     });
 }
 
-function displayTenders(tenders, filterType) {
+function displayTenders(tenders, offset = 0) {
     const container = document.getElementById('tenders-container');
     container.innerHTML = '';
 
@@ -161,37 +228,41 @@ function displayTenders(tenders, filterType) {
         return;
     }
 
-    // Default sorting: by date (descending) and then by score (descending)
-    const filteredTenders = filterTendersByScore(tenders, filterType).sort((a, b) => {
-        const dateA = parseDMY(a.date);
-        const dateB = parseDMY(b.date);
-        if (dateB && dateA) {
-            if (dateB - dateA !== 0) return dateB - dateA; // Sort by date descending
-        }
-        return (b.match_score || 0) - (a.match_score || 0); // Sort by score descending
-    });
-
-    const table = createTendersTable(filteredTenders);
+    // Rows arrive already filtered and sorted by the server
+    const table = createTendersTable(tenders, offset);
     container.appendChild(table);
 }
 
-function filterTendersByScore(tenders, filterType) {
-    const maxScore = Math.max(...tenders.map(t => t.match_score || 0));
-    return tenders.filter(tender => {
-        if (filterType === 'high') {
-            return tender.match_score >= maxScore * 0.5; // High scores (>= 50% of max)
-        } else {
-            return tender.match_score < maxScore * 0.5; // Low scores (< 50% of max)
-        }
+function displayPagination(page) {
+    const container = document.getElementById('pagination-container');
+    container.innerHTML = '';
+    if (page.total === 0) return;
+
+    const first = page.offset + 1;
+    const last = page.offset + page.items.length;
+    container.innerHTML = `
+        <span class="text-muted">Showing ${first}-${last} of ${page.total}</span>
+        <div>
+            <button class="btn btn-sm btn-outline-primary me-2" id="prev-page-btn" ${page.offset === 0 ? 'disabled' : ''}>Previous</button>
+            <button class="btn btn-sm btn-outline-primary" id="next-page-btn" ${last >= page.total ? 'disabled' : ''}>Next</button>
+        </div>
+    `;
+    document.getElementById('prev-page-btn').addEventListener('click', () => {
+        tenderQuery.offset = Math.max(0, tenderQuery.offset - tenderQuery.limit);
+        fetchTenders();
+    });
+    document.getElementById('next-page-btn').addEventListener('click', () => {
+        tenderQuery.offset += tenderQuery.limit;
+        fetchTenders();
     });
 }
 
-function createTendersTable(tenders) {
+function createTendersTable(tenders, offset = 0) {
     const table = document.createElement('table');
     table.className = 'table table-striped table-bordered';
 
     const thead = createTableHeader();
-    const tbody = createTableBody(tenders);
+    const tbody = createTableBody(tenders, offset);
 
     table.appendChild(thead);
     table.appendChild(tbody);
@@ -224,14 +295,14 @@ function createTableHeader() {
     return thead;
 }
 
-function createTableBody(tenders) {
+function createTableBody(tenders, offset = 0) {
     const tbody = document.createElement('tbody');
     const currentDate = new Date();
 
     tenders.forEach((tender, idx) => {
         const row = document.createElement('tr');
 
-        row.appendChild(createCell(idx + 1)); // Sl. No.
+        row.appendChild(createCell(offset + idx + 1)); // Sl. No.
         row.appendChild(createTitleCell(tender.title, tender.scraped_at)); // Title with "New" tag
         row.appendChild(createScoreCell(tender.match_score)); // Score
         row.appendChild(createDateCell(tender.date, currentDate)); // Date
@@ -284,7 +355,6 @@ function createScoreCell(score) {
 
 function getScoreClass(score) {
     if (typeof score !== 'number') return 'bg-secondary text-white';
-    const maxScore = Math.max(...tenderData.map(t => t.match_score || 0));
     if (score === maxScore && maxScore > 0) return 'bg-success text-white fw-bold';
     if (score >= maxScore * 0.75) return 'bg-primary text-white';
     if (score >= maxScore * 0.5) return 'bg-warning text-dark';
@@ -330,25 +400,8 @@ function createLinkCell(link) {
 }
 
 function filterTenders() {
-    const websiteFilter = document.getElementById('website-filter').value;
-    const searchText = document.getElementById('search-box').value.toLowerCase();
-    
-    let filteredTenders = [...tenderData];
-    
-    if (websiteFilter) {
-        filteredTenders = filteredTenders.filter(tender => 
-            tender.tag && tender.tag.toLowerCase().includes(websiteFilter.toLowerCase())
-        );
-    }
-    
-    if (searchText) {
-        filteredTenders = filteredTenders.filter(tender => 
-            tender.title.toLowerCase().includes(searchText) || 
-            tender.date.toLowerCase().includes(searchText)
-        );
-    }
-    
-    displayTenders(filteredTenders);
+    tenderQuery.offset = 0;
+    fetchTenders();
 }
 
 function displayWebsitesSettings(websites) {
@@ -495,15 +548,17 @@ function saveSettings() {
 }
 
 function displayInvalidTenders() {
+  // Tenders with invalid dates and match_score < 2
+  fetch('/api/tenders?undated=true&score_below=2&limit=500')
+    .then((response) => response.json())
+    .then((page) => renderInvalidTenders(page.items))
+    .catch((err) => console.error('Error fetching invalid tenders:', err));
+}
+
+function renderInvalidTenders(invalidTenders) {
   const container = document.getElementById('invalid-tenders-container');
   container.innerHTML = '';
 
-  // Filter tenders with invalid dates and match_score < 2
-  const invalidTenders = tenderData.filter((tender) => {
-    const tenderDate = parseDMY(tender.date);
-    return (!tenderDate || isNaN(tenderDate.getTime())) && tender.match_score < 2;
-  });
-
   if (invalidTenders.length === 0) {
     container.innerHTML = '<div class="col-12"><div class="alert alert-info">No invalid tenders found</div></div>';
     return;
@@ -582,33 +637,19 @@ function parseDMY(dateStr) {
 }
 
 function sortTendersByColumn(sortKey) {
-    const container = document.getElementById('tenders-container');
-    const rows = Array.from(container.querySelectorAll('tbody tr'));
-    const currentDate = new Date();
-
-    rows.sort((rowA, rowB) => {
-        const cellA = rowA.querySelector(`td:nth-child(${getColumnIndex(sortKey)})`).textContent.trim();
-        const cellB = rowB.querySelector(`td:nth-child(${getColumnIndex(sortKey)})`).textContent.trim();
+    const sortFields = { title: 'title', score: 'score', date: 'date', source: 'website' };
+    const field = sortFields[sortKey];
+    if (!field) return;
 
-        if (sortKey === 'date') {
-            const dateA = parseDMY(cellA);
-            const dateB = parseDMY(cellB);
-            return (dateB || currentDate) - (dateA || currentDate); // Sort by date descending
-        } else if (sortKey === 'score') {
-            return parseFloat(cellB) - parseFloat(cellA); // Sort by score descending
-        } else {
-            return cellA.localeCompare(cellB); // Sort alphabetically for other columns
-        }
-    });
-
-    const tbody = container.querySelector('tbody');
-    tbody.innerHTML = '';
-    rows.forEach((row) => tbody.appendChild(row));
-}
-
-function getColumnIndex(sortKey) {
-    const columns = ['index', 'title', 'score', 'date', 'source'];
-    return columns.indexOf(sortKey) + 1; // Column index starts from 1
+    // Clicking the active column again flips the direction
+    if (tenderQuery.sort === field) {
+        tenderQuery.order = tenderQuery.order === 'desc' ? 'asc' : 'desc';
+    } else {
+        tenderQuery.sort = field;
+        tenderQuery.order = field === 'title' || field === 'website' ? 'asc' : 'desc';
+    }
+    tenderQuery.offset = 0;
+    fetchTenders();
 }
 
 function isNewTender(scrapedAt) {
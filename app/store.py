@@ -0,0 +1,603 @@
+# filepath: app/store.py
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from app.dates import parse_short_date
+from app.records import TenderRecord, site_ref, tender_id
+
+logger = logging.getLogger("TenderScraper")
+
+TENDER_FIELDS = ('id', 'match_score', 'tag', 'website', 'title', 'date', 'link', 'scraped_at')
+TENDER_COLUMNS = ('id', 'website_name', 'website', 'title', 'date', 'link', 'tag', 'match_score', 'scraped_at',
+                  'date_iso', 'first_seen', 'last_seen', 'current')
+# Version 2 ids are short content hashes (app.records.tender_id) instead of "site_title_date"
+TENDER_ID_VERSION = '2'
+TENDER_ID_VERSION_KEY = 'tender_id_version'
+# Query results also say when each tender was first seen
+QUERY_FIELDS = TENDER_FIELDS + ('first_seen',)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS websites (
+    name TEXT PRIMARY KEY,
+    last_scraped_at TEXT,
+    last_attempt_at TEXT,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS site_schedule (
+    name TEXT PRIMARY KEY,
+    interval_hours REAL NOT NULL,
+    next_due_at TEXT NOT NULL,
+    last_checked_at TEXT,
+    last_changed_at TEXT,
+    checks INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS site_breaker (
+    name TEXT PRIMARY KEY,
+    failures INTEGER NOT NULL DEFAULT 0,
+    trips INTEGER NOT NULL DEFAULT 0,
+    open_until TEXT,
+    last_failure_at TEXT,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS site_rows (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    rows TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tenders (
+    id TEXT PRIMARY KEY,
+    website_name TEXT NOT NULL,
+    website TEXT,
+    title TEXT,
+    date TEXT,
+    link TEXT,
+    tag TEXT,
+    match_score NUMERIC,
+    scraped_at TEXT,
+    date_iso TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    current INTEGER NOT NULL DEFAULT 1
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tenders_site_current ON tenders (website_name, current);
+CREATE INDEX IF NOT EXISTS idx_tenders_current_date ON tenders (current, date_iso);
+CREATE INDEX IF NOT EXISTS idx_tenders_current_score ON tenders (current, match_score);
+CREATE INDEX IF NOT EXISTS idx_tenders_first_seen ON tenders (first_seen);
+"""
+
+# Full-text index over titles and tags (tags always include the site name). It is an external-content
+# table keyed on the tenders rowid and kept in sync by triggers; titles only reindex when they change.
+# Tenders are upserted in place, never REPLACEd, and the database is never VACUUMed, so rowids stay put.
+FTS_VERSION = '1'
+FTS_VERSION_KEY = 'fts_version'
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tenders_fts USING fts5(
+    title, tag, content='tenders', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tenders_fts_insert AFTER INSERT ON tenders BEGIN
+    INSERT INTO tenders_fts (rowid, title, tag) VALUES (new.rowid, new.title, new.tag);
+END;
+CREATE TRIGGER IF NOT EXISTS tenders_fts_delete AFTER DELETE ON tenders BEGIN
+    INSERT INTO tenders_fts (tenders_fts, rowid, title, tag) VALUES ('delete', old.rowid, old.title, old.tag);
+END;
+CREATE TRIGGER IF NOT EXISTS tenders_fts_update AFTER UPDATE OF title, tag ON tenders
+WHEN old.title IS NOT new.title OR old.tag IS NOT new.tag BEGIN
+    INSERT INTO tenders_fts (tenders_fts, rowid, title, tag) VALUES ('delete', old.rowid, old.title, old.tag);
+    INSERT INTO tenders_fts (rowid, title, tag) VALUES (new.rowid, new.title, new.tag);
+END;
+"""
+# bm25 column weights: a hit in the title counts more than one in the tags
+FTS_WEIGHTS = (10.0, 3.0)
+
+# Columns /api/tenders may sort on, mapped to their SQL expressions
+SORT_COLUMNS = {
+    'date': 'date_iso',
+    'score': 'match_score',
+    'title': 'title COLLATE NOCASE',
+    'website': 'website_name COLLATE NOCASE',
+    'scraped_at': 'scraped_at'
+}
+
+
+def iso_date(date_str):
+    """Convert a scraped 'dd/mm/yy' (or dd/mm/yyyy) date to a sortable 'YYYY-MM-DD', or None."""
+    moment = parse_short_date(date_str)
+    return moment.strftime("%Y-%m-%d") if moment else None
+
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query where every word must match as a word prefix; '' if no words."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text or ''))
+
+
+class TenderStore:
+    """
+    SQLite-backed tender history.
+
+    Every tender ever scraped is kept with first_seen/last_seen timestamps. Rows
+    from a site's most recent scrape are flagged `current`; together they are
+    what previous_tenders.json used to hold. Each site is written in its own
+    transaction (WAL journal), so a crash mid-run never leaves a half-written file.
+
+    The table doubles as the seen-id index: a tender is new only the first time
+    its id is stored, so one that drops off a page and comes back is not reported
+    again. Per-site id sets are loaded from disk on first use and kept in memory.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._seen_ids = {}
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+            self._conn.executescript(INDEXES)
+            self.fts_enabled = self._setup_fts()
+
+    def _setup_fts(self):
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite full-text search (FTS5) unavailable, searching with LIKE instead: {e}")
+            return False
+        version = self._conn.execute("SELECT value FROM meta WHERE key = ?", (FTS_VERSION_KEY,)).fetchone()
+        if version is None or version['value'] != FTS_VERSION:
+            self._conn.execute("INSERT INTO tenders_fts (tenders_fts) VALUES ('rebuild')")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (FTS_VERSION_KEY, FTS_VERSION)
+            )
+            logger.info("Built the tender search index")
+        return True
+
+    def _migrate(self):
+        website_columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(websites)")}
+        for column in ('last_attempt_at', 'last_error'):
+            if column not in website_columns:
+                self._conn.execute(f"ALTER TABLE websites ADD COLUMN {column} TEXT")
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(tenders)")}
+        if 'date_iso' not in columns:
+            self._conn.execute("ALTER TABLE tenders ADD COLUMN date_iso TEXT")
+            rows = self._conn.execute("SELECT id, date FROM tenders").fetchall()
+            self._conn.executemany(
+                "UPDATE tenders SET date_iso = ? WHERE id = ?",
+                [(iso_date(row['date']), row['id']) for row in rows]
+            )
+        version = self._conn.execute("SELECT value FROM meta WHERE key = ?", (TENDER_ID_VERSION_KEY,)).fetchone()
+        if version is None or version['value'] != TENDER_ID_VERSION:
+            self._migrate_tender_ids()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (TENDER_ID_VERSION_KEY, TENDER_ID_VERSION)
+            )
+
+    def _migrate_tender_ids(self):
+        """Rewrite legacy "site_title_date" ids as content-hash ids, merging rows that now coincide."""
+        merged = {}
+        for row in self._conn.execute("SELECT " + ", ".join(TENDER_COLUMNS) + " FROM tenders ORDER BY rowid"):
+            row = dict(row)
+            row['id'] = tender_id(row['website_name'], row['title'], row['date'], row['link'])
+            existing = merged.get(row['id'])
+            if existing is not None:
+                # Whitespace variants of one tender: keep the latest data and the earliest sighting
+                latest = row if row['last_seen'] >= existing['last_seen'] else existing
+                latest['first_seen'] = min(row['first_seen'], existing['first_seen'])
+                latest['current'] = max(row['current'], existing['current'])
+                row = latest
+            merged[row['id']] = row
+        if not merged:
+            return
+        self._conn.execute("DELETE FROM tenders")
+        self._conn.executemany(
+            f"INSERT INTO tenders ({', '.join(TENDER_COLUMNS)}) VALUES ({', '.join('?' * len(TENDER_COLUMNS))})",
+            [tuple(row[column] for column in TENDER_COLUMNS) for row in merged.values()]
+        )
+        logger.info(f"Migrated {len(merged)} tenders to content-hash ids")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def data_version(self):
+        """
+        Changes whenever the database does: rows written through this store
+        (total_changes) or commits by any other connection (PRAGMA data_version).
+        """
+        with self._lock:
+            other = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return f"{self._conn.total_changes}.{other}"
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def get_site_schedules(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM site_schedule").fetchall()
+        return {row['name']: dict(row) for row in rows}
+
+    def save_site_schedule(self, name, interval_hours, next_due_at, checked_at=None, changed=False):
+        """Store a site's adaptive poll interval and next due time, counting the check if checked_at is set."""
+        self.save_site_schedules([(name, interval_hours, next_due_at, checked_at, changed)])
+
+    def save_site_schedules(self, schedules):
+        """
+        save_site_schedule for many sites in one transaction, from
+        (name, interval_hours, next_due_at, checked_at, changed) tuples.
+        """
+        rows = []
+        for name, interval_hours, next_due_at, checked_at, changed in schedules:
+            rows.append((name, interval_hours, next_due_at, checked_at, checked_at if changed else None,
+                         1 if checked_at else 0, 1 if changed else 0))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO site_schedule (name, interval_hours, next_due_at, last_checked_at, last_changed_at,
+                                           checks, changes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    interval_hours = excluded.interval_hours,
+                    next_due_at = excluded.next_due_at,
+                    last_checked_at = COALESCE(excluded.last_checked_at, last_checked_at),
+                    last_changed_at = COALESCE(excluded.last_changed_at, last_changed_at),
+                    checks = checks + excluded.checks,
+                    changes = changes + excluded.changes
+                """,
+                rows
+            )
+
+    def get_site_breakers(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM site_breaker").fetchall()
+        return {row['name']: dict(row) for row in rows}
+
+    def save_site_breaker(self, name, failures, trips, open_until=None, last_failure_at=None, last_error=None):
+        """Store a site's circuit breaker state; a closed breaker with no failures deletes the row."""
+        with self._lock, self._conn:
+            if not failures and not trips:
+                self._conn.execute("DELETE FROM site_breaker WHERE name = ?", (name,))
+                return
+            self._conn.execute(
+                """
+                INSERT INTO site_breaker (name, failures, trips, open_until, last_failure_at, last_error)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    failures = excluded.failures,
+                    trips = excluded.trips,
+                    open_until = excluded.open_until,
+                    last_failure_at = excluded.last_failure_at,
+                    last_error = excluded.last_error
+                """,
+                (name, failures, trips, open_until, last_failure_at, last_error)
+            )
+
+    def get_site_rows(self, name):
+        """A site's row cache as (site fingerprint, {row fingerprint: entry}), or (None, {}) if it has none."""
+        with self._lock:
+            row = self._conn.execute("SELECT fingerprint, rows FROM site_rows WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None, {}
+        return row['fingerprint'], json.loads(row['rows'])
+
+    def save_site_rows(self, name, fingerprint, rows):
+        """Replace a site's row cache, see app.extract.extract_tenders."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO site_rows (name, fingerprint, rows) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET fingerprint = excluded.fingerprint, rows = excluded.rows
+                """,
+                (name, fingerprint, json.dumps(rows, separators=(',', ':')))
+            )
+
+    def _site_seen_ids(self, website_name):
+        seen = self._seen_ids.get(website_name)
+        if seen is None:
+            seen = {row[0] for row in self._conn.execute(
+                "SELECT id FROM tenders WHERE website_name = ?", (website_name,)
+            )}
+            self._seen_ids[website_name] = seen
+        return seen
+
+    def has_seen_all(self, website_name, ids):
+        """True if every one of ids has been seen for this site before (vacuously true for none)."""
+        with self._lock:
+            seen = self._site_seen_ids(website_name)
+            return all(tender_id in seen for tender_id in ids)
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM tenders LIMIT 1").fetchone() is None
+
+    def import_json(self, json_path):
+        """One-off migration of a legacy previous_tenders.json into the store."""
+        try:
+            with open(json_path, 'r') as f:
+                tenders_map = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error reading legacy tenders file {json_path}: {e}")
+            return
+        seen_at = datetime.fromtimestamp(os.path.getmtime(json_path)).isoformat()
+        for website_name, tenders in tenders_map.items():
+            self.save_site(website_name, [TenderRecord.from_dict(t, website_name) for t in tenders], seen_at)
+        logger.info(f"Imported {sum(len(t) for t in tenders_map.values())} tenders from {json_path}")
+
+    def save_site(self, website_name, tenders, seen_at=None):
+        """
+        Upsert one site's scrape result and make it the site's current set.
+
+        Returns the tenders whose ids had never been seen for this site before.
+        """
+        seen_at = seen_at or datetime.now().isoformat()
+        rows = [
+            (
+                t.id, website_name, t.site.url, t.title, t.date, t.link, t.tag, t.match_score, t.scraped_at,
+                iso_date(t.date), seen_at, seen_at
+            )
+            for t in tenders
+        ]
+        with self._lock, self._conn:
+            seen = self._site_seen_ids(website_name)
+            new_tenders = [t for t in tenders if t.id not in seen]
+            self._conn.execute(
+                "UPDATE tenders SET current = 0 WHERE website_name = ? AND current = 1", (website_name,)
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO tenders (id, website_name, website, title, date, link, tag, match_score,
+                                     scraped_at, date_iso, first_seen, last_seen, current)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (id) DO UPDATE SET
+                    website_name = excluded.website_name,
+                    website = excluded.website,
+                    title = excluded.title,
+                    date = excluded.date,
+                    link = excluded.link,
+                    tag = excluded.tag,
+                    match_score = excluded.match_score,
+                    scraped_at = excluded.scraped_at,
+                    date_iso = excluded.date_iso,
+                    last_seen = excluded.last_seen,
+                    current = 1
+                """,
+                rows
+            )
+            self._conn.execute(
+                """
+                INSERT INTO websites (name, last_scraped_at, last_attempt_at, last_error) VALUES (?, ?, ?, NULL)
+                ON CONFLICT (name) DO UPDATE SET
+                    last_scraped_at = excluded.last_scraped_at,
+                    last_attempt_at = excluded.last_attempt_at,
+                    last_error = NULL
+                """,
+                (website_name, seen_at, seen_at)
+            )
+            # Only after the transaction body succeeded
+            seen.update(t.id for t in new_tenders)
+        return new_tenders
+
+    def record_failure(self, website_name, error, attempted_at=None):
+        """Note a failed scrape without touching the site's last good tenders."""
+        attempted_at = attempted_at or datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO websites (name, last_attempt_at, last_error) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    last_attempt_at = excluded.last_attempt_at,
+                    last_error = excluded.last_error
+                """,
+                (website_name, attempted_at, error)
+            )
+
+    def site_freshness(self):
+        """Per-site timestamps of the last successful and last attempted scrape."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT w.name, w.last_scraped_at, w.last_attempt_at, w.last_error,
+                       (SELECT COUNT(*) FROM tenders t WHERE t.website_name = w.name AND t.current = 1) AS tender_count
+                FROM websites w ORDER BY w.name
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_all(self, tenders_map, seen_at=None):
+        seen_at = seen_at or datetime.now().isoformat()
+        for website_name, tenders in tenders_map.items():
+            self.save_site(website_name, tenders, seen_at)
+
+    def search(self, q, website_name=None, include_history=False, limit=50, offset=0):
+        """
+        Full-text search over tender titles and tags, best match first.
+
+        Every word of q must match the start of a word. Results are ranked by BM25
+        (title hits weigh more than tag hits), then by match_score. Only current
+        tenders are searched unless include_history is set. The per-website facet
+        counts cover all matches, ignoring the website_name filter.
+        Returns (tenders with a `relevance` field, total, [(website_name, count)]).
+        """
+        match = fts_query(q)
+        if not match:
+            return [], 0, []
+        if not self.fts_enabled:
+            return self._search_like(q, website_name, include_history, limit, offset)
+        scope = "" if include_history else " AND t.current = 1"
+        where = f"tenders_fts MATCH ?{scope}"
+        params = [match]
+        with self._lock:
+            facets = self._conn.execute(
+                f"SELECT t.website_name, COUNT(*) FROM tenders_fts JOIN tenders t ON t.rowid = tenders_fts.rowid "
+                f"WHERE {where} GROUP BY t.website_name ORDER BY COUNT(*) DESC, t.website_name",
+                params
+            ).fetchall()
+            if website_name:
+                where += " AND t.website_name = ?"
+                params.append(website_name)
+                total = next((count for name, count in facets if name == website_name), 0)
+            else:
+                total = sum(count for _, count in facets)
+            rows = self._conn.execute(
+                "SELECT " + ", ".join(f"t.{field}" for field in QUERY_FIELDS) +
+                f", -bm25(tenders_fts, {FTS_WEIGHTS[0]}, {FTS_WEIGHTS[1]}) AS relevance "
+                f"FROM tenders_fts JOIN tenders t ON t.rowid = tenders_fts.rowid WHERE {where} "
+                f"ORDER BY bm25(tenders_fts, {FTS_WEIGHTS[0]}, {FTS_WEIGHTS[1]}), t.match_score DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return (
+            [self._row_to_tender(row, QUERY_FIELDS + ('relevance',)) for row in rows],
+            total,
+            [(name, count) for name, count in facets]
+        )
+
+    def _search_like(self, q, website_name, include_history, limit, offset):
+        # Fallback without FTS5: every word as a substring of the title or tags, unranked
+        words = re.findall(r'\w+', q)
+        clauses = [] if include_history else ["current = 1"]
+        params = []
+        for word in words:
+            clauses.append("(title LIKE ? ESCAPE '\\' OR tag LIKE ? ESCAPE '\\')")
+            params.extend([f"%{_escape_like(word)}%"] * 2)
+        where = " AND ".join(clauses)
+        with self._lock:
+            facets = self._conn.execute(
+                f"SELECT website_name, COUNT(*) FROM tenders WHERE {where} "
+                f"GROUP BY website_name ORDER BY COUNT(*) DESC, website_name",
+                params
+            ).fetchall()
+            if website_name:
+                where += " AND website_name = ?"
+                params.append(website_name)
+            total = sum(count for name, count in facets if not website_name or name == website_name)
+            rows = self._conn.execute(
+                "SELECT " + ", ".join(QUERY_FIELDS) + f", 0.0 AS relevance FROM tenders WHERE {where} "
+                f"ORDER BY match_score DESC, rowid LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return (
+            [self._row_to_tender(row, QUERY_FIELDS + ('relevance',)) for row in rows],
+            total,
+            [(name, count) for name, count in facets]
+        )
+
+    @staticmethod
+    def _row_to_tender(row, fields=TENDER_FIELDS):
+        return {field: row[field] for field in fields}
+
+    def load_current(self):
+        """Return {website_name: [TenderRecord, ...]} for every site's latest scrape."""
+        tenders_map = {}
+        with self._lock:
+            for (name,) in self._conn.execute("SELECT name FROM websites WHERE last_scraped_at IS NOT NULL"):
+                tenders_map[name] = []
+            rows = self._conn.execute(
+                "SELECT website_name, " + ", ".join(TENDER_FIELDS) + " FROM tenders WHERE current = 1 ORDER BY rowid"
+            ).fetchall()
+        for row in rows:
+            tenders_map.setdefault(row['website_name'], []).append(TenderRecord(
+                row['id'], site_ref(row['website_name'], row['website']), row['title'], row['date'], row['link'],
+                sys.intern(row['tag'] or ''), row['match_score'], row['scraped_at']
+            ))
+        return tenders_map
+
+    def query_tenders(self, website_name=None, date_from=None, date_to=None, min_score=None, score_below=None,
+                      tier=None, undated=False, q=None, since=None, sort='date', order='desc', limit=50, offset=0):
+        """
+        Filter, sort and paginate the current tenders.
+
+        `tier` splits results around half of the highest match_score in the filtered
+        set ('high' is >= half, 'low' is below), mirroring the dashboard tabs.
+        `since` keeps tenders first seen at or after that datetime.
+        Returns (tenders, total, max_score).
+        """
+        clauses = ["current = 1"]
+        params = []
+        if website_name:
+            clauses.append("website_name = ?")
+            params.append(website_name)
+        if date_from:
+            clauses.append("date_iso >= ?")
+            params.append(date_from.isoformat())
+        if date_to:
+            clauses.append("date_iso <= ?")
+            params.append(date_to.isoformat())
+        if undated:
+            clauses.append("date_iso IS NULL")
+        if since:
+            clauses.append("first_seen >= ?")
+            params.append(since.isoformat())
+        if q:
+            pattern = f"%{_escape_like(q)}%"
+            match = fts_query(q) if self.fts_enabled else ''
+            if match:
+                # Words in the title or tags (as prefixes, via the search index), or the literal date text
+                clauses.append(
+                    "(rowid IN (SELECT rowid FROM tenders_fts WHERE tenders_fts MATCH ?) OR date LIKE ? ESCAPE '\\')"
+                )
+                params.extend([match, pattern])
+            else:
+                clauses.append("(title LIKE ? ESCAPE '\\' OR date LIKE ? ESCAPE '\\')")
+                params.extend([pattern, pattern])
+
+        with self._lock:
+            # The score tiers are relative to the best match among the non-score filters
+            base_where = " AND ".join(clauses)
+            max_score = self._conn.execute(
+                f"SELECT COALESCE(MAX(match_score), 0) FROM tenders WHERE {base_where}", params
+            ).fetchone()[0]
+
+            if min_score is not None:
+                clauses.append("match_score >= ?")
+                params.append(min_score)
+            if score_below is not None:
+                clauses.append("match_score < ?")
+                params.append(score_below)
+            if tier == 'high':
+                clauses.append("match_score >= ?")
+                params.append(max_score * 0.5)
+            elif tier == 'low':
+                clauses.append("match_score < ?")
+                params.append(max_score * 0.5)
+
+            where = " AND ".join(clauses)
+            total = self._conn.execute(f"SELECT COUNT(*) FROM tenders WHERE {where}", params).fetchone()[0]
+
+            direction = 'ASC' if order == 'asc' else 'DESC'
+            order_by = f"{SORT_COLUMNS.get(sort, 'date_iso')} {direction}"
+            if sort in (None, 'date'):
+                # Undated tenders go last, ties are broken by best match
+                order_by = f"date_iso IS NULL, date_iso {direction}, match_score DESC"
+            rows = self._conn.execute(
+                "SELECT " + ", ".join(QUERY_FIELDS) + f" FROM tenders WHERE {where} "
+                f"ORDER BY {order_by}, rowid LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [self._row_to_tender(row, QUERY_FIELDS) for row in rows], total, max_score
@@ -0,0 +1,165 @@
+# filepath: benchmarks/bench_dates.py
+"""
+Benchmark: legacy per-row date handling vs app.dates.
+
+The legacy path is what extract_tenders used to do for every row: an
+uncompiled regex search, up to eight strptime attempts, two more strptime
+attempts on the result and a fresh "three months ago" cutoff. The new path is
+one cached parse_date call against a cutoff computed once.
+
+Date strings come from the recorded fixtures in benchmarks/fixtures/ (see
+bench_parsers) using each site's date selector, topped up with synthetic
+strings in the formats those sites use. Every string is also checked for
+parity with the legacy output.
+
+Usage:
+    python -m benchmarks.bench_dates [--rows 50000]
+Exits non-zero if the new parser disagrees with the legacy one.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from app.dates import months_ago, parse_date
+from app.parsers import get_parser
+from benchmarks.bench_parsers import FIXTURES_DIR, load_sites, site_slug
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def legacy_extract_date_from_text(text):
+    if not text:
+        return "Unknown Date"
+    match = re.search(
+        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}|\d{1,2}\s+[A-Za-z]{3,9}\s+\d{2,4})',
+        text
+    )
+    if match:
+        raw_date = match.group(1).replace('-', '/')
+        for fmt in ("%d/%m/%Y", "%d/%m/%y", "%Y/%m/%d", "%Y/%d/%m", "%d %B %Y", "%d %b %Y", "%d %B %y", "%d %b %y"):
+            try:
+                return datetime.strptime(raw_date, fmt).strftime("%d/%m/%y")
+            except ValueError:
+                continue
+        return raw_date
+    return "Unknown Date"
+
+
+def legacy_row(text):
+    date = legacy_extract_date_from_text(text)
+    tender_date = None
+    for fmt in ("%d/%m/%y", "%d/%m/%Y"):
+        try:
+            tender_date = datetime.strptime(date, fmt)
+            break
+        except Exception:
+            continue
+    if tender_date:
+        if pd is not None:
+            cutoff = datetime.now() - pd.DateOffset(months=3)
+        else:
+            cutoff = months_ago(datetime.now(), 3)
+        return date, tender_date < cutoff
+    return date, False
+
+
+def fixture_dates(sites_path):
+    dates = []
+    if not os.path.exists(sites_path):
+        return dates
+    parser = get_parser()
+    for site in load_sites(sites_path):
+        path = os.path.join(FIXTURES_DIR, f"{site_slug(site['name'])}.html")
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            document = parser.parse(f.read())
+        date_selector = parser.compile(site['date_selector'])
+        for row in parser.select(document, parser.compile(site['selector'])):
+            element = parser.select_one(row, date_selector)
+            if element is not None:
+                dates.append(parser.text(element).strip())
+            else:
+                dates.append(" ".join(parser.stripped_strings(row)))
+    return dates
+
+
+def synthetic_dates(count):
+    random.seed(0)
+    samples = []
+    for _ in range(count):
+        day, month, year = random.randint(1, 31), random.randint(1, 12), random.choice([2025, 2026])
+        samples.append(random.choice([
+            f"{day:02d}/{month:02d}/{year}",
+            f"{day}-{month}-{year % 100:02d}",
+            f"{year}-{month:02d}-{day:02d}",
+            f"{day} {datetime(2000, month, 1).strftime(random.choice(['%B', '%b']))} {year}",
+            f"Last date of submission: {day:02d}.{month:02d}.{year}",
+            f"Published on {day:02d}/{month:02d}/{year} 17:00 hrs",
+            "To be announced",
+        ]))
+    # Shapes that only some formats accept, or none
+    samples += ["2026/13/05", "2026-02-30", "15/09/202", "31 Sept 2026", "00/00/00", "1 Jan 1969", "1/1/68",
+                "12-5-2026 to 20-5-2026", "", "Date: 7 MAY 26"]
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help="Date strings to parse")
+    parser.add_argument('--websites', default='config/websites_config.json')
+    args = parser.parse_args()
+
+    real = fixture_dates(args.websites)
+    distinct = real + synthetic_dates(max(0, 2000 - len(real)))
+    samples = [distinct[i % len(distinct)] for i in range(args.rows)]
+
+    mismatches = [text for text in distinct if legacy_extract_date_from_text(text) != parse_date(text)[0]]
+    for text in mismatches[:10]:
+        print(f"MISMATCH: {text!r}: {legacy_extract_date_from_text(text)!r} != {parse_date(text)[0]!r}",
+              file=sys.stderr)
+
+    start = time.perf_counter()
+    for text in samples:
+        legacy_row(text)
+    legacy_time = time.perf_counter() - start
+
+    def new_pass():
+        start = time.perf_counter()
+        cutoff = months_ago(datetime.now(), 3)
+        for text in samples:
+            date, moment = parse_date(text)
+            moment is not None and moment < cutoff
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    cutoff = months_ago(datetime.now(), 3)
+    for text in samples:
+        date, moment = parse_date.__wrapped__(text)
+        moment is not None and moment < cutoff
+    uncached_time = time.perf_counter() - start
+
+    parse_date.cache_clear()
+    cold_time = new_pass()
+    warm_time = new_pass()
+
+    print(f"{len(samples)} date strings ({len(real)} from fixtures, {len(distinct)} distinct)")
+    print(f"legacy per row:     {legacy_time * 1000:8.1f} ms"
+          f"{' (pandas DateOffset cutoff)' if pd is not None else ''}")
+    print(f"app.dates uncached: {uncached_time * 1000:8.1f} ms ({legacy_time / uncached_time:.1f}x)")
+    print(f"app.dates (cold):   {cold_time * 1000:8.1f} ms ({legacy_time / cold_time:.1f}x)")
+    print(f"app.dates (warm):   {warm_time * 1000:8.1f} ms ({legacy_time / warm_time:.1f}x)")
+    print(f"parity:             {len(distinct) - len(mismatches)}/{len(distinct)} distinct strings match")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
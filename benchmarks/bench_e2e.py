@@ -0,0 +1,181 @@
+# filepath: benchmarks/bench_e2e.py
+"""
+End-to-end benchmark: TenderScraper.run() against the local mock server.
+
+For each scale (number of sites) a fresh scraper process is started with a
+generated websites config pointing at benchmarks.mock_server, so fetching,
+parsing, diffing and storing all run exactly as in production, without
+touching the live sites. Each scale gets its own process so peak RSS and
+CPU time are its own; CPU includes parse worker processes.
+
+Reported per scale: wall time, throughput (sites/s), p50/p99 per-site fetch
+and fetch+parse latency, peak RSS and CPU seconds. With --warm, a second run
+measures the conditional-GET (304) path.
+
+Usage:
+    python -m benchmarks.bench_e2e [--sites 10 100 1000] [--latency-ms 100] [--error-rate 0] [--workers 0]
+"""
+import argparse
+import configparser
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_server import MockSiteServer, load_pages
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.0f}" if seconds is not None else '-'
+
+
+def write_configs(directory, args, server):
+    repo_config = configparser.ConfigParser()
+    repo_config.read(os.path.join(REPO_ROOT, 'config', 'config.ini'))
+    config = configparser.ConfigParser()
+    config['General'] = {
+        'output_directory': os.path.join(directory, 'output'),
+        'keywords': repo_config.get('General', 'keywords', fallback='tender, print, paper'),
+        'parser': args.parser
+    }
+    config['Fetch'] = {
+        'max_concurrency': str(args.max_concurrency),
+        'per_host_concurrency': str(args.per_host_concurrency),
+        'retries': '1',
+        'backoff_factor': '0.1'
+    }
+    config['Parse'] = {'workers': str(args.workers), 'queue_size': '0'}
+    config['Export'] = {'formats': 'csv'}
+    config['Email'] = {'enabled': 'False'}
+    config_path = os.path.join(directory, 'config.ini')
+    with open(config_path, 'w') as f:
+        config.write(f)
+
+    sites = []
+    for n in range(args.single):
+        site = dict(server.page_for(n)[0])
+        site.update(name=f"{site['name']} #{n}", url=server.url(n), base_url=server.url(n).rsplit('/', 2)[0])
+        sites.append(site)
+    websites_path = os.path.join(directory, 'websites_config.json')
+    with open(websites_path, 'w') as f:
+        json.dump(sites, f)
+    return config_path, websites_path
+
+
+def run_single(args):
+    """Child process: one scale, prints a JSON result line."""
+    import logging
+    import resource
+
+    from app.scraper import TenderScraper
+
+    logging.getLogger("TenderScraper").setLevel(logging.WARNING)
+    pages = load_pages(args.websites_config, args.rows, args.pad_kb)
+    server = MockSiteServer(pages, args.port, args.hosts)
+    with tempfile.TemporaryDirectory() as directory:
+        config_path, websites_path = write_configs(directory, args, server)
+        scraper = TenderScraper(config_path, websites_path)
+        names = [site.name for site in scraper.websites]
+        results = []
+        for run in range(2 if args.warm else 1):
+            start = time.perf_counter()
+            all_tenders, _ = scraper.run()
+            wall = time.perf_counter() - start
+            health = scraper.metrics.site_health(names)
+            fetch = [h['last_fetch_seconds'] for h in health if h['last_fetch_seconds'] is not None]
+            # A warm run reuses cached results, so the parse time on record is the cold run's
+            total = [h['last_fetch_seconds'] + ((h['last_parse_seconds'] or 0) if run == 0 else 0)
+                     for h in health if h['last_fetch_seconds'] is not None]
+            results.append({
+                'run': 'warm' if run else 'cold',
+                'wall': wall,
+                'ok': sum(1 for h in health if h['last_error'] is None),
+                'tenders': sum(len(t) for t in all_tenders.values()),
+                'fetch_p50': percentile(fetch, 50) if fetch else None,
+                'fetch_p99': percentile(fetch, 99) if fetch else None,
+                'total_p50': percentile(total, 50) if total else None,
+                'total_p99': percentile(total, 99) if total else None
+            })
+        # Joins the parse workers, so their CPU time shows up in RUSAGE_CHILDREN
+        scraper.close()
+        scraper.store.close()
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_unit = 1 if sys.platform == 'darwin' else 1024
+    print(json.dumps({
+        'sites': args.single,
+        'runs': results,
+        'cpu': self_usage.ru_utime + self_usage.ru_stime + child_usage.ru_utime + child_usage.ru_stime,
+        'peak_rss': self_usage.ru_maxrss * rss_unit,
+        'peak_rss_children': child_usage.ru_maxrss * rss_unit
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sites', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rows', type=int, default=200, help="Rows in the synthetic page (when no fixtures)")
+    parser.add_argument('--pad-kb', type=int, default=0)
+    parser.add_argument('--hosts', type=int, default=64 if sys.platform.startswith('linux') else 1,
+                        help="Loopback addresses to spread sites over (per-host limits apply per address)")
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--workers', type=int, default=0, help="[Parse] workers (0 = one per CPU core, up to 4)")
+    parser.add_argument('--parser', default='html.parser')
+    parser.add_argument('--max-concurrency', type=int, default=20)
+    parser.add_argument('--per-host-concurrency', type=int, default=2)
+    parser.add_argument('--warm', action='store_true', help="Also time a second, conditional-GET run")
+    parser.add_argument('--websites-config', default=os.path.join(REPO_ROOT, 'config', 'websites_config.json'))
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args)
+        return
+
+    pages = load_pages(args.websites_config, args.rows, args.pad_kb)
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    passthrough = [
+        '--rows', str(args.rows), '--pad-kb', str(args.pad_kb), '--hosts', str(args.hosts), '--port', str(args.port),
+        '--workers', str(args.workers), '--parser', args.parser, '--max-concurrency', str(args.max_concurrency),
+        '--per-host-concurrency', str(args.per_host_concurrency), '--websites-config', args.websites_config
+    ] + (['--warm'] if args.warm else [])
+
+    print(f"{len(pages)} page template(s), {args.latency_ms:g} ms latency, {args.error_rate:.1%} errors, "
+          f"{args.hosts} host(s), parser {args.parser}")
+    print(f"{'sites':>6} {'run':>5} {'wall s':>8} {'sites/s':>8} {'ok':>6} {'fetch p50/p99 ms':>18} "
+          f"{'total p50/p99 ms':>18} {'peak RSS MB':>12} {'CPU s':>7}")
+    with MockSiteServer(pages, args.port, args.hosts, args.latency_ms, error_rate=args.error_rate):
+        for sites in args.sites:
+            with tempfile.TemporaryDirectory() as cwd:
+                # Run from a scratch directory: the scraper writes its log file to the working directory
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_e2e', '--single', str(sites)] + passthrough,
+                    cwd=cwd, env=env, capture_output=True, text=True
+                )
+            if output.returncode != 0:
+                print(output.stderr, file=sys.stderr)
+                continue
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            rss = max(result['peak_rss'], result['peak_rss_children']) / 2**20
+            for run in result['runs']:
+                print(f"{sites:>6} {run['run']:>5} {run['wall']:8.2f} {sites / run['wall']:8.1f} {run['ok']:>6} "
+                      f"{_ms(run['fetch_p50']) + '/' + _ms(run['fetch_p99']):>18} "
+                      f"{_ms(run['total_p50']) + '/' + _ms(run['total_p99']):>18} {rss:12.1f} {result['cpu']:7.2f}")
+
+
+if __name__ == '__main__':
+    main()
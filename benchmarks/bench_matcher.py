@@ -0,0 +1,70 @@
+# filepath: benchmarks/bench_matcher.py
+"""
+Micro-benchmark: legacy per-keyword substring loop vs the compiled KeywordMatcher.
+
+Usage:
+    python -m benchmarks.bench_matcher [--rows 50000]
+"""
+import argparse
+import configparser
+import random
+import time
+
+from app.matcher import KeywordMatcher, parse_keywords
+
+SAMPLE_TITLES = [
+    "Tender for supply of answer booklets for semester examinations",
+    "Quotation for printing of question papers and OMR sheets",
+    "Construction of boundary wall at girls hostel",
+    "Purchase of A4 size copier paper (75 GSM)",
+    "Notice inviting e-tender for offset printing press maintenance",
+    "Supply of laboratory chemicals and glassware",
+    "Annual maintenance contract for CCTV cameras",
+    "Procurement of stationery items for administrative office",
+]
+
+
+def legacy_score(keywords, title):
+    match_score = 0
+    for keyword in keywords:
+        keyword = keyword.strip()
+        if keyword and keyword.lower() in title.lower():
+            match_score += 1
+    return match_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help="Number of titles to score")
+    parser.add_argument('--config', default='config/config.ini')
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    raw_keywords = config.get('General', 'keywords', fallback='')
+    random.seed(0)
+    titles = [f"{random.choice(SAMPLE_TITLES)} ref {i}" for i in range(args.rows)]
+
+    legacy_keywords = raw_keywords.split(',')
+    start = time.perf_counter()
+    for title in titles:
+        legacy_score(legacy_keywords, title)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(parse_keywords(raw_keywords))
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for title in titles:
+        matcher.score(title)
+    matcher_time = time.perf_counter() - start
+
+    print(f"{len(matcher.keywords)} keywords, {args.rows} titles")
+    print(f"legacy loop:      {legacy_time * 1000:8.1f} ms ({legacy_time / args.rows * 1e6:.2f} us/title)")
+    print(f"KeywordMatcher:   {matcher_time * 1000:8.1f} ms ({matcher_time / args.rows * 1e6:.2f} us/title), "
+          f"compiled in {compile_time * 1000:.2f} ms")
+    print(f"speed-up:         {legacy_time / matcher_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# filepath: benchmarks/bench_parsers.py
+"""
+Parity check and benchmark for the HTML parser backends.
+
+Every backend extracts tenders from the same pages; results are compared
+against html.parser (the reference) and timed. Pages come from recorded
+fixtures in benchmarks/fixtures/<site-slug>.html for sites in the websites
+config, plus a synthetic tender table of --rows rows. Parity with the original
+scraper is checked by tests/test_parser_parity.py.
+
+Usage:
+    python -m benchmarks.bench_parsers [--rows 2000] [--repeat 5]
+Exits non-zero if any backend disagrees with html.parser.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from app.extract import extract_tenders
+from app.matcher import KeywordMatcher
+from app.parsers import get_parser
+from app.sites import SiteSpec
+
+BACKENDS = ['html.parser', 'lxml', 'selectolax']
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SYNTHETIC_SITE = {
+    "name": "Synthetic University",
+    "url": "https://example.edu/tenders",
+    "selector": "#tables tbody tr",
+    "title_selector": "td:nth-child(2)",
+    "date_selector": "td:nth-child(4)",
+    "link_selector": "td:nth-child(5) a",
+    "base_url": "https://example.edu"
+}
+
+
+def site_slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def load_sites(path):
+    with open(path, 'r') as f:
+        entries = json.load(f)
+    sites = []
+    for entry in entries:
+        if entry.get("is_group", False):
+            shared_config = entry.get("shared_config", {})
+            sites.extend({**shared_config, **website} for website in entry.get("websites", []))
+        else:
+            sites.append(entry)
+    return sites
+
+
+def synthetic_page(rows):
+    subjects = ["Supply of answer booklets", "Printing of question papers", "Repair of hostel roof",
+                "Purchase of A4 copier paper", "Offset printing press AMC", "Supply of lab chemicals"]
+    body = "".join(
+        f"<tr><td>{i}</td><td title=''>{subjects[i % len(subjects)]} &amp; allied work, lot {i}</td>"
+        f"<td>Ref/{i}/2026</td><td>{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-2026</td>"
+        f"<td><a href='/uploads/tender_{i}.pdf'>Download</a></td></tr>"
+        for i in range(rows)
+    )
+    return f"<html><body><div id='tables'><table><thead><tr><th>#</th></tr></thead><tbody>{body}</tbody></table></div></body></html>"
+
+
+def comparable(tenders):
+    return [{k: v for k, v in t.to_dict().items() if k != 'scraped_at'} for t in tenders]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000, help="Rows in the synthetic page")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--websites-config', default='config/websites_config.json')
+    parser.add_argument('--keywords', default='tender, print, printing, paper, booklet, question paper, A4, offset')
+    args = parser.parse_args()
+
+    pages = [(SYNTHETIC_SITE, synthetic_page(args.rows))]
+    if os.path.isdir(FIXTURES_DIR) and os.path.exists(args.websites_config):
+        for site in load_sites(args.websites_config):
+            path = os.path.join(FIXTURES_DIR, f"{site_slug(site['name'])}.html")
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    pages.append((site, f.read()))
+
+    matcher = KeywordMatcher(args.keywords)
+    backends = [name for name in BACKENDS if get_parser(name).name == name]
+    mismatches = 0
+    print(f"{'page':40} " + " ".join(f"{name:>14}" for name in backends))
+    for site, html in pages:
+        spec = SiteSpec.from_dict(site)
+        reference = None
+        timings = []
+        for name in backends:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                tenders = extract_tenders(spec, html, matcher, name)
+            timings.append((time.perf_counter() - start) / args.repeat)
+            if reference is None:
+                reference = comparable(tenders)
+            elif comparable(tenders) != reference:
+                mismatches += 1
+                print(f"  MISMATCH: {name} differs from html.parser on {site['name']}", file=sys.stderr)
+        label = f"{site['name'][:30]} ({len(reference)})"
+        print(f"{label:40} " + " ".join(f"{t * 1000:11.1f} ms" for t in timings))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# filepath: benchmarks/bench_records.py
+"""
+Memory and output size of tender records: legacy dicts vs TenderRecord.
+
+Builds the same synthetic tenders both ways, the way extract_tenders used to
+(one dict per row, "site_title_date" id, a fresh scraped_at and tag string per
+row) and the way it does now (slotted records, hash ids, shared SiteRef, tag
+and scraped_at). Reports traced memory and the size of the JSON and CSV files
+each representation produces.
+
+Usage:
+    python -m benchmarks.bench_records [--rows 100000] [--sites 50]
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app.records import TenderRecord, site_ref
+
+SUBJECTS = ["Supply of answer booklets for semester examinations", "Printing of question papers and OMR sheets",
+            "Purchase of A4 size copier paper (75 GSM)", "Notice inviting e-tender for offset printing press",
+            "Procurement of stationery items for administrative office"]
+
+
+def synthetic_rows(rows, sites):
+    random.seed(0)
+    start = datetime(2026, 1, 1)
+    result = []
+    for i in range(rows):
+        site = i % sites
+        date = (start + timedelta(days=random.randrange(365))).strftime("%d/%m/%y")
+        result.append((
+            f"Example University {site}", f"https://tenders{site}.example.edu/notices",
+            f"{random.choice(SUBJECTS)} ref {i}", date, f"https://tenders{site}.example.edu/uploads/tender_{i}.pdf"
+        ))
+    return result
+
+
+def build_legacy(rows):
+    tenders = []
+    for name, url, title, date, link in rows:
+        tenders.append({
+            'id': f"{name}_{title}_{date}",
+            'match_score': 2,
+            'tag': ', '.join([name]),
+            'website': url,
+            'title': title,
+            'date': date,
+            'link': link,
+            'scraped_at': datetime.now().isoformat()
+        })
+    return tenders
+
+
+def build_records(rows):
+    tenders = []
+    scraped_at = {}
+    for name, url, title, date, link in rows:
+        # One scraped_at per site page, as extract_tenders does now
+        stamp = scraped_at.setdefault(name, datetime.now().isoformat())
+        tenders.append(TenderRecord.create(site_ref(name, url), title, date, link, ', '.join([name]), 2, stamp))
+    return tenders
+
+
+def traced(build, rows):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tenders = build(rows)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return tenders, size
+
+
+def json_size(tenders_dicts):
+    return len(json.dumps(tenders_dicts, indent=4).encode('utf-8'))
+
+
+def csv_size(tenders_dicts):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(tenders_dicts[0]))
+    writer.writeheader()
+    writer.writerows(tenders_dicts)
+    return len(out.getvalue().encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help="Number of tenders")
+    parser.add_argument('--sites', type=int, default=50, help="Number of distinct sites")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.sites)
+    legacy, legacy_mem = traced(build_legacy, rows)
+    records, records_mem = traced(build_records, rows)
+    record_dicts = [t.to_dict() for t in records]
+
+    per_100k = 100000 / args.rows
+    print(f"{args.rows} tenders over {args.sites} sites (figures scaled to 100k tenders)")
+    print(f"{'':18}{'memory':>12}{'JSON':>12}{'CSV':>12}{'avg id':>10}")
+    for label, mem, dicts in (("legacy dicts", legacy_mem, legacy), ("TenderRecord", records_mem, record_dicts)):
+        avg_id = sum(len(t['id']) for t in dicts) / len(dicts)
+        print(f"{label:18}{mem * per_100k / 2**20:10.1f}MB{json_size(dicts) * per_100k / 2**20:10.1f}MB"
+              f"{csv_size(dicts) * per_100k / 2**20:10.1f}MB{avg_id:10.1f}")
+    print(f"memory saved:     {1 - records_mem / legacy_mem:8.0%}")
+
+
+if __name__ == '__main__':
+    main()
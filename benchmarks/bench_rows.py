@@ -0,0 +1,94 @@
+# filepath: benchmarks/bench_rows.py
+"""
+Benchmark: extracting a changed page with and without the row cache.
+
+For every parser backend, a synthetic tender table of --rows rows is
+extracted three ways:
+
+    cold      no row cache, every row extracted (the behaviour with row_cache = false)
+    first     no cached rows yet, but every row fingerprinted for the next run
+    warm      the next run: a rotated banner timestamp, --changed edited rows and
+              --changed new rows, everything else served from the first run's cache
+
+The warm result is checked against a cold extraction of the same page.
+
+Usage:
+    python -m benchmarks.bench_rows [--rows 2000] [--changed 5] [--repeat 5]
+Exits non-zero if the warm run disagrees with the cold one.
+"""
+import argparse
+import logging
+import sys
+import time
+
+from app.extract import extract_tenders
+from app.matcher import KeywordMatcher
+from app.parsers import get_parser
+from app.sites import SiteSpec
+from benchmarks.bench_parsers import BACKENDS, SYNTHETIC_SITE, comparable, synthetic_page
+
+
+def changed_page(rows, changed):
+    """The synthetic page on a later day: a new banner, a few edited rows and a few new ones."""
+    html = synthetic_page(rows + changed)
+    # Drop the first rows so the table keeps its length, as a listing that scrolls
+    start = html.index("<tbody>") + len("<tbody>")
+    end = start
+    for _ in range(changed):
+        end = html.index("</tr>", end) + len("</tr>")
+    html = html[:start] + html[end:]
+    for i in range(changed, 2 * changed):
+        html = html.replace(f", lot {i}</td>", f", lot {i} (corrigendum)</td>", 1)
+    return html.replace("<body>", f"<body><p class='banner'>Updated {time.time()}</p>", 1)
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--changed', type=int, default=5, help="Rows edited, and rows added, between runs")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--keywords', default='tender, print, printing, paper, booklet, question paper, A4, offset')
+    args = parser.parse_args()
+    logging.getLogger("TenderScraper").setLevel(logging.WARNING)
+
+    site = SiteSpec.from_dict(SYNTHETIC_SITE)
+    matcher = KeywordMatcher(args.keywords)
+    # The first run's page is the later one shifted back: the new rows are not on it yet
+    first_html = synthetic_page(args.rows)
+    warm_html = changed_page(args.rows, args.changed)
+    backends = [name for name in BACKENDS if get_parser(name).name == name]
+    mismatches = 0
+
+    print(f"{args.rows} rows, {args.changed} edited and {args.changed} new between runs (best of {args.repeat})")
+    print(f"{'backend':12} {'cold ms':>9} {'first ms':>9} {'warm ms':>9} {'cached':>7} {'speedup':>8}")
+    for name in backends:
+        _, cold_time = timed(lambda: extract_tenders(site, warm_html, matcher, name), args.repeat)
+        cache = {}
+        _, first_time = timed(
+            lambda: extract_tenders(site, first_html, matcher, name, row_cache={}, row_results=cache), args.repeat
+        )
+        stats = {}
+        warm, warm_time = timed(
+            lambda: extract_tenders(site, warm_html, matcher, name, stats=stats, row_cache=cache, row_results={}),
+            args.repeat
+        )
+        if comparable(warm) != comparable(extract_tenders(site, warm_html, matcher, name)):
+            mismatches += 1
+            print(f"  MISMATCH: {name} warm run differs from a cold one", file=sys.stderr)
+        print(f"{name:12} {cold_time * 1000:9.1f} {first_time * 1000:9.1f} {warm_time * 1000:9.1f} "
+              f"{stats['cached_rows']:7} {cold_time / warm_time:7.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# filepath: benchmarks/bench_search.py
+"""
+Benchmark: full-text tender search (FTS5 + BM25) vs a LIKE scan.
+
+Fills a scratch TenderStore with synthetic tenders spread over many sites,
+saving each site several times so most rows are history, then times
+TenderStore.search (the /api/search path) against the LIKE fallback it uses
+when SQLite lacks FTS5, on the same queries. LIKE matches substrings where
+FTS matches word prefixes, so FTS may find fewer matches but never more.
+
+Usage:
+    python -m benchmarks.bench_search [--tenders 300000] [--sites 300] [--repeat 20]
+Exits non-zero if FTS finds a match the LIKE scan does not.
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from app.records import TenderRecord, site_ref, tender_id
+from app.store import TenderStore
+
+# Title words follow a Zipf distribution over a large vocabulary, as in real listings: a few words are
+# very common, most are rare. Tender vocabulary takes the ranks after the top 20 filler words.
+DOMAIN_WORDS = (
+    "supply installation printing paper toner cartridge maintenance annual contract civil works "
+    "construction road repair building hostel laboratory equipment furniture computer network "
+    "security services catering transport vehicle hiring solar electrical plumbing painting "
+    "library books stationery cleaning housekeeping medical surgical consumables software licence"
+).split()
+VOCABULARY_SIZE = 20000
+QUERIES = ('paper', 'print', 'annual maintenance', 'solar install', 'sta', 'zzz', 'civil works road')
+
+
+def vocabulary(rng):
+    filler = [f"w{n}" for n in range(20)]
+    rare = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(5, 10)))
+            for _ in range(VOCABULARY_SIZE - len(filler) - len(DOMAIN_WORDS))]
+    words = filler + DOMAIN_WORDS + rare
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+
+def synthetic_tenders(site, count, batch, rng, words, cum_weights):
+    ref = site_ref(site, f"https://{site.lower().replace(' ', '-')}.example/tenders")
+    tenders = []
+    for n in range(count):
+        title = ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 10))).capitalize()
+        title = f"{title} ({batch}-{n})"
+        date = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/25"
+        link = f"{ref.url}/{batch}/{n}"
+        tag = ', '.join(rng.sample(DOMAIN_WORDS[:6], rng.randint(0, 2)) + [site])
+        tenders.append(TenderRecord(tender_id(site, title, date, link), ref, title, date, link, tag,
+                                    float(rng.randint(0, 5)), '2025-01-01T00:00:00'))
+    return tenders
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tenders', type=int, default=300000)
+    parser.add_argument('--sites', type=int, default=300)
+    parser.add_argument('--runs', type=int, default=5, help="Scrapes saved per site; earlier ones become history")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words, cum_weights = vocabulary(rng)
+    per_save = max(1, args.tenders // (args.sites * args.runs))
+    with tempfile.TemporaryDirectory() as directory:
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        if not store.fts_enabled:
+            sys.exit("This SQLite build has no FTS5")
+        start = time.perf_counter()
+        for run in range(args.runs):
+            for n in range(args.sites):
+                site = f"Site {n}"
+                store.save_site(site, synthetic_tenders(site, per_save, run, rng, words, cum_weights))
+        load = time.perf_counter() - start
+        total = per_save * args.sites * args.runs
+        print(f"{total} tenders over {args.sites} sites stored and indexed in {load:.1f}s "
+              f"({total / load:,.0f} rows/s)")
+
+        print(f"{'query':<20} {'history':>7} {'matches':>8} {'FTS ms':>8} {'LIKE ms':>8} {'speedup':>8}")
+        mismatches = 0
+        for q in QUERIES:
+            for include_history in (False, True):
+                (_, fts_total, _), fts_time = timed(
+                    lambda: store.search(q, include_history=include_history, limit=50), args.repeat
+                )
+                (_, like_total, _), like_time = timed(
+                    lambda: store._search_like(q, None, include_history, 50, 0), max(1, args.repeat // 5)
+                )
+                # LIKE matches substrings, FTS word prefixes: compare where the two mean the same
+                if fts_total > like_total:
+                    mismatches += 1
+                print(f"{q:<20} {str(include_history):>7} {fts_total:>8} {fts_time * 1000:8.2f} "
+                      f"{like_time * 1000:8.2f} {like_time / fts_time:7.1f}x")
+        store.close()
+    if mismatches:
+        sys.exit(f"{mismatches} queries found more FTS matches than LIKE matches")
+
+
+if __name__ == '__main__':
+    main()
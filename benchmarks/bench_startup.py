@@ -0,0 +1,159 @@
+# filepath: benchmarks/bench_startup.py
+"""
+Cold-start benchmark: how long the app takes to import and come up.
+
+Every measurement runs in a fresh interpreter, against a scratch output
+directory whose tender store is pre-filled with --tenders synthetic tenders:
+
+    import app.scraper    importing the scrape engine
+    import main           importing the web app (FastAPI, routes, models)
+    TenderScraper()       constructing the engine: config, store, registry
+    web app ready         import main + app lifespan startup + first request
+    cli --help            `python -m app.cli --help`, whole process
+
+Reported per step: median in-process time and median whole-process wall time
+(interpreter startup included), plus which heavy optional modules each import
+pulls in. Pass --json to save the numbers and --compare to diff a run against
+a saved one, so regressions show up as the code changes.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 7] [--tenders 50000] [--json FILE] [--compare FILE]
+"""
+import argparse
+import configparser
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules the entry points should only load when a scrape or an email actually needs them
+HEAVY_MODULES = ('fastapi', 'uvicorn', 'httpx', 'bs4', 'soupsieve', 'lxml', 'selectolax', 'smtplib', 'pandas')
+
+_PRELUDE = "import sys, time\nstart = time.perf_counter()\n"
+# Each step sets `elapsed`, the in-process time it measures
+_REPORT = (
+    "import json\n"
+    "print(json.dumps({'seconds': elapsed, 'heavy': [m for m in %r if m in sys.modules]}))\n" % (HEAVY_MODULES,)
+)
+STEPS = {
+    'import app.scraper': (
+        "import app.scraper\n"
+        "elapsed = time.perf_counter() - start\n"
+    ),
+    'import main': (
+        "import main\n"
+        "elapsed = time.perf_counter() - start\n"
+    ),
+    'TenderScraper()': (
+        "from app.scraper import TenderScraper\n"
+        "start = time.perf_counter()\n"
+        "TenderScraper()\n"
+        "elapsed = time.perf_counter() - start\n"
+    ),
+    'web app ready': (
+        "import main\n"
+        "from fastapi.testclient import TestClient\n"
+        "with TestClient(main.app) as client:\n"
+        "    client.get('/api/websites')\n"
+        "    elapsed = time.perf_counter() - start\n"
+    ),
+}
+
+
+def prepare(directory, tenders):
+    """Scratch config/ and output/ whose store already holds `tenders` tenders, as after months of scraping."""
+    import random
+    from datetime import datetime
+
+    from app.scheduler import LAST_RUN_KEY
+    from app.store import TenderStore
+    from benchmarks.bench_search import synthetic_tenders, vocabulary
+
+    config = configparser.ConfigParser()
+    config.read(os.path.join(REPO_ROOT, 'config', 'config.ini'))
+    config['General']['output_directory'] = os.path.join(directory, 'output')
+    config['Email']['enabled'] = 'False'
+    os.makedirs(os.path.join(directory, 'config'))
+    with open(os.path.join(directory, 'config', 'config.ini'), 'w') as f:
+        config.write(f)
+    shutil.copy(os.path.join(REPO_ROOT, 'config', 'websites_config.json'), os.path.join(directory, 'config'))
+
+    rng = random.Random(0)
+    words, cum_weights = vocabulary(rng)
+    os.makedirs(os.path.join(directory, 'output'))
+    store = TenderStore(os.path.join(directory, 'output', 'tenders.db'))
+    sites = max(1, tenders // 500)
+    for n in range(sites):
+        store.save_site(f"Site {n}", synthetic_tenders(f"Site {n}", tenders // sites, 0, rng, words, cum_weights))
+    # A recent scheduled run, so the web app's scheduler doesn't start scraping the real sites
+    store.set_meta(LAST_RUN_KEY, datetime.now().isoformat())
+    store.close()
+
+
+def run_step(code, directory, env):
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', _PRELUDE + code + _REPORT], cwd=directory, env=env,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1])
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    return result['seconds'], wall, result['heavy']
+
+
+def run_cli_help(directory, env):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'app.cli', '--help'], cwd=directory, env=env, capture_output=True,
+                   check=True)
+    return None, time.perf_counter() - started, []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--tenders', type=int, default=50000)
+    parser.add_argument('--json', help="Save the results to this file")
+    parser.add_argument('--compare', help="Show the change against results saved with --json")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['steps']
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        prepare(directory, args.tenders)
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+        steps = [(name, lambda code=code: run_step(code, directory, env)) for name, code in STEPS.items()]
+        steps.append(('cli --help', lambda: run_cli_help(directory, env)))
+        print(f"{args.tenders} tenders in the store, median of {args.repeat} runs")
+        print(f"{'step':<20} {'in-process ms':>14} {'process ms':>11} {'vs saved':>9}  heavy modules loaded")
+        for name, step in steps:
+            runs = [step() for _ in range(args.repeat)]
+            inner = [seconds for seconds, _, _ in runs if seconds is not None]
+            result = {
+                'seconds': statistics.median(inner) if inner else None,
+                'wall': statistics.median(wall for _, wall, _ in runs),
+                'heavy': runs[-1][2]
+            }
+            results[name] = result
+            change = ''
+            if name in baseline:
+                change = f"{(result['wall'] / baseline[name]['wall'] - 1) * 100:+8.0f}%"
+            seconds = f"{result['seconds'] * 1000:14.1f}" if result['seconds'] is not None else f"{'-':>14}"
+            print(f"{name:<20} {seconds} {result['wall'] * 1000:11.1f} {change:>9}  "
+                  f"{', '.join(result['heavy']) or '-'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'tenders': args.tenders, 'python': sys.version.split()[0], 'steps': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
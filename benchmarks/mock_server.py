@@ -0,0 +1,151 @@
+# filepath: benchmarks/mock_server.py
+"""
+Local HTTP stand-in for the tender sites.
+
+Serves /site/<n>.html for any n, cycling through the recorded fixtures in
+benchmarks/fixtures/ (falling back to a synthetic tender table), with
+configurable latency, error rate and page size. Pages carry a strong ETag
+and answer If-None-Match with 304, like well-behaved sites.
+
+To stay clear of the fetcher's per-host limit, the server can listen on
+several loopback addresses (127.0.0.1, 127.0.0.2, ...; Linux routes the whole
+127/8 block to lo) and sites are spread over them.
+
+Usage:
+    python -m benchmarks.mock_server [--port 8800] [--latency-ms 200] [--error-rate 0.01] [--hosts 1]
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_parsers import FIXTURES_DIR, SYNTHETIC_SITE, load_sites, site_slug, synthetic_page
+
+SITE_PATH = re.compile(r'^/site/(\d+)\.html$')
+
+
+def load_pages(websites_config=None, rows=200, pad_kb=0):
+    """Return [(site_config, page_bytes, etag)]: one per recorded fixture, or the synthetic page."""
+    pages = []
+    if websites_config and os.path.exists(websites_config) and os.path.isdir(FIXTURES_DIR):
+        for site in load_sites(websites_config):
+            path = os.path.join(FIXTURES_DIR, f"{site_slug(site['name'])}.html")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    pages.append((site, f.read()))
+    if not pages:
+        pages.append((SYNTHETIC_SITE, synthetic_page(rows).encode('utf-8')))
+    padding = f"<!-- {'x' * (pad_kb * 1024)} -->".encode('ascii') if pad_kb else b''
+    return [(site, body + padding, f'"{hashlib.sha256(body + padding).hexdigest()[:16]}"') for site, body in pages]
+
+
+class MockSiteServer:
+    """Threaded mock server; use as a context manager or call start()/stop()."""
+
+    def __init__(self, pages, port=8800, hosts=1, latency_ms=0, jitter=0.5, error_rate=0.0, seed=0):
+        self.pages = pages
+        self.port = port
+        self.addresses = [f"127.0.{i // 254}.{i % 254 + 1}" for i in range(max(1, hosts))]
+        self.latency = latency_ms / 1000
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = []
+
+    def url(self, n):
+        return f"http://{self.addresses[n % len(self.addresses)]}:{self.port}/site/{n}.html"
+
+    def page_for(self, n):
+        return self.pages[n % len(self.pages)]
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                match = SITE_PATH.match(self.path)
+                with mock._lock:
+                    mock.requests += 1
+                    delay = mock.latency * mock._random.uniform(1 - mock.jitter, 1 + mock.jitter)
+                    fail = mock._random.random() < mock.error_rate
+                if delay > 0:
+                    time.sleep(delay)
+                if match is None:
+                    self._reply(404, b'not found')
+                elif fail:
+                    self._reply(503, b'service unavailable')
+                else:
+                    _, body, etag = mock.page_for(int(match.group(1)))
+                    if self.headers.get('If-None-Match') == etag:
+                        self._reply(304, b'', etag)
+                    else:
+                        self._reply(200, body, etag)
+
+            def _reply(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        handler = self._handler()
+        for address in self.addresses:
+            server = ThreadingHTTPServer((address, self.port), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f"mock-{address}", daemon=True).start()
+            self._servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--hosts', type=int, default=1, help="Loopback addresses to listen on")
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--rows', type=int, default=200, help="Rows in the synthetic page (when no fixtures)")
+    parser.add_argument('--pad-kb', type=int, default=0, help="Extra KB appended to every page")
+    parser.add_argument('--websites-config', default='config/websites_config.json')
+    args = parser.parse_args()
+
+    pages = load_pages(args.websites_config, args.rows, args.pad_kb)
+    server = MockSiteServer(pages, args.port, args.hosts, args.latency_ms, error_rate=args.error_rate).start()
+    print(f"Serving {len(pages)} page(s) at {server.url(0)} (… /site/<n>.html), Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# filepath: benchmarks/record_expected.py
+"""
+Record what the original BeautifulSoup scraper extracts from each fixture.
+
+For every benchmarks/fixtures/<site-slug>.html of a configured site, the
+scrape_website of app/scraper.py at --rev (the first commit, before the
+parser backends existed) is run on the page with the configured keywords and
+a fixed clock, and its tenders are saved next to it as
+<site-slug>.expected.json. tests/test_parser_parity.py checks every parser
+backend against these files. Re-run it after recording new fixtures.
+
+Usage:
+    python -m benchmarks.record_expected [--rev REV] [--websites-config config/websites_config.json]
+"""
+import argparse
+import configparser
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import types
+from datetime import datetime
+
+import requests
+
+from benchmarks.bench_parsers import FIXTURES_DIR, load_sites, site_slug
+
+# Tenders the baseline returns carry these too, but they depend on the run, not on the page
+RUN_FIELDS = ('id', 'scraped_at')
+
+
+def first_commit():
+    revs = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], capture_output=True, text=True, check=True)
+    return revs.stdout.split()[0]
+
+
+def load_baseline(rev, recorded_at):
+    """The scraper module at rev, with datetime.now() fixed at recorded_at."""
+    source = subprocess.run(['git', 'show', f'{rev}:app/scraper.py'], capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType('baseline_scraper')
+    module.__file__ = f'{rev}:app/scraper.py'
+    cwd = os.getcwd()
+    # Its logging setup opens tender_scraper.log in the working directory
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            exec(compile(source, module.__file__, 'exec'), module.__dict__)
+        finally:
+            os.chdir(cwd)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return recorded_at
+
+    module.datetime = FrozenDatetime
+    return module
+
+
+def serve(module, html):
+    """Make the module's requests.get return html for any URL."""
+    class Response:
+        text = html
+
+        def raise_for_status(self):
+            pass
+
+    module.requests = types.SimpleNamespace(get=lambda url, **kwargs: Response(), exceptions=requests.exceptions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rev', help="Revision of the baseline scraper (default: the first commit)")
+    parser.add_argument('--websites-config', default='config/websites_config.json')
+    parser.add_argument('--config', default='config/config.ini', help="Keywords are read from its [General] section")
+    parser.add_argument('--recorded-at', default='2026-10-15T12:00:00', help="Clock the expiry cutoff is taken from")
+    args = parser.parse_args()
+    # Set up before the baseline module's own basicConfig, which then adds no handlers
+    logging.basicConfig(level=logging.WARNING)
+
+    rev = args.rev or first_commit()
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    keywords = config.get('General', 'keywords', fallback='')
+    recorded_at = datetime.fromisoformat(args.recorded_at)
+    baseline = load_baseline(rev, recorded_at)
+    scraper = baseline.TenderScraper.__new__(baseline.TenderScraper)
+    scraper.keywords = keywords.split(',')
+
+    recorded = 0
+    for site in load_sites(args.websites_config):
+        path = os.path.join(FIXTURES_DIR, f"{site_slug(site['name'])}.html")
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        serve(baseline, html)
+        tenders = [{k: v for k, v in t.items() if k not in RUN_FIELDS} for t in scraper.scrape_website(site)]
+        expected = {
+            'site': site,
+            'baseline': rev,
+            'recorded_at': recorded_at.isoformat(),
+            'keywords': keywords,
+            'tenders': tenders
+        }
+        with open(path[:-len('.html')] + '.expected.json', 'w', encoding='utf-8') as f:
+            json.dump(expected, f, indent=4, ensure_ascii=False)
+            f.write('\n')
+        print(f"{site['name']}: {len(tenders)} tenders")
+        recorded += 1
+    if not recorded:
+        print(f"No fixtures for configured sites in {FIXTURES_DIR}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
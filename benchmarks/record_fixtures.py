@@ -0,0 +1,56 @@
+# filepath: benchmarks/record_fixtures.py
+"""
+Record the live page of every configured site into benchmarks/fixtures/.
+
+Each page is saved as <site-slug>.html (re-encoded as UTF-8) so the parser,
+date and end-to-end benchmarks can run offline against real markup. A site
+that fails to download keeps its previous fixture. Run
+benchmarks.record_expected afterwards to refresh the parity test's expected output.
+
+Usage:
+    python -m benchmarks.record_fixtures [--websites-config config/websites_config.json] [--only NAME ...]
+"""
+import argparse
+import os
+import sys
+
+import httpx
+
+from app.fetcher import DEFAULT_USER_AGENT
+from benchmarks.bench_parsers import FIXTURES_DIR, load_sites, site_slug
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--websites-config', default='config/websites_config.json')
+    parser.add_argument('--only', nargs='*', help="Only record these site names")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    sites = load_sites(args.websites_config)
+    if args.only:
+        sites = [site for site in sites if site['name'] in args.only]
+
+    failures = 0
+    with httpx.Client(timeout=args.timeout, follow_redirects=True, headers={'User-Agent': DEFAULT_USER_AGENT}) as client:
+        for site in sites:
+            path = os.path.join(FIXTURES_DIR, f"{site_slug(site['name'])}.html")
+            try:
+                response = client.get(site['url'])
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                failures += 1
+                print(f"FAILED   {site['name']}: {e!r}", file=sys.stderr)
+                continue
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            os.replace(tmp_path, path)
+            print(f"recorded {site['name']}: {len(response.content)} bytes -> {os.path.relpath(path)}")
+    print(f"{len(sites) - failures}/{len(sites)} sites recorded")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# filepath: tests/test_parser_parity.py
+"""
+Every parser backend must extract what the original BeautifulSoup scraper did.
+
+Each fixture in benchmarks/fixtures/ has a <site-slug>.expected.json holding
+the site config and the tenders scrape_website returned for the page before
+the parser backends existed (see benchmarks/record_expected.py). Every
+backend is run on it with the same keywords and clock and must keep the same
+rows, in order, with the same title, date, link, tag and website.
+
+match_score is not compared: KeywordMatcher counts non-overlapping longest
+matches rather than every keyword found as a substring, so scores differ by
+design, but a title with any keyword still scores at least 1 and is kept.
+"""
+import glob
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from app.dates import months_ago
+from app.extract import MAX_TENDER_AGE_MONTHS, extract_tenders
+from app.matcher import KeywordMatcher
+from app.parsers import get_parser
+from app.sites import SiteSpec
+from benchmarks.bench_parsers import BACKENDS, FIXTURES_DIR
+
+FIELDS = ('title', 'date', 'link', 'tag', 'website')
+
+EXPECTED = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.expected.json')))
+
+
+def test_fixtures_recorded():
+    pages = glob.glob(os.path.join(FIXTURES_DIR, '*.html'))
+    assert EXPECTED, f"no expected output in {FIXTURES_DIR}, run python -m benchmarks.record_expected"
+    assert {path[:-len('.html')] for path in pages} == {path[:-len('.expected.json')] for path in EXPECTED}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('path', EXPECTED, ids=lambda path: os.path.basename(path)[:-len('.expected.json')])
+def test_backend_matches_baseline(path, backend):
+    if get_parser(backend).name != backend:
+        pytest.skip(f"{backend} is not installed")
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    with open(path[:-len('.expected.json')] + '.html', 'r', encoding='utf-8') as f:
+        html = f.read()
+    cutoff = months_ago(datetime.fromisoformat(expected['recorded_at']), MAX_TENDER_AGE_MONTHS)
+    stats = {}
+
+    tenders = extract_tenders(SiteSpec.from_dict(expected['site']), html, KeywordMatcher(expected['keywords']),
+                              backend, cutoff=cutoff, stats=stats)
+
+    assert stats['page_error'] is None
+    assert stats['row_errors'] == 0
+    assert all(tender.match_score >= 1 for tender in tenders)
+    assert [{k: tender.to_dict()[k] for k in FIELDS} for tender in tenders] == \
+        [{k: tender[k] for k in FIELDS} for tender in expected['tenders']]